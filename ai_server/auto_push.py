@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import firestore
+
+# ==========================================
+# 크롤러 -> 푸시 바로 연결 (자동 푸시 규칙)
+# ==========================================
+# 지금까지는 새 공지를 찾아도 관리자가 push_requested를 켜야 알림이 나갔음.
+# 크롤러가 새 공지를 저장할 때 아래 규칙에 맞으면 같은 배치 쓰기에 push_requested=True를 함께 넣어
+# push_sender 모니터(실시간 구독)가 바로 가져가게 함. 추가 쓰기/폴링 없음.
+#
+# 규칙 설정: auto_push.json (AUTO_PUSH_CONFIG 환경변수로 경로 변경, 파일이 없으면 DEFAULT_RULES)
+#   enabled       : 자동 푸시 사용 여부 (AUTO_PUSH=off 환경변수로도 끌 수 있음)
+#   urgent        : 긴급(중요 + 마감 임박) 공지
+#   pinned        : 게시판에 고정된 새 공지
+#   important     : 중요 키워드(crawler.IMPORTANT_KEYWORDS)가 들어간 공지
+#   keywords      : 자동 푸시만을 위한 추가 키워드
+#   categories    : 이 카테고리만 (비어 있으면 전체)
+#   boards        : 이 게시판만 (비어 있으면 전체)
+#   max_age_days  : 게시일이 이보다 오래된 공지는 제외 (고정된 옛 공지가 처음 수집될 때 알림 폭탄 방지)
+#   max_per_run   : 한 번의 크롤링(게시판별)에서 자동으로 요청할 최대 건수
+# 전체 수집(mode='all', 백필)에서는 항상 자동 푸시하지 않음.
+# 상세 수집에 실패해 본문 없이 저장되는 공지(content_pending)도 빈 공지로 알림이 가지 않게 제외함.
+#
+# 발견 -> 알림 시간 기록: 크롤러가 목록에서 새 공지를 처음 본 시각을 discovered_at으로 저장하고,
+# push_sender가 발송 후 push_discovery_latency_ms를 남김.
+
+AUTO_PUSH_PATH = os.environ.get(
+    'AUTO_PUSH_CONFIG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auto_push.json'))
+
+DEFAULT_RULES = {
+    "enabled": True,
+    "urgent": True,
+    "pinned": True,
+    "important": True,
+    "keywords": [],
+    "categories": [],
+    "boards": [],
+    "max_age_days": 3,
+    "max_per_run": 10,
+}
+
+KST = timezone(timedelta(hours=9))
+
+
+def load_rules(path=None):
+    """auto_push.json을 읽어 기본값과 합친 규칙 반환"""
+    rules = dict(DEFAULT_RULES)
+    try:
+        with open(path or AUTO_PUSH_PATH, 'r', encoding='utf-8') as f:
+            rules.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    if os.environ.get('AUTO_PUSH', '').lower() in ('0', 'off', 'false'):
+        rules['enabled'] = False
+    return rules
+
+
+def parse_notice_date(date_str):
+    """목록/상세의 게시일 문자열 (2026.03.02 / 2026-03-02) -> date, 형식이 다르면 None"""
+    for fmt in ('%Y.%m.%d', '%Y-%m-%d'):
+        try:
+            return datetime.strptime((date_str or '').strip()[:10], fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def match_reason(record, doc, rules):
+    """규칙에 맞으면 사유('urgent' / 'pinned' / 'important' / 'keyword'), 아니면 None (게시일/건수 제한은 보지 않음)"""
+    if rules['boards'] and doc.get('board') not in rules['boards']:
+        return None
+    if rules['categories'] and doc.get('category') not in rules['categories']:
+        return None
+
+    title = doc.get('title', '')
+    if rules['urgent'] and doc.get('is_urgent'):
+        return 'urgent'
+    if rules['pinned'] and record.get('is_pinned'):
+        return 'pinned'
+    if rules['important'] and doc.get('is_important'):
+        return 'important'
+    if any(keyword in title for keyword in rules['keywords']):
+        return 'keyword'
+    return None
+
+
+class AutoPushPolicy:
+    """크롤링 한 번(게시판 하나) 동안 쓰는 자동 푸시 판단기. max_per_run 건수를 셈"""
+
+    def __init__(self, rules=None, mode='recent'):
+        self.rules = rules if rules is not None else load_rules()
+        # 전체 수집(백필)은 과거 공지를 대량으로 새로 저장하므로 자동 푸시하지 않음
+        self.active = bool(self.rules['enabled']) and mode != 'all'
+        self.requested = []     # [(doc_id, reason)]
+        self.skipped = {'old': 0, 'limit': 0, 'pending': 0}
+        self._lock = threading.Lock()
+
+    def decide(self, record, doc, today=None):
+        """새 공지 하나에 대해 자동 푸시 사유 반환 (안 하면 None)"""
+        if not self.active:
+            return None
+        reason = match_reason(record, doc, self.rules)
+        if reason is None:
+            return None
+
+        # 본문 없이 저장되는 공지는 알림을 열어도 빈 화면이므로 보내지 않음
+        if doc.get('content_pending'):
+            self.skipped['pending'] += 1
+            return None
+
+        today = today or datetime.now(KST).date()
+        posted = parse_notice_date(doc.get('date') or record.get('date'))
+        if posted is None or (today - posted).days > self.rules['max_age_days']:
+            self.skipped['old'] += 1
+            return None
+
+        with self._lock:
+            if len(self.requested) >= self.rules['max_per_run']:
+                self.skipped['limit'] += 1
+                return None
+            self.requested.append((record['doc_id'], reason))
+        return reason
+
+    def apply(self, record, doc, today=None):
+        """규칙에 맞으면 저장할 공지 문서에 푸시 요청 필드를 넣음. 사유 반환"""
+        reason = self.decide(record, doc, today)
+        if reason:
+            doc.update({
+                'push_requested': True,
+                'push_requested_at': firestore.SERVER_TIMESTAMP,
+                'push_source': 'crawler',
+                'push_reason': reason,
+            })
+        return reason
+
+    def summary(self):
+        return {'requested': len(self.requested), **self.skipped}
+
+
+def discovery_latency_ms(data, sent_at=None):
+    """공지 발견(discovered_at) -> 발송까지 걸린 시간(ms). discovered_at이 없으면 None"""
+    discovered_at = data.get('discovered_at')
+    if not isinstance(discovered_at, datetime):
+        return None
+    sent_at = sent_at or datetime.now(timezone.utc)
+    return max(int((sent_at - discovered_at).total_seconds() * 1000), 0)
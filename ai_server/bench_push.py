@@ -0,0 +1,165 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+
+import firebase_admin
+from firebase_admin import credentials
+from google.auth.credentials import AnonymousCredentials
+
+from fake_fcm import FakeMessaging
+from fake_firestore import FakeFirestore
+from push_index import PushIndex, rebuild
+from push_topics import CATEGORY_TOPICS
+
+# ==========================================
+# 푸시 발송 부하 테스트
+# ==========================================
+# 실제 FCM/Firestore 없이 push_sender.send_push_for_notice를 사용자 수별로 돌려 봄.
+# 인메모리 Firestore(fake_firestore)에 가상 사용자를 채우고 messaging을 로컬 대체(fake_fcm)로
+# 바꾼 뒤, 수신자 조회 방식별로 소요 시간 / Firestore 읽기 / 초당 발송 토큰 / 메모리 최대치를 측정.
+#   scan   : 수신 인덱스 없음 -> users 전체 조회
+#   cold   : push_index 샤드 문서만 읽음 (메모리 사본 없음)
+#   warm   : 메모리 사본 (모니터가 떠 있을 때)
+#   topic  : PUSH_DELIVERY_MODE=topic (토픽 발송 한 번)
+#
+# 사용법: python bench_push.py --users 1000,10000,50000 --latency 0.05 --dead-rate 0.01
+# 주의: 인메모리 Firestore는 where 쿼리를 전체 스캔하므로 --dead-rate를 주면 토큰 정리('in' 쿼리)
+#       시간이 실제보다 크게 나옴. 팬아웃 자체를 볼 때는 기본값(0)으로 실행.
+
+MODES = ['scan', 'cold', 'warm', 'topic']
+CATEGORIES = list(CATEGORY_TOPICS)
+
+
+def import_push_sender():
+    """서비스 계정 키 없이 push_sender를 import (익명 자격 증명으로 Firebase 앱만 초기화)"""
+    if not firebase_admin._apps:
+        class _BenchCredential(credentials.Base):
+            def get_credential(self):
+                return AnonymousCredentials()
+
+        firebase_admin.initialize_app(_BenchCredential(), {'projectId': 'push-bench'})
+    import push_sender
+    return push_sender
+
+
+def seed_users(db, count, seed=0, push_rate=0.9, opt_out_rate=0.2):
+    """가상 사용자 생성: push_rate 비율이 푸시 허용, 각 카테고리는 opt_out_rate 확률로 끔"""
+    rng = random.Random(seed)
+    users = db.collection('users')
+    for i in range(count):
+        settings = {category: rng.random() >= opt_out_rate for category in CATEGORIES}
+        users.document(f"user{i:06d}").set({
+            'isPushEnabled': rng.random() < push_rate,
+            'fcm_token': f"token-{seed}-{i:06d}-" + "x" * 140,   # 실제 토큰 길이(~160자) 흉내
+            'notification_settings': settings,
+        })
+
+
+def _send(push_sender, db, mode, verbose):
+    """공지 하나 발송 (push_requested 상태로 되돌린 뒤). (소요 시간, 읽기, 쓰기) 반환"""
+    db.collection('notices').document('bench').set({
+        'title': '부하 테스트 공지', 'category': '장학', 'push_requested': True,
+    })
+    previous_mode = os.environ.get('PUSH_DELIVERY_MODE')
+    os.environ['PUSH_DELIVERY_MODE'] = 'topic' if mode == 'topic' else 'tokens'
+    reads, writes = db.reads, db.writes
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    try:
+        with output:
+            push_sender.send_push_for_notice('bench', worker_id='bench')
+    finally:
+        elapsed = time.perf_counter() - started
+        if previous_mode is None:
+            os.environ.pop('PUSH_DELIVERY_MODE', None)
+        else:
+            os.environ['PUSH_DELIVERY_MODE'] = previous_mode
+    return elapsed, db.reads - reads, db.writes - writes
+
+
+def run_once(push_sender, users, mode, latency, failure_rate, dead_rate, verbose=False):
+    db = FakeFirestore()
+    seed_users(db, users)
+    fcm = FakeMessaging(latency=latency, failure_rate=failure_rate, dead_rate=dead_rate)
+    push_sender.db = db
+    push_sender.messaging = fcm
+    push_sender.recipient_index = PushIndex()
+    if mode in ('cold', 'warm'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuild(db)
+    if mode == 'warm':
+        push_sender.recipient_index.load(db)
+
+    elapsed, reads, writes = _send(push_sender, db, mode, verbose)
+    notice = db.dump('notices')['bench']
+    stats = dict(fcm.stats)
+
+    # tracemalloc은 할당을 크게 느리게 하므로 메모리는 같은 조건으로 한 번 더 보내서 따로 측정
+    if mode == 'cold':
+        push_sender.recipient_index = PushIndex()
+    tracemalloc.start()
+    try:
+        _send(push_sender, db, mode, verbose=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    delivered = stats['delivered'] if mode != 'topic' else None
+    return {
+        'users': users,
+        'mode': mode,
+        'seconds': round(elapsed, 3),
+        'reads': reads,
+        'writes': writes,
+        'requests': stats['requests'],
+        'max_in_flight': stats['max_in_flight'],
+        'recipients': notice.get('push_recipient_count'),
+        'pruned': notice.get('push_pruned_count', 0),
+        'sends_per_sec': round(delivered / elapsed, 1) if delivered and elapsed > 0 else None,
+        'peak_mb': round(peak / 1024 / 1024, 2),
+        'sent': notice.get('push_requested') is False,
+    }
+
+
+def run_benchmark(user_counts, modes=MODES, latency=0.05, failure_rate=0.0, dead_rate=0.0, verbose=False):
+    push_sender = import_push_sender()
+    original = (push_sender.db, push_sender.messaging, push_sender.recipient_index)
+    results = []
+    try:
+        for users in user_counts:
+            for mode in modes:
+                result = run_once(push_sender, users, mode, latency, failure_rate, dead_rate, verbose)
+                results.append(result)
+                print(f"   {users:>7}명 {mode:<5} {result['seconds']:>7.3f}s | 읽기 {result['reads']:>7} | "
+                      f"요청 {result['requests']:>4} | {result['sends_per_sec'] or '-':>9}건/s | "
+                      f"정리 {result['pruned']:>4} | 메모리 {result['peak_mb']}MB")
+    finally:
+        push_sender.db, push_sender.messaging, push_sender.recipient_index = original
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="푸시 발송 부하 테스트 (로컬 FCM/Firestore 대체)")
+    parser.add_argument('--users', default='1000,10000,50000', help="사용자 수 목록 (쉼표 구분)")
+    parser.add_argument('--modes', default=",".join(MODES))
+    parser.add_argument('--latency', type=float, default=0.05, help="FCM 요청당 지연(초)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="토큰별 일시적 오류 비율")
+    parser.add_argument('--dead-rate', type=float, default=0.0, help="만료 토큰 비율")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--verbose', action='store_true', help="push_sender 로그 출력")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.users.split(',') if n.strip()]
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    print(f"🏋️ 푸시 부하 테스트: 사용자 {counts}, 방식 {modes}, 지연 {args.latency}s, "
+          f"일시적 오류 {args.failure_rate}, 만료 {args.dead_rate}")
+    results = run_benchmark(counts, modes, args.latency, args.failure_rate, args.dead_rate, args.verbose)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
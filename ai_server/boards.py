@@ -0,0 +1,69 @@
+import json
+import os
+from urllib.parse import urlparse
+
+# ==========================================
+# 게시판 레지스트리 (boards.json)
+# ==========================================
+# 게시판마다 crawler.py를 복사하지 않도록 id 파라미터/선택자를 설정 파일로 분리.
+# namespace가 비어있는 게시판(기존 학과 게시판)은 문서 ID가 nttSn 그대로이고,
+# 그 외 게시판은 "{namespace}_{nttSn}" 형태로 저장되어 ID가 겹치지 않음.
+
+BOARDS_PATH = os.environ.get(
+    'BOARDS_CONFIG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'boards.json'))
+
+DEFAULT_BOARD_ID = "cse"
+
+# 학교 CMS(selectNttList.do) 공통 선택자. 게시판별로 필요한 것만 덮어씀
+DEFAULT_SELECTORS = {
+    "row": "tbody tr",
+    "title_link": "a.nttInfoBtn",
+    "id_attr": "data-id",
+    "content": "tr.cont td",
+    "content_fallback": [".bbs_cntn", ".bdv_txt", ".view_con"],
+    "file_links": "ul.file a",
+    "file_links_fallback": [".file_area a", ".bo_file a"],
+}
+
+
+def load_boards(path=None, only_enabled=True):
+    """boards.json을 읽어 선택자 기본값이 채워진 게시판 목록 반환"""
+    with open(path or BOARDS_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    boards = []
+    for entry in config.get('boards', []):
+        if only_enabled and not entry.get('enabled', True):
+            continue
+        board = dict(entry)
+        board['selectors'] = {**DEFAULT_SELECTORS, **entry.get('selectors', {})}
+        board.setdefault('namespace', '')
+        boards.append(board)
+    return boards
+
+
+def get_board(board_id, path=None):
+    for board in load_boards(path, only_enabled=False):
+        if board['id'] == board_id:
+            return board
+    raise KeyError(f"알 수 없는 게시판: {board_id}")
+
+
+def list_url(board):
+    return f"{board['host']}/{board['site']}/na/ntt/selectNttList.do?mi={board['mi']}&bbsId={board['bbsId']}"
+
+
+def detail_url(board, ntt_sn):
+    return (f"{board['host']}/{board['site']}/na/ntt/selectNttInfo.do"
+            f"?mi={board['mi']}&bbsId={board['bbsId']}&nttSn={ntt_sn}")
+
+
+def board_host(board):
+    return urlparse(board['host']).netloc
+
+
+def notice_doc_id(board, ntt_sn):
+    """notices 컬렉션 문서 ID (게시판 간 nttSn 충돌 방지)"""
+    if board.get('namespace'):
+        return f"{board['namespace']}_{ntt_sn}"
+    return str(ntt_sn)
@@ -1,4 +1,6 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import json
 import os
@@ -7,6 +9,9 @@ import pytz
 import firebase_admin
 from firebase_admin import credentials, firestore
 import re
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # ==========================================
 # 1. Firebase 접속
@@ -43,155 +48,329 @@ if not firebase_admin._apps:
 
 db = firestore.client() if firebase_admin._apps else None
 
-def scrape_and_save_menu():
-    base_url = "https://www.gnu.ac.kr/main/ad/fm/foodmenu/selectFoodMenuView.do"
-    
-    # 한국 시간 기준
-    kst = pytz.timezone("Asia/Seoul")
-    today = datetime.datetime.now(tz=kst)
-    # 이번주 월요일 계산 (달력은 보통 월~일 혹은 해당 주 표시)
-    start_of_week = today - datetime.timedelta(days=today.weekday())
-    schDt = start_of_week.strftime("%Y-%m-%d")
-
-    print(f"📅 Request Date (Week Start): {schDt}")
-
-    cafeterias = [
-        {"name": "중앙식당", "seq": "5", "sysId": "main"},
-        {"name": "교문센1층", "seq": "63", "sysId": "main"},
-        {"name": "교직원식당", "seq": "4", "sysId": "main"},
-        {"name": "칠암1식당", "seq": "8", "sysId": "cdorm"}, # 칠암은 시스템ID가 다를 수 있으나 url 파라미터로 제어
-    ]
-
-    all_menus = {} # { "2024-01-22": { "중앙식당": "...", "교직원": "..." } }
-
-    for cafe in cafeterias:
-        print(f"🔍 Scraping {cafe['name']}...")
-        try:
-            params = {
-                "mi": "1341", # 메뉴 ID
-                "restSeq": cafe["seq"],
-                "schDt": schDt
-            }
-            if cafe['sysId'] == 'cdorm':
-                # 칠암 등 다른 캠퍼스는 URL이 다를 수 있음. 확인 필요. 
-                # 일단 공통 URL 사용해보고 안되면 예외 처리.
-                # 보통 캠퍼스별 도메인이 다름 (www vs chilam 등)
-                pass 
-
-            response = requests.get(base_url, params=params, timeout=10)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # 테이블 찾기
-            table = soup.select_one("div.cal_box table")
-            if not table:
-                table = soup.select_one("table") # Fallback to any table
-            
-            if not table:
-                print(f"   ⚠️ No table found for {cafe['name']}")
+# ==========================================
+# 2. 식당 목록 (cafeterias.json) + 공용 세션
+# ==========================================
+# 식당마다 requests.get을 차례로 부르면 느린 캠퍼스 하나가 나머지를 모두 붙잡음.
+# keep-alive 세션 하나를 공유해서 식당별로 동시에 요청하고(식당별 타임아웃, 연결/5xx 재시도),
+# 먼저 도착한 응답부터 파싱함. 식당 추가는 cafeterias.json에 항목만 넣으면 됨.
+
+CAFETERIAS_PATH = os.environ.get(
+    'CAFETERIAS_CONFIG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cafeterias.json'))
+
+DEFAULT_TIMEOUT = (3, 10)          # (연결, 읽기) 초
+PREFETCH_WEEKS = 1                 # 이번 주 + 다음 N주 (cafeterias.json / CAFETERIA_PREFETCH_WEEKS로 변경)
+MAX_WORKERS = 8                    # 동시 요청 수 상한 (식당 수 x 주 수)
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.5                # 0.5초, 1초 ...
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def load_cafeterias(path=None, only_enabled=True):
+    """cafeterias.json -> (공통 설정, 식당 목록). 식당마다 timeout이 없으면 공통 값 사용"""
+    with open(path or CAFETERIAS_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    timeout = tuple(config.get('timeout', DEFAULT_TIMEOUT))
+    cafeterias = []
+    for entry in config.get('cafeterias', []):
+        if only_enabled and not entry.get('enabled', True):
+            continue
+        cafe = dict(entry)
+        cafe['timeout'] = tuple(entry.get('timeout', timeout))
+        cafeterias.append(cafe)
+    return config, cafeterias
+
+
+def make_session(pool_size=4, max_retries=MAX_RETRIES):
+    """식당 요청이 같이 쓰는 keep-alive 세션 (연결 오류/5xx는 어댑터에서 재시도)"""
+    retry = Retry(total=max_retries, connect=max_retries, read=max_retries,
+                  status_forcelist=RETRY_STATUSES, backoff_factor=RETRY_BACKOFF,
+                  allowed_methods=frozenset(['GET']), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fetch_menu_page(session, config, cafe, schDt):
+    """식당 하나의 주간 식단 페이지 HTML"""
+    params = {
+        "mi": config.get('mi', "1341"),  # 메뉴 ID
+        "restSeq": cafe["seq"],
+        "schDt": schDt,
+        "schSysId": cafe["sysId"],       # 칠암 등 다른 캠퍼스 식당 구분
+    }
+    response = session.get(config['base_url'], params=params, timeout=cafe['timeout'])
+    response.raise_for_status()
+    return response.text
+
+
+# ==========================================
+# 3. 식단 표 파싱
+# ==========================================
+# 하루치를 한 문자열로 이어 붙이면 앱이 그릴 때마다 "[조식]" 구분을 다시 잘라야 함.
+# 끼니별 메뉴 목록(slots)과 알레르기 행(allergens)을 따로 저장하고, 이어 붙인 문자열은 기존 필드로 유지.
+
+ALLERGY_MARKERS = ("알레르기", "알러지")
+
+def parse_menu_table(html, cafe_name, start_of_week):
+    """주간 식단 표 HTML -> { "2024-01-22": build_day 결과 } (식당 하나)"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 테이블 찾기
+    table = soup.select_one("div.cal_box table")
+    if not table:
+        table = soup.select_one("table") # Fallback to any table
+
+    if not table:
+        print(f"   ⚠️ No table found for {cafe_name}")
+        return {}
+
+    # 날짜 헤더 파싱
+    headers = table.select("thead th")
+    date_map = {} # { index: "YYYY-MM-DD" }
+
+    # 정규식으로 날짜 추출 (2024.01.22 또는 01.22, 구분자 유연하게)
+    # YYYY.MM.DD or YYYY-MM-DD
+    date_pattern_full = re.compile(r"(\d{4})[./-](\d{2})[./-](\d{2})")
+    # MM.DD or MM-DD or MM/DD
+    date_pattern_short = re.compile(r"(\d{2})[./-](\d{2})")
+
+    for idx, th in enumerate(headers):
+        text = th.get_text(strip=True)
+
+        match_full = date_pattern_full.search(text)
+        if match_full:
+            # YYYY-MM-DD
+            date_str = f"{match_full.group(1)}-{match_full.group(2)}-{match_full.group(3)}"
+            date_map[idx] = date_str
+            continue
+
+        match_short = date_pattern_short.search(text)
+        if match_short:
+            # MM.DD -> YYYY-MM-DD (Use start_of_week year)
+            # 주의: 연도가 바뀌는 주간(12월 말~1월 초) 처리 필요할 수 있음
+            # 일단 간단히 start_of_week.year 사용
+            year = start_of_week.year
+            date_str = f"{year}-{match_short.group(1)}-{match_short.group(2)}"
+            date_map[idx] = date_str
+    # 만약 날짜 파싱이 하나도 안되었거나 너무 적으면(1개 이하), 컬럼 순서대로(월~일) 할당 (Fallback)
+    if len(date_map) <= 1:
+        print(f"   ⚠️ [{cafe_name}] Date parsing insufficient. Using column index fallback (Mon-Sun).")
+        # headers[0]은 '구분'일 확률 높음. 1부터 월요일. start_of_week는 월요일.
+        for idx in range(1, len(headers)):
+            target_date = start_of_week + datetime.timedelta(days=idx - 1)
+            date_map[idx] = target_date.strftime("%Y-%m-%d")
+
+    rows = {} # { "YYYY-MM-DD": [(구분, [메뉴 줄...])] }
+    # 메뉴 파싱 (tbody)
+    for tr in table.select("tbody tr"):
+        th = tr.select_one("th")
+        if not th: continue
+
+        row_title = th.get_text(strip=True) # 조식, 중식, 석식, 알레르기 정보 등
+
+        # tbody의 td내용은 date_map[i+1] 날짜에 해당 (td 0번 -> th 1번, 첫 th는 '구분')
+        for i, td in enumerate(tr.select("td")):
+            date_key = date_map.get(i + 1)
+            if not date_key:
+                continue
+            content = td.get_text("\n", strip=True)
+            if not content:
                 continue
+            rows.setdefault(date_key, []).append((row_title, content.split("\n")))
+    return {date_key: build_day(day_rows) for date_key, day_rows in rows.items()}
+
+
+def build_day(rows):
+    """
+    하루치 행 [(구분, [메뉴 줄...])] -> 구조화된 식단
+      slots    : [{'meal': '중식', 'dishes': ['김치찌개', '쌀밥']}, ...] (표 순서 유지)
+      allergens: 알레르기 행의 줄 목록 (slots에서 분리)
+      text     : 기존 앱용 "[중식]\n김치찌개\n쌀밥\n\n[석식]\n..." (모든 행 포함, 예전 형식 그대로)
+    """
+    slots, allergens = [], []
+    for title, lines in rows:
+        if any(marker in title for marker in ALLERGY_MARKERS):
+            allergens.extend(lines)
+        else:
+            slots.append({'meal': title, 'dishes': lines})
+    text = "\n\n".join(f"[{title}]\n" + "\n".join(lines) for title, lines in rows)
+    return {'text': text, 'slots': slots, 'allergens': allergens}
+
+
+# ==========================================
+# 4. 동시 수집 + 저장
+# ==========================================
+def fetch_all_menus(cafeterias, config, week_starts, session=None, max_workers=None):
+    """
+    (식당, 주) 페이지를 동시에 받아서 도착하는 대로 파싱. week_starts: 요청할 주의 월요일(date) 목록
+    반환: (all_menus { 날짜: { 식당: build_day 결과 } },
+           요청별 결과 { "식당 주시작": {'seconds', 'days'} 또는 {'error'} })
+    한 요청이 실패/타임아웃돼도 나머지 결과는 그대로 저장됨
+    """
+    jobs = [(cafe, week_start) for week_start in week_starts for cafe in cafeterias]
+    workers = max_workers or min(max(len(jobs), 1), config.get('max_workers', MAX_WORKERS))
+    owns_session = session is None
+    if owns_session:
+        session = make_session(pool_size=workers)
 
-            # 날짜 헤더 파싱
-            headers = table.select("thead th")
-            date_map = {} # { index: "YYYY-MM-DD" }
-            
-            # 정규식으로 날짜 추출 (2024.01.22 또는 01.22, 구분자 유연하게)
-            # YYYY.MM.DD or YYYY-MM-DD
-            date_pattern_full = re.compile(r"(\d{4})[./-](\d{2})[./-](\d{2})")
-            # MM.DD or MM-DD or MM/DD
-            date_pattern_short = re.compile(r"(\d{2})[./-](\d{2})")
-
-            for idx, th in enumerate(headers):
-                text = th.get_text(strip=True)
-                print(f"     Header[{idx}]: {text}")  # DEBUG
-
-                match_full = date_pattern_full.search(text)
-                if match_full:
-                    # YYYY-MM-DD
-                    date_str = f"{match_full.group(1)}-{match_full.group(2)}-{match_full.group(3)}"
-                    date_map[idx] = date_str
+    def _fetch(cafe, week_start):
+        started = time.monotonic()
+        html = fetch_menu_page(session, config, cafe, week_start.strftime("%Y-%m-%d"))
+        return html, time.monotonic() - started
+
+    all_menus = {} # { "2024-01-22": { "중앙식당": {...}, "교직원": {...} } }
+    report = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_fetch, cafe, week_start): (cafe, week_start) for cafe, week_start in jobs}
+            for future in as_completed(futures):
+                cafe, week_start = futures[future]
+                key = f"{cafe['name']} {week_start.strftime('%Y-%m-%d')}"
+                try:
+                    html, elapsed = future.result()
+                    menus = parse_menu_table(html, cafe['name'], week_start)
+                except Exception as e:
+                    print(f"   ❌ [{key}] Error: {e}")
+                    report[key] = {'error': str(e)}
                     continue
-                
-                match_short = date_pattern_short.search(text)
-                if match_short:
-                    # MM.DD -> YYYY-MM-DD (Use start_of_week year)
-                    # 주의: 연도가 바뀌는 주간(12월 말~1월 초) 처리 필요할 수 있음
-                    # 일단 간단히 start_of_week.year 사용
-                    year = start_of_week.year
-                    # 만약 start_of_week가 12월이고 현재 월이 1월이면 year+1? (복잡하므로 year 그대로 사용. 보통 학식은 당해년도)
-                    
-                    date_str = f"{year}-{match_short.group(1)}-{match_short.group(2)}"
-                    date_map[idx] = date_str
-            # 만약 날짜 파싱이 하나도 안되었거나 너무 적으면(1개 이하), 컬럼 순서대로(월~일) 할당 (Fallback)
-            if len(date_map) <= 1:
-                print("   ⚠️ Date parsing insufficient. Using column index fallback (Mon-Sun).")
-                # headers[0]은 '구분'일 확률 높음. 1부터 월요일.
-                # start_of_week는 월요일.
-                
-                for idx in range(1, len(headers)):
-                    # idx=1 -> Mon (start_of_week + 0)
-                    # idx=2 -> Tue (start_of_week + 1)
-                    delta = idx - 1
-                    target_date = start_of_week + datetime.timedelta(days=delta)
-                    date_str = target_date.strftime("%Y-%m-%d")
-                    date_map[idx] = date_str
-                    print(f"     Fallback Header[{idx}] -> {date_str}")
-            
-            # 메뉴 파싱 (tbody)
-            rows = table.select("tbody tr")
-            for tr in rows:
-                th = tr.select_one("th")
-                if not th: continue
-                
-                row_title = th.get_text(strip=True) # 조식, 중식, 석식 등
-                
-                # 데이터 셀
-                tds = tr.select("td")
-                
-                for i, td in enumerate(tds):
-                    # headers 인덱스와 매칭 (td 인덱스 + 1 == th 인덱스, 보통 첫 th가 row header이므로)
-                    # 구조: thead th 개수와 tbody td 개수가 맞는지 확인
-                    # 보통 thead 첫번째 th는 '구분' 등 빈칸.
-                    
-                    # date_map의 키는 thead의 th 인덱스.
-                    # tbody의 td내용은 date_map[i+1] 날짜에 해당 (td 0번 -> th 1번)
-                    
-                    date_key = date_map.get(i + 1)
-                    if date_key:
-                        content = td.get_text("\n", strip=True)
-                        if content:
-                            if date_key not in all_menus:
-                                all_menus[date_key] = {}
-                            
-                            # 기존 내용 병합 (조식, 중식 등 구분)
-                            existing = all_menus[date_key].get(cafe['name'], "")
-                            if existing:
-                                existing += f"\n\n[{row_title}]\n{content}"
-                            else:
-                                existing = f"[{row_title}]\n{content}"
-                            
-                            all_menus[date_key][cafe['name']] = existing
-
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
+                for date_key, day in menus.items():
+                    all_menus.setdefault(date_key, {})[cafe['name']] = day
+                report[key] = {'seconds': round(elapsed, 2), 'days': len(menus)}
+                print(f"   🍚 [{key}] {len(menus)}일치 ({elapsed:.2f}s)")
+    finally:
+        if owns_session:
+            session.close()
+    return all_menus, report
+
+
+# ==========================================
+# 5. 주 단위 저장 + 변경 감지
+# ==========================================
+# 날마다 cafeteria_menus/{date}를 매번 다시 쓰던 것을, 주 문서 cafeteria_weeks/{월요일} 하나에
+# 요일별 식단과 해시를 함께 저장하도록 바꿈. 앱은 주 문서 한 번 읽기로 일주일을 보여줄 수 있고,
+# 다시 수집해도 해시가 같은 날은 쓰지 않음 (주 문서 읽기 1회, 쓰기 0회).
+# cafeteria_menus/{date}는 기존 앱 버전을 위해 바뀐 날만 계속 씀.
+
+WEEK_COLLECTION = 'cafeteria_weeks'
+DAY_COLLECTION = 'cafeteria_menus'
+
+
+def week_start_of(date_key):
+    """'2026-03-04' -> 그 주 월요일 '2026-03-02'"""
+    day = datetime.datetime.strptime(date_key, "%Y-%m-%d").date()
+    return (day - datetime.timedelta(days=day.weekday())).strftime("%Y-%m-%d")
+
+
+def menu_hash(menus):
+    """하루치 식단 해시 (dict 키 순서와 무관)"""
+    canonical = json.dumps(menus, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+DAY_FIELDS = {'menus': 'text', 'slots': 'slots', 'allergens': 'allergens'}
+
+
+def day_entry(cafe_days):
+    """{ 식당: build_day 결과 } -> {'menus': {식당: 문자열}, 'slots': {식당: [...]}, 'allergens': {식당: [...]}}"""
+    return {field: {cafe: day[key] for cafe, day in cafe_days.items()} for field, key in DAY_FIELDS.items()}
+
+
+def plan_week(existing_days, scraped_days):
+    """
+    주 문서의 기존 요일별 데이터와 이번 수집 결과 비교.
+    이번에 실패한 식당의 기존 메뉴는 유지(식당 단위 병합)하고, 해시가 바뀐 날만 changed에 넣음.
+    반환: (새 days { 날짜: {'menus', 'slots', 'allergens', 'hash'} }, 바뀐 날짜 목록)
+    """
+    days = {date_key: dict(entry) for date_key, entry in existing_days.items()}
+    changed = []
+    for date_key in sorted(scraped_days):
+        previous = existing_days.get(date_key, {})
+        fresh = day_entry(scraped_days[date_key])
+        entry = {field: {**previous.get(field, {}), **fresh[field]} for field in DAY_FIELDS}
+        digest = menu_hash(entry)
+        if previous.get('hash') == digest:
+            continue
+        days[date_key] = {**entry, 'hash': digest}
+        changed.append(date_key)
+    return days, changed
+
+
+def save_menus(db, all_menus):
+    """
+    수집 결과를 주별로 묶어 저장. 바뀐 날이 있는 주만 주 문서 + 해당 날짜 문서를 한 배치로 씀.
+    반환: {'weeks': 쓴 주 수, 'changed': 바뀐 날 수, 'unchanged': 건너뛴 날 수}
+    """
+    weeks = {}
+    for date_key, menus in all_menus.items():
+        weeks.setdefault(week_start_of(date_key), {})[date_key] = menus
+
+    stats = {'weeks': 0, 'changed': 0, 'unchanged': 0}
+    for monday, scraped_days in sorted(weeks.items()):
+        week_ref = db.collection(WEEK_COLLECTION).document(monday)
+        snapshot = week_ref.get()
+        existing_days = (snapshot.to_dict() or {}).get('days', {}) if snapshot.exists else {}
+
+        days, changed = plan_week(existing_days, scraped_days)
+        stats['unchanged'] += len(scraped_days) - len(changed)
+        if not changed:
+            print(f"   ⏭️ {monday} 주: 변경 없음 ({len(scraped_days)}일)")
+            continue
 
-    # Firestore 저장
-    if db and all_menus:
-        print(f"💾 Saving {len(all_menus)} dates to Firestore...")
         batch = db.batch()
-        
-        for date_key, menus in all_menus.items():
-            doc_ref = db.collection('cafeteria_menus').document(date_key)
-            batch.set(doc_ref, {
+        batch.set(week_ref, {
+            "week_start": monday,
+            "days": days,
+            "updated_at": firestore.SERVER_TIMESTAMP
+        })
+        for date_key in changed:
+            batch.set(db.collection(DAY_COLLECTION).document(date_key), {
                 "date": date_key,
-                "menus": menus,
+                **days[date_key],
                 "updated_at": firestore.SERVER_TIMESTAMP
             }, merge=True)
-            
         batch.commit()
-        print("✅ Menu Saved Successfully!")
+        stats['weeks'] += 1
+        stats['changed'] += len(changed)
+        print(f"   💾 {monday} 주: {len(changed)}일 변경 ({', '.join(changed)})")
+
+    print(f"✅ Menu Saved: 변경 {stats['changed']}일 / 그대로 {stats['unchanged']}일")
+    return stats
+
+
+def target_weeks(today, prefetch_weeks=PREFETCH_WEEKS):
+    """이번 주 월요일부터 prefetch_weeks주 뒤까지의 월요일(date) 목록"""
+    start_of_week = today - datetime.timedelta(days=today.weekday())
+    return [start_of_week + datetime.timedelta(weeks=i) for i in range(prefetch_weeks + 1)]
+
+
+def scrape_and_save_menu(prefetch_weeks=None):
+    # 한국 시간 기준
+    kst = pytz.timezone("Asia/Seoul")
+    today = datetime.datetime.now(tz=kst).date()
+
+    config, cafeterias = load_cafeterias()
+    if prefetch_weeks is None:
+        prefetch_weeks = int(os.environ.get('CAFETERIA_PREFETCH_WEEKS', config.get('prefetch_weeks', PREFETCH_WEEKS)))
+    # 이번 주 + 다음 N주를 한 번에 받아 두면 주중 재수집 대부분이 변경 없음으로 끝남
+    weeks = target_weeks(today, prefetch_weeks)
+    print(f"📅 Request Weeks: {', '.join(w.strftime('%Y-%m-%d') for w in weeks)} | 식당 {len(cafeterias)}곳 동시 요청")
+
+    started = time.monotonic()
+    all_menus, report = fetch_all_menus(cafeterias, config, weeks)
+    failed = [key for key, result in report.items() if 'error' in result]
+    print(f"⏱️ 요청 {len(report)}건 수집 {time.monotonic() - started:.2f}s (실패 {len(failed)}건{': ' + ', '.join(failed) if failed else ''})")
+
+    # Firestore 저장
+    if db and all_menus:
+        save_menus(db, all_menus)
     else:
         print("⚠️ No data to save or DB not connected.")
         # print(json.dumps(all_menus, indent=2, ensure_ascii=False))
+    return all_menus
 
 if __name__ == "__main__":
     scrape_and_save_menu()
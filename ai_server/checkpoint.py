@@ -0,0 +1,88 @@
+import threading
+from firebase_admin import firestore
+
+# ==========================================
+# 크롤링 체크포인트 (이어하기)
+# ==========================================
+# 페이지를 하나 끝낼 때마다 그 페이지의 쓰기와 커서(다음 페이지)/누적 카운터를
+# 같은 배치로 커밋함. 중간에 죽어도 마지막으로 커밋된 페이지 다음부터 --resume 가능하고,
+# 이미 저장된 공지는 doc.exists 검사로 건너뛰므로 추가 비용이 거의 없음.
+
+CHECKPOINT_COLLECTION = 'crawl_checkpoints'
+
+
+def checkpoint_ref(db, board_id, mode):
+    return db.collection(CHECKPOINT_COLLECTION).document(f"{board_id}_{mode}")
+
+
+def load_checkpoint(db, board_id, mode):
+    """진행 중(status == 'running')인 체크포인트 반환, 없으면 None"""
+    snapshot = checkpoint_ref(db, board_id, mode).get()
+    if not snapshot.exists:
+        return None
+    data = snapshot.to_dict()
+    if data.get('status') != 'running':
+        return None
+    return data
+
+
+def stage_checkpoint(db, batch, board_id, mode, next_page, total_new_items):
+    """페이지 쓰기 배치에 체크포인트 갱신을 추가 (커밋은 호출 측에서)"""
+    batch.set(checkpoint_ref(db, board_id, mode), {
+        'board': board_id,
+        'mode': mode,
+        'status': 'running',
+        'next_page': next_page,
+        'total_new_items': total_new_items,
+        'updated_at': firestore.SERVER_TIMESTAMP,
+    }, merge=True)
+
+
+def complete_checkpoint(db, board_id, mode, total_new_items, pipeline_stats=None):
+    data = {
+        'status': 'done',
+        'total_new_items': total_new_items,
+        'finished_at': firestore.SERVER_TIMESTAMP,
+    }
+    if pipeline_stats is not None:
+        data['pipeline_stats'] = pipeline_stats  # 마지막 실행의 단계별 처리량/큐 깊이
+    checkpoint_ref(db, board_id, mode).set(data, merge=True)
+
+
+class PageTracker:
+    """
+    파이프라인에서 페이지별 미완료 항목 수를 추적.
+    앞 페이지부터 연속으로 모든 항목이 저장된 페이지까지만 체크포인트에 반영함
+    (여러 워커가 순서와 무관하게 끝내도 체크포인트가 앞서 나가지 않도록)
+    """
+
+    def __init__(self, first_page=1):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._closed = set()
+        self._next_page = first_page
+
+    def add(self, page):
+        with self._lock:
+            self._pending[page] = self._pending.get(page, 0) + 1
+
+    def close(self, page):
+        """page의 항목을 모두 내보냄 (더 이상 add 없음)"""
+        with self._lock:
+            self._closed.add(page)
+            self._advance()
+
+    def done(self, page):
+        with self._lock:
+            self._pending[page] -= 1
+            self._advance()
+
+    def _advance(self):
+        while self._next_page in self._closed and self._pending.get(self._next_page, 0) == 0:
+            self._next_page += 1
+
+    @property
+    def next_page(self):
+        """아직 완료되지 않은 가장 앞 페이지 (= 이어하기 시작 페이지)"""
+        with self._lock:
+            return self._next_page
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# ==========================================
+# 분류 결과 영구 캐시 (SQLite)
+# ==========================================
+# 같은 제목(매년 반복되는 "수강신청 안내", 여러 게시판에 올라온 같은 글)을
+# 다시 Gemini에 보내지 않도록 정규화된 제목 + 프롬프트/모델 버전을 키로 저장.
+# TTL이 지난 항목은 무시하고, 최대 개수를 넘으면 오래 안 쓰인 것부터 삭제함.
+
+CACHE_PATH = os.environ.get(
+    'CLASSIFICATION_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'classification_cache.sqlite3'))
+DEFAULT_TTL = 180 * 24 * 60 * 60   # 180일
+MAX_ENTRIES = 20000
+
+
+def normalize_title(title):
+    """캐시 키용 정규화: 유니코드 정규화, 공백 통일, 소문자"""
+    title = unicodedata.normalize('NFKC', title)
+    title = re.sub(r'\s+', ' ', title).strip()
+    return title.lower()
+
+
+class ClassificationCache:
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 분류 단계 워커 여러 개가 같이 쓰므로 연결 하나를 락으로 보호
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS classifications (
+                key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                version TEXT NOT NULL,
+                category TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON classifications (last_used_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(title, version):
+        return hashlib.sha1(f"{version}\n{normalize_title(title)}".encode('utf-8')).hexdigest()
+
+    def _lookup(self, key, now):
+        """락을 잡은 상태에서 호출. 유효한 항목이면 카테고리 (만료 항목은 삭제)"""
+        row = self._conn.execute(
+            "SELECT category, created_at FROM classifications WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                self._conn.execute("DELETE FROM classifications WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        self._conn.execute("UPDATE classifications SET last_used_at = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return row[0]
+
+    def get(self, title, version):
+        return self.get_any(title, [version])
+
+    def get_any(self, title, versions):
+        """여러 버전(예: 모델별) 중 앞에서부터 처음 찾은 결과 반환 (hit/miss는 한 번만 셈)"""
+        now = time.time()
+        with self._lock:
+            for version in versions:
+                category = self._lookup(self.make_key(title, version), now)
+                if category:
+                    self.hits += 1
+                    return category
+            self.misses += 1
+            return None
+
+    def put(self, title, version, category):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO classifications (key, title, version, category, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(title, version), normalize_title(title), version, category, now, now))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM classifications").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM classifications WHERE key IN "
+                "(SELECT key FROM classifications ORDER BY last_used_at ASC LIMIT ?)",
+                (count - self.max_entries,))
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM classifications").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
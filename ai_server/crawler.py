@@ -11,8 +11,18 @@ import os
 import json
 import re
 import csv
-from datetime import datetime
-from gemini_classifier import classify_notice_with_gemini
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from gemini_classifier import classify_notices_with_gemini, get_cache, classifier_stats
+from title_index import build_index
+from boards import load_boards, get_board, list_url, detail_url, board_host, notice_doc_id, DEFAULT_BOARD_ID
+from rate_limiter import HostRateLimiter
+from retry_queue import is_detail_failed, schedule_retry, enqueue_missing_content, drain_retry_queue
+from checkpoint import load_checkpoint, stage_checkpoint, complete_checkpoint, PageTracker
+from pipeline import Pipeline, Stage
+from auto_push import AutoPushPolicy
+import argparse
+import threading
 
 # ==========================================
 # 1. Firebase 접속 설정
@@ -46,13 +56,28 @@ try:
 except:
     print("⚠️ dataset.csv 없음. 100% Gemini 의존.")
 
+# 연도/학기/말머리만 다른 반복 공지도 족보 라벨을 쓰도록 유사 제목 색인
+label_index = build_index(manual_labels)
+
 # ==========================================
 # 설정
 # ==========================================
-START_URL = "https://www.gnu.ac.kr/cse/na/ntt/selectNttList.do?mi=17093&bbsId=4753"
-BASE_HOST = "https://www.gnu.ac.kr"
+DEFAULT_BOARD = get_board(DEFAULT_BOARD_ID)
+START_URL = list_url(DEFAULT_BOARD)
+BASE_HOST = DEFAULT_BOARD['host']
 CUTOFF_DATE = "2023.01.01"
 
+# 중요 공지 키워드
+IMPORTANT_KEYWORDS = ["수강신청", "기숙사", "휴학", "복학", "졸업", "국가장학금", "등록금", "장학금"]
+
+# 모든 게시판 워커가 공유하는 호스트별 요청 간격 제한 (Too Fast 403 방지)
+rate_limiter = HostRateLimiter(min_interval=1.0)
+
+def evaluate_importance(title, is_pinned_on_web):
+    # 중요: 웹 고정(공지 번호)이거나 키워드 포함 시
+    has_important_keyword = any(keyword in title for keyword in IMPORTANT_KEYWORDS)
+    return is_pinned_on_web or has_important_keyword
+
 def check_deadline_urgency(title):
     try:
         match = re.search(r'~(\s*)(\d{1,2})[./](\d{1,2})', title)
@@ -93,11 +118,15 @@ def reset_daily_views():
 # ==========================================
 # 3. 상세 페이지 크롤링 (Selenium 사용)
 # ==========================================
-def scrape_detail_with_selenium(driver, url):
+def scrape_detail_with_selenium(driver, url, board=None):
+    board = board or DEFAULT_BOARD
+    selectors = board['selectors']
+    base_host = board['host']
     try:
         # 새 탭 열기 및 이동
         driver.execute_script("window.open('');")
         driver.switch_to.window(driver.window_handles[1])
+        rate_limiter.wait(board_host(board))
         driver.get(url)
         time.sleep(2) # 로딩 대기
 
@@ -110,21 +139,19 @@ def scrape_detail_with_selenium(driver, url):
         files = []
 
         # 1. 본문 (HTML 구조 유지)
-        cont_row = soup.select_one('tr.cont')
-        if cont_row:
-             content_td = cont_row.select_one('td')
-             if content_td:
-                 # 이미지 경로 절대주소로 변환
-                 for img in content_td.select('img'):
-                     src = img.get('src')
-                     if src and src.startswith('/'):
-                         img['src'] = BASE_HOST + src
-                         images.append(img['src'])
-                 
-                 # style 속성 중 불필요한 것 제거 or 유지? 
-                 # 모바일에서 보기에 너무 넓은 width나 고정된 height은 제거하는게 좋음
-                 # 일단 innerHTML을 그대로 가져오되, 불필요한 공백 제거
-                 content_html = content_td.decode_contents()
+        content_td = soup.select_one(selectors['content'])
+        if content_td:
+            # 이미지 경로 절대주소로 변환
+            for img in content_td.select('img'):
+                src = img.get('src')
+                if src and src.startswith('/'):
+                    img['src'] = base_host + src
+                    images.append(img['src'])
+            
+            # style 속성 중 불필요한 것 제거 or 유지? 
+            # 모바일에서 보기에 너무 넓은 width나 고정된 height은 제거하는게 좋음
+            # 일단 innerHTML을 그대로 가져오되, 불필요한 공백 제거
+            content_html = content_td.decode_contents()
 
         # 1-1. 메타데이터 (작성자, 조회수, 등록일, 제목 등) - 테이블 구조 분석
         metadata = {'author': '학과사무실', 'views': 0, 'date': ''} 
@@ -173,22 +200,22 @@ def scrape_detail_with_selenium(driver, url):
 
         # 만약 tr.cont를 못 찾으면 기존 방식(백업) 시도
         if not content_html:
-            content_div = soup.select_one('.bbs_cntn') or \
-                          soup.select_one('.bdv_txt') or \
-                          soup.select_one('.view_con')
+            content_div = None
+            for fallback in selectors['content_fallback']:
+                content_div = soup.select_one(fallback)
+                if content_div: break
             if content_div:
                 for img in content_div.select('img'):
                      src = img.get('src')
                      if src and src.startswith('/'):
-                         img['src'] = BASE_HOST + src
+                         img['src'] = base_host + src
                          images.append(img['src'])
                 content_html = content_div.decode_contents()
 
         # 2. 첨부파일 찾기 (ul.file)
         # <ul class="file"> <li> <a href="..."> ... </a> </li> </ul>
-        file_ul = soup.select_one('ul.file')
-        if file_ul:
-            file_links = file_ul.select('a')
+        file_links = soup.select(selectors['file_links'])
+        if file_links:
             for file in file_links:
                 # "바로보기" 버튼 등 제외하고 다운로드 링크만
                 href = file.get('href')
@@ -200,19 +227,22 @@ def scrape_detail_with_selenium(driver, url):
                         span.extract()
                     f_name = file.get_text(strip=True)
                     
-                    if href.startswith('/'): href = BASE_HOST + href
+                    if href.startswith('/'): href = base_host + href
                     
                     if not any(f['url'] == href for f in files):
                         files.append({'name': f_name, 'url': href})
         
         # 기존 방식 백업 (첨부파일)
         if not files:
-            file_links = soup.select('.file_area a') or soup.select('.bo_file a')
+            file_links = []
+            for fallback in selectors['file_links_fallback']:
+                file_links = soup.select(fallback)
+                if file_links: break
             for file in file_links:
                 f_name = file.get_text(strip=True)
                 f_url = file.get('href')
                 if f_url and not f_url.startswith('javascript'):
-                    if f_url.startswith('/'): f_url = BASE_HOST + f_url
+                    if f_url.startswith('/'): f_url = base_host + f_url
                     if not any(f['url'] == f_url for f in files):
                         files.append({'name': f_name, 'url': f_url})
 
@@ -239,198 +269,460 @@ def scrape_detail_with_selenium(driver, url):
             'text': '',
             'images': [],
             'files': [], 
-            'metadata': {}
+            'metadata': {},
+            'error': str(e)
         }
 
 # ==========================================
 # 4. 메인 크롤러
 # ==========================================
-def crawl_gnu_cse(mode='all', headless=True, page_limit=None):
-    if page_limit:
-        MAX_PAGE_LIMIT = page_limit
-    else:
-        MAX_PAGE_LIMIT = 500 if mode == 'all' else 3
-    print(f"🕷️ 최종 시스템 가동 (Selenium 탭 전환 방식)")
-    
+# 파이프라인 설정: 목록 페이지(source) -> 중복 체크 -> 분류 -> 상세 수집 -> 배치 저장
+DEDUP_WORKERS = 4
+DETAIL_WORKERS = int(os.environ.get('CRAWL_DETAIL_WORKERS', '2'))  # 워커마다 Chrome 1개
+CLASSIFY_BATCH_SIZE = 20  # 한 페이지의 새 공지를 Gemini 요청 한 번으로 분류
+SINK_BATCH_SIZE = 20
+
+def create_driver(headless=True):
+    """크롤링용 Chrome 드라이버 생성 (스케줄러 데몬에서는 재사용)"""
     options = webdriver.ChromeOptions()
     if headless:
         options.add_argument('--headless')
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
-    driver.get(START_URL)
-    time.sleep(2) 
-
-    total_count = 0
-    total_new_items = 0
-    page = 1
-    stop_crawling = False
-
-    while not stop_crawling:
-        if page > MAX_PAGE_LIMIT: break
-
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        rows = soup.select('tbody tr')
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+class DriverPool:
+    """
+    Chrome 드라이버 재사용 풀 (스레드 안전)
+    목록 페이지용/상세 수집 워커용 드라이버를 빌려주고, 스케줄러 데몬에서는 실행 사이에도 유지됨
+    """
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self._lock = threading.Lock()
+        self._idle = []
+        self._all = []
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        driver = create_driver(self.headless)
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def release(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._idle.append(driver)
+
+    def discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            if driver in self._idle:
+                self._idle.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+def parse_notice_rows(html, board):
+    """목록 페이지 HTML -> 행 레코드 목록"""
+    selectors = board['selectors']
+    soup = BeautifulSoup(html, 'html.parser')
+    records = []
+
+    for row in soup.select(selectors['row']):
+        cols = row.select('td')
+        if not cols: continue
+
+        num_str = cols[0].get_text(strip=True)
+        title_tag = row.select_one(selectors['title_link'])
+        if not title_tag or not title_tag.get(selectors['id_attr']): continue
+
+        link_id = title_tag[selectors['id_attr']]
+
+        # 날짜 확인
+        date_str = ""
+        for col in cols:
+            text = col.get_text(strip=True)
+            if re.match(r'^\d{4}\.\d{2}\.\d{2}$', text):
+                date_str = text
+                break
+
+        records.append({
+            'board': board['id'],
+            'doc_id': notice_doc_id(board, link_id),
+            'ntt_sn': link_id,
+            'num': num_str,
+            'title': title_tag.get_text(strip=True),
+            'url': detail_url(board, link_id),
+            'date': date_str,
+            'is_pinned': "공지" in num_str,
+        })
+    return records
+
+def classify_categories(titles):
+    """족보(manual_labels)에 있거나 유사한 제목은 족보 라벨로, 나머지는 Gemini 배치 요청 한 번으로 분류"""
+    categories = [label_index.label_for(title) for title in titles]
+    unknown = [i for i, c in enumerate(categories) if c is None]
+    if unknown:
+        predicted = classify_notices_with_gemini([titles[i] for i in unknown])
+        for i, category in zip(unknown, predicted):
+            categories[i] = category
+    return categories
+
+def build_detail_update(detail_data):
+    """상세 수집 결과 중 본문/첨부 관련 필드 (재시도 큐에서 재수집 시 사용)"""
+    update = {
+        'content': detail_data['content'],
+        'content_text': detail_data['text'],
+        'images': detail_data['images'],
+        'files': detail_data['files'],
+    }
+    if detail_data['metadata'].get('author'):
+        update['author'] = detail_data['metadata']['author']
+    if detail_data['metadata'].get('views'):
+        update['views'] = detail_data['metadata']['views']
+    return update
+
+def build_notice_doc(record, detail_data, category, board):
+    """상세 수집 결과 -> notices 문서"""
+    title = record['title']
+    is_important = evaluate_importance(title, record['is_pinned'])
+    is_deadline_imminent = check_deadline_urgency(title)
+    # 긴급: 중요 공지이면서 마감 임박인 경우 (또는 관리자 수동 설정)
+    # 여기서는 '자동' 긴급 로직만 설정
+    is_urgent_display = is_important and is_deadline_imminent
+
+    final_author = detail_data['metadata'].get('author', "학과사무실")
+
+    final_date = record['date']
+    if detail_data['metadata'].get('date'):
+        final_date = detail_data['metadata']['date']
+
+    return {
+        'title': title,
+        'link': record['url'],
+        'board': board['id'],
+        'date': final_date,
+        'category': category,
+        'is_important': is_important,
+        'is_urgent': is_urgent_display, # 초기값 (관리자가 바꿀 수 있음)
+        
+        'author': final_author,
+        'views': detail_data['metadata'].get('views', 0),
+        # views_today는 여기서 건드리지 않음 (0으로 덮어쓰면 안됨)
         
+        'is_manual': False,
+        'crawled_at': firestore.SERVER_TIMESTAMP,
+        
+        'content': detail_data['content'],
+        'content_text': detail_data['text'],
+        'images': detail_data['images'], 
+        'files': detail_data['files']
+    }
+
+def iter_board_rows(board, driver, start_page, max_page, tracker, state):
+    """
+    [source] 목록 페이지를 넘기며 행 레코드를 하나씩 내보냄
+    날짜 컷오프/페이지 한도에 닿거나 페이지 이동에 실패하면 종료
+    """
+    host = board_host(board)
+    page = start_page
+
+    while page <= max_page:
+        records = parse_notice_rows(driver.page_source, board)
+
         # 페이지 검증
         check_title = "제목못찾음"
-        for r in rows:
-            if "공지" not in r.select('td')[0].get_text():
-                t = r.select_one('a.nttInfoBtn')
-                if t: 
-                    check_title = t.get_text(strip=True)[:10]
-                    break
-        print(f"\n📄 {page}페이지 스캔 중 (일반글: {check_title}...)")
-
-        new_in_page = 0
-        
-        for row in rows:
-            cols = row.select('td')
-            if not cols: continue
-            
-            num_str = cols[0].get_text(strip=True)
-            title_tag = row.select_one('a.nttInfoBtn')
-            if not title_tag: continue
-            
-            title = title_tag.get_text(strip=True)
-            link_id = title_tag['data-id']
-            full_url = f"{BASE_HOST}/cse/na/ntt/selectNttInfo.do?mi=17093&bbsId=4753&nttSn={link_id}"
-            
-            # 날짜 확인
-            date_str = ""
-            for col in cols:
-                text = col.get_text(strip=True)
-                if re.match(r'^\d{4}\.\d{2}\.\d{2}$', text):
-                    date_str = text
-                    break
-            
+        for r in records:
+            if not r['is_pinned']:
+                check_title = r['title'][:10]
+                break
+        print(f"\n📄 [{board['id']}] {page}페이지 스캔 중 (일반글: {check_title}...)")
+
+        stop_crawling = False
+        for record in records:
             # 날짜 컷오프
-            if "공지" not in num_str and date_str:
-                if date_str < CUTOFF_DATE:
-                    print(f"   🛑 2023년 이전 데이터 발견 ({date_str}). 종료.")
-                    stop_crawling = True
-                    break
-
-            # --- DB 중복 체크 (내용 있으면 패스) ---
-            doc_ref = db.collection('notices').document(link_id)
-            doc = doc_ref.get()
-            
-            # 내용(content)까지 이미 꽉 차있으면 건너뜀
-            # --- [Optimized Update Logic] ---
-            # 1. 문서가 이미 존재하면: 메타데이터(조회수, 중요도 등)만 업데이트하고 Selenium Skip
-            if doc.exists:
-                existing_data = doc.to_dict()
-                
-                # Check if content exists
-                has_content = bool(existing_data.get('content'))
-                
-                # Re-evaluate importance (e.g. might have been unpinned)
-                IMPORTANT_KEYWORDS = ["수강신청", "기숙사", "휴학", "복학", "졸업", "국가장학금", "등록금", "장학금"]
-                is_pinned_on_web = "공지" in num_str
-                has_important_keyword = any(keyword in title for keyword in IMPORTANT_KEYWORDS)
-                is_important = is_pinned_on_web or has_important_keyword
-                
-                # Update only metadata
-                doc_ref.set({
-                    'views': existing_data.get('views', 0), # 리스트에서 조회수를 못 가져오면 기존 유지 (ToDo: 리스트에서 조회수 파싱)
-                    'is_important': is_important,
-                    'is_urgent': is_important and check_deadline_urgency(title), # Re-check urgency
-                    # 'date': date_str # 날짜는 보통 안 변하므로 패스
-                }, merge=True)
-
-                if has_content:
-                    print(f"   ⏩ 기존 데이터 존재 (메타 업데이트 완료): {title[:10]}...")
-                    continue 
-                else:
-                    print(f"   ⚠️ 기존 데이터 있으나 본문 없음 -> 상세 수집 진행")
-
-            # 문서가 없거나 본문이 비어있으면 계속 진행 (Selenium) 
-
-            # --- [상세 내용 수집] ---
-            # Selenium 브라우저를 그대로 넘겨줘서 쿠키 유지!
-            print(f"   🔍 상세 수집: {title[:10]}...", end="")
-            detail_data = scrape_detail_with_selenium(driver, full_url)
-            print(" 완료")
-            time.sleep(1.0) # Rate Limiting (Too Fast 403 방지)
-
-            # --- 분류 로직 (중요/카테고리/긴급) ---
-            # 중요 공지 키워드 확장
-            IMPORTANT_KEYWORDS = ["수강신청", "기숙사", "휴학", "복학", "졸업", "국가장학금", "등록금", "장학금"]
-            is_pinned_on_web = "공지" in num_str
-            has_important_keyword = any(keyword in title for keyword in IMPORTANT_KEYWORDS)
-            
-            # 중요: 웹 고정(공지 번호)이거나 키워드 포함 시
-            is_important = is_pinned_on_web or has_important_keyword
-
-            category = "학사"
-            if title in manual_labels:
-                category = manual_labels[title]
-            else:
-                category = classify_notice_with_gemini(title)
-                time.sleep(0.5) 
-
-            is_deadline_imminent = check_deadline_urgency(title)
-            # 긴급: 중요 공지이면서 마감 임박인 경우 (또는 관리자 수동 설정)
-            # 여기서는 '자동' 긴급 로직만 설정
-            is_urgent_display = is_important and is_deadline_imminent
-
-            # --- 저장 ---
-            final_author = detail_data['metadata'].get('author', "학과사무실")
-            if final_author == "학과사무실" and "작성자" in title: 
-                 pass
-
-            final_date = date_str 
-            if detail_data['metadata'].get('date'):
-                final_date = detail_data['metadata']['date']
-
-            save_data = {
-                'title': title,
-                'link': full_url,
-                'date': final_date,
-                'category': category,
-                'is_important': is_important,
-                'is_urgent': is_urgent_display, # 초기값 (관리자가 바꿀 수 있음)
-                
-                'author': final_author,
-                'views': detail_data['metadata'].get('views', 0),
-                # views_today는 여기서 건드리지 않음 (0으로 덮어쓰면 안됨)
-                
-                'is_manual': False,
-                'crawled_at': firestore.SERVER_TIMESTAMP,
-                
-                'content': detail_data['content'],
-                'content_text': detail_data['text'],
-                'images': detail_data['images'], 
-                'files': detail_data['files']
-            }
-            
-            # views_today 필드가 없으면 0으로 초기화 (merge=True라 기존 값 유지됨)
-            if not doc.exists:
-                save_data['views_today'] = 0
-            
-            doc_ref.set(save_data, merge=True)
-            new_in_page += 1
-            total_new_items += 1
-            
-        print(f"   -> {new_in_page}개 처리 완료")
-        
-        if stop_crawling: break
+            if not record['is_pinned'] and record['date'] and record['date'] < CUTOFF_DATE:
+                print(f"   🛑 2023년 이전 데이터 발견 ({record['date']}). 종료.")
+                stop_crawling = True
+                break
+            record['page'] = page
+            tracker.add(page)
+            yield record
+        tracker.close(page)
+
+        if stop_crawling:
+            return
 
         # 페이지 이동 (goPaging)
         page += 1
+        if page > max_page:
+            return
         try:
+            rate_limiter.wait(host)
             driver.execute_script(f"goPaging({page});")
-            time.sleep(2) 
+            time.sleep(2)
+        except Exception as e:
+            print(f"❌ 이동 실패 (체크포인트 유지, --resume으로 이어하기 가능): {e}")
+            state['interrupted'] = True
+            return
+
+def crawl_board(board, mode='all', headless=True, page_limit=None, pool=None, resume=False, monitor_interval=None):
+    """
+    게시판 하나를 단계별 파이프라인으로 크롤링
+    목록 페이지 -> 중복 체크 -> 분류 -> 상세 수집 -> 배치 저장 (단계마다 제한 큐/워커)
+    저장 배치마다 체크포인트를 함께 커밋. resume=True면 마지막 체크포인트부터 이어서 진행
+    """
+    if page_limit:
+        MAX_PAGE_LIMIT = page_limit
+    else:
+        MAX_PAGE_LIMIT = 500 if mode == 'all' else 3
+    print(f"🕷️ [{board['name']}] 크롤링 시작 (파이프라인: 상세 수집 워커 {DETAIL_WORKERS}개)")
+
+    # 외부에서 풀을 넘겨주면 (스케줄러 데몬) 드라이버를 종료하지 않고 재사용
+    owns_pool = pool is None
+    if owns_pool:
+        pool = DriverPool(headless)
+
+    host = board_host(board)
+    list_driver = pool.acquire()
+    rate_limiter.wait(host)
+    list_driver.get(list_url(board))
+    time.sleep(2)
+
+    start_page = 1
+    counters = {'new': 0, 'updated': 0}
+
+    if resume:
+        checkpoint = load_checkpoint(db, board['id'], mode)
+        if checkpoint and checkpoint.get('next_page', 1) > 1:
+            start_page = checkpoint['next_page']
+            counters['new'] = checkpoint.get('total_new_items', 0)
+            print(f"↩️ 체크포인트에서 이어하기: {start_page}페이지부터 (누적 {counters['new']}개)")
+            try:
+                rate_limiter.wait(host)
+                list_driver.execute_script(f"goPaging({start_page});")
+                time.sleep(2)
+            except Exception as e:
+                print(f"❌ 체크포인트 페이지 이동 실패 (처음부터 진행): {e}")
+                start_page = 1
+                counters['new'] = 0
+
+    tracker = PageTracker(start_page)
+    state = {'interrupted': False, 'failed': 0}
+    # 규칙에 맞는 새 공지는 저장하면서 바로 푸시 요청 (백필 모드에서는 꺼짐)
+    auto_push = AutoPushPolicy(mode=mode)
+    seen_lock = threading.Lock()
+    seen_ids = set()
+    local = threading.local()  # 상세 수집 워커별 드라이버
+
+    # --- 1. 중복 체크 (Firestore 읽기) ---
+    def dedup(record, emit):
+        with seen_lock:
+            duplicate = record['doc_id'] in seen_ids  # 고정 공지가 여러 페이지에 반복됨
+            seen_ids.add(record['doc_id'])
+        if duplicate:
+            tracker.done(record['page'])
+            return
+
+        title = record['title']
+        doc = db.collection('notices').document(record['doc_id']).get()
+        if not doc.exists:
+            record['discovered_at'] = datetime.now(timezone.utc)  # 발견 -> 알림 시간 측정 기준
+            emit({'kind': 'new', 'record': record})
+            return
+
+        # 문서가 이미 존재하면: 메타데이터(중요도 등)만 업데이트하고 Selenium Skip
+        existing_data = doc.to_dict()
+        is_important = evaluate_importance(title, record['is_pinned'])
+        meta = {
+            'views': existing_data.get('views', 0), # 리스트에서 조회수를 못 가져오면 기존 유지 (ToDo: 리스트에서 조회수 파싱)
+            'is_important': is_important,
+            'is_urgent': is_important and check_deadline_urgency(title), # Re-check urgency
+        }
+
+        if existing_data.get('content'):
+            print(f"   ⏩ 기존 데이터 존재 (메타 업데이트): {title[:10]}...")
+        elif existing_data.get('content_pending') or existing_data.get('content_failed'):
+            print(f"   ⏩ 본문 재수집 대기 중 (재시도 큐): {title[:10]}...")
+        else:
+            # 본문 없는 기존 문서는 여기서 재수집하지 않고 재시도 큐로 넘김
+            enqueue_missing_content(db, record)
+            print("   ⚠️ 기존 데이터 있으나 본문 없음 -> 재시도 큐 등록")
+        emit({'kind': 'meta', 'record': record, 'data': meta})
+
+    # --- 2. 상세 수집 (워커별 Chrome, 호스트별 간격 제한) ---
+    def setup_detail_worker():
+        local.driver = pool.acquire()
+        rate_limiter.wait(host)
+        local.driver.get(list_url(board))  # 세션 쿠키 확보
+
+    def teardown_detail_worker():
+        pool.release(local.driver)
+
+    def fetch_detail(item, emit):
+        if item['kind'] == 'new':
+            record = item['record']
+            print(f"   🔍 상세 수집: {record['title'][:10]}...")
+            item['detail'] = scrape_detail_with_selenium(local.driver, record['url'], board)
+        emit(item)
+
+    # --- 3. 분류 (제목만 필요하므로 상세 수집 전에 페이지 단위로 묶어서) ---
+    def classify(items, emit):
+        new_items = [item for item in items if item['kind'] == 'new']
+        if new_items:
+            categories = classify_categories([item['record']['title'] for item in new_items])
+            for item, category in zip(new_items, categories):
+                item['category'] = category
+        for item in items:
+            emit(item)
+
+    # --- 4. 배치 저장 + 체크포인트 ---
+    def sink(items, emit):
+        batch = db.batch()
+        failed_records = []
+        for item in items:
+            record = item['record']
+            doc_ref = db.collection('notices').document(record['doc_id'])
+            if item['kind'] == 'meta':
+                batch.set(doc_ref, item['data'], merge=True)
+                counters['updated'] += 1
+            else:
+                save_data = build_notice_doc(record, item['detail'], item['category'], board)
+                save_data['views_today'] = 0
+                # 상세 수집 실패: 본문 없이 저장하고 재시도 큐에 등록 (다음 크롤링 본 루프에서는 건너뜀)
+                if is_detail_failed(item['detail']):
+                    save_data['content_pending'] = True
+                    failed_records.append((record, item['detail'].get('error') or 'empty content'))
+                save_data['discovered_at'] = record['discovered_at']
+                # content_pending(본문 없음)이면 자동 푸시하지 않음 (빈 공지 알림 방지)
+                reason = auto_push.apply(record, save_data)
+                if reason:
+                    print(f"   🔔 자동 푸시 요청 ({reason}): {record['title'][:10]}...")
+                batch.set(doc_ref, save_data, merge=True)
+                counters['new'] += 1
+            tracker.done(record['page'])
+
+        # 쓰기 + 체크포인트(완료된 페이지 다음, 누적 카운터) 원자적 커밋
+        stage_checkpoint(db, batch, board['id'], mode, tracker.next_page, counters['new'])
+        batch.commit()
+        # 재시도 큐는 공지 문서가 커밋된 뒤에 등록
+        for record, error in failed_records:
+            schedule_retry(db, record, error)
+        new_count = sum(1 for item in items if item['kind'] == 'new')
+        print(f"   💾 저장 {len(items)}건 (새 공지 {new_count}건, 누적 {counters['new']}건)")
+        emit(len(items))
+
+    def on_error(stage_name, items, exc):
+        # 실패한 항목은 저장되지 않았으므로 페이지 완료로 처리하지 않음 (체크포인트가 그 페이지에서 멈춤).
+        # 상세 수집 실패는 예외가 아니라 재시도 큐로 가므로 여기로 오지 않음
+        failed = items if isinstance(items, list) else [items]
+        with seen_lock:
+            state['failed'] += len(failed)
+        print(f"   ⚠️ [{stage_name}] {len(failed)}건 저장 안 됨 (체크포인트 진행 보류)")
+
+    pipeline = Pipeline([
+        Stage('dedup', dedup, workers=DEDUP_WORKERS, queue_size=64),
+        Stage('classify', classify, workers=1, queue_size=64, batch_size=CLASSIFY_BATCH_SIZE, batch_wait=2.0),
+        Stage('detail', fetch_detail, workers=DETAIL_WORKERS, queue_size=16,
+              setup=setup_detail_worker, teardown=teardown_detail_worker),
+        Stage('sink', sink, workers=1, queue_size=64, batch_size=SINK_BATCH_SIZE, batch_wait=1.0),
+    ], on_error=on_error, monitor_interval=monitor_interval)
+
+    try:
+        stats = pipeline.run(iter_board_rows(board, list_driver, start_page, MAX_PAGE_LIMIT, tracker, state))
+        print(f"\n📊 [{board['id']}] 단계별 처리 현황\n{pipeline.format_stats()}")
+        cache = get_cache()
+        if cache:
+            print(f"   🗃️ 분류 캐시: {cache.stats()}")
+        print(f"   📚 족보 유사 검색: {label_index.stats()}")
+        print(f"   🤖 Gemini: {classifier_stats()}")
+        if auto_push.active:
+            print(f"   🔔 자동 푸시: {auto_push.summary()}")
+
+        if state['failed']:
+            print(f"⚠️ 저장 실패 {state['failed']}건: 체크포인트 유지 (--resume으로 실패한 페이지부터 다시 수집)")
+        elif not state['interrupted']:
+            complete_checkpoint(db, board['id'], mode, counters['new'], pipeline_stats=stats)
+
+        # 새 공지 처리가 끝난 뒤 재시도 큐 처리 (저우선순위)
+        try:
+            retry_stats = drain_retry_queue(
+                db, board['id'],
+                fetch_detail=lambda url: scrape_detail_with_selenium(list_driver, url, board),
+                build_update=lambda entry, detail: build_detail_update(detail),
+            )
+            if retry_stats['retried']:
+                print(f"   -> 재시도 {retry_stats['retried']}건 (복구 {retry_stats['recovered']}, 격리 {retry_stats['quarantined']})")
         except Exception as e:
-            print(f"❌ 이동 실패: {e}")
-            break
+            print(f"⚠️ 재시도 큐 처리 실패: {e}")
+    finally:
+        pool.release(list_driver)
+        if owns_pool:
+            pool.close()
+
+    print(f"\n✅ [{board['name']}] 완료! 총 {counters['new']}개의 새 공지사항을 수집했습니다.")
+    return counters['new']
+
+def crawl_gnu_cse(mode='all', headless=True, page_limit=None, pool=None, resume=False):
+    """학과 공지 게시판 크롤링 (기존 진입점 유지)"""
+    return crawl_board(DEFAULT_BOARD, mode=mode, headless=headless, page_limit=page_limit, pool=pool, resume=resume)
+
+def crawl_all_boards(mode='recent', headless=True, page_limit=None, pool=None, boards=None, resume=False,
+                     monitor_interval=None):
+    """
+    boards.json에 등록된(enabled) 게시판을 동시에 크롤링
+    드라이버는 하나의 풀에서 빌려 쓰고, 같은 호스트 요청 간격은 rate_limiter가 조율.
+    pool(DriverPool)을 넘기면 드라이버를 종료하지 않고 다음 실행에서 재사용.
+    """
+    boards = boards if boards is not None else load_boards()
+    owns_pool = pool is None
+    if owns_pool:
+        pool = DriverPool(headless)
+
+    results = {}
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(boards), 1)) as executor:
+            futures = {board['id']: executor.submit(crawl_board, board, mode, headless, page_limit, pool, resume, monitor_interval)
+                       for board in boards}
+            for board_id, future in futures.items():
+                try:
+                    results[board_id] = future.result()
+                except Exception as e:
+                    print(f"❌ [{board_id}] 크롤링 실패: {e}")
+                    errors.append(e)
+    finally:
+        if owns_pool:
+            pool.close()
+    if errors and not results:
+        raise errors[0]
+
+    print(f"\n📊 게시판별 새 공지: {results}")
+    return sum(results.values())
 
-    driver.quit()
-    print(f"\n✅ 모든 작업 완료! 총 {total_new_items}개의 새 공지사항을 수집했습니다.")
-    return total_new_items
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학과 공지 크롤러")
+    parser.add_argument('--mode', choices=['recent', 'all'], default='recent', help="recent: 최근 3페이지, all: 전체 (최대 500페이지)")
+    parser.add_argument('--pages', type=int, default=None, help="최대 페이지 수")
+    parser.add_argument('--board', default=None, help="특정 게시판 id만 크롤링 (boards.json)")
+    parser.add_argument('--resume', action='store_true', help="마지막 체크포인트부터 이어서 크롤링")
+    parser.add_argument('--monitor', type=float, default=None, help="N초마다 파이프라인 단계별 처리량/큐 깊이 출력")
+    args = parser.parse_args()
+
     # [GitHub Actions / Cron 모드]
     print(f"⏰ 정기 크롤링 시작: {datetime.now()}")
     
@@ -445,5 +737,7 @@ if __name__ == "__main__":
         print("🌙 자정(KST 00시) 감지 -> 일일 조회수 초기화 실행")
         reset_daily_views()
     
-    # 2. 크롤링 실행 (최근 글 위주)
-    crawl_gnu_cse(mode='recent', headless=True)
\ No newline at end of file
+    # 2. 크롤링 실행 (기본: 최근 글 위주, 등록된 모든 게시판)
+    boards = [get_board(args.board)] if args.board else None
+    crawl_all_boards(mode=args.mode, headless=True, page_limit=args.pages, boards=boards, resume=args.resume,
+                     monitor_interval=args.monitor)
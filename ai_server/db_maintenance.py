@@ -80,6 +80,30 @@ def delete_old_menus(days_to_keep=7):
         
     print(f"   - Deleted {count} old menu documents (older than {cutoff_str}).")
 
+    # 주 문서(cafeteria_weeks)는 그 주 일요일까지 보관 기간이 지났을 때 삭제
+    week_cutoff_str = (cutoff_date - timedelta(days=6)).strftime("%Y-%m-%d")
+    weeks = db.collection('cafeteria_weeks').where('week_start', '<', week_cutoff_str).stream()
+
+    # 배치는 500건 제한이 있으므로 위와 같이 400건마다 커밋, 커밋된 건수만 셈
+    week_count = 0
+    pending = 0
+    batch = db.batch()
+
+    for doc in weeks:
+        batch.delete(doc.reference)
+        pending += 1
+        if pending == 400:
+            batch.commit()
+            week_count += pending
+            pending = 0
+            batch = db.batch()
+
+    if pending > 0:
+        batch.commit()
+        week_count += pending
+
+    print(f"   - Deleted {week_count} old week documents (week start before {week_cutoff_str}).")
+
 def reset_daily_views():
     """
     notices 컬렉션의 views_today 필드를 0으로 초기화
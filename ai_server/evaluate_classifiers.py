@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+from gemini_classifier import (VALID_CATEGORIES, keyword_fallback, build_prompt, build_batch_prompt,
+                               match_category, parse_batch_categories, LOCAL_CONFIDENCE_THRESHOLD)
+from gemini_client import GeminiClient
+from local_classifier import NaiveBayesTitleClassifier, load_dataset, split_dataset, DATASET_PATH
+from rate_limiter import CircuitBreaker, RequestBudget
+from title_index import build_index
+
+# ==========================================
+# 분류기 평가 / 처리량 벤치마크
+# ==========================================
+# dataset.csv를 학습/평가로 나눈 뒤 평가 세트에서 모든 분류 방식을 비교함.
+#   keyword  : keyword_fallback (규칙)
+#   manual   : 족보 유사 검색 (학습 세트로 색인, 못 찾으면 판단 보류)
+#   local    : 로컬 n-gram 분류기 (학습 세트로 학습)
+#   gemini   : 제목 하나씩 generateContent
+#   batch    : 제목 BATCH개씩 한 요청 (JSON 배열 응답)
+#   cascade  : 실제 크롤러 순서 (족보 -> 로컬(확신 시) -> Gemini -> 키워드)
+# Gemini는 기본적으로 로컬 대체 서버(fake_gemini)를 씀 (--base-url로 실제 엔드포인트 지정 가능).
+#
+# 기준선은 evaluation_baseline.json (저장소에 커밋)이며, 매 실행을 이 기준선과 비교해
+# 정확도 하락/지연 증가를 경고함. 기준선 갱신은 --update-baseline으로 명시적으로만 함.
+# 실행 결과(evaluation_results.json)와 기록(evaluation_history.jsonl)은 로컬 작업용 (gitignore).
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BASE_DIR, 'evaluation_results.json')
+HISTORY_PATH = os.path.join(BASE_DIR, 'evaluation_history.jsonl')
+BASELINE_PATH = os.path.join(BASE_DIR, 'evaluation_baseline.json')
+SUMMARY_KEYS = ('accuracy', 'coverage', 'titles_per_sec', 'p95_ms')
+
+BATCH = 20
+ACCURACY_TOLERANCE = 0.01   # 이보다 많이 떨어지면 회귀로 표시
+LATENCY_TOLERANCE = 0.2     # p95 지연이 20% 넘게 늘면 회귀로 표시
+ALL_BACKENDS = ['keyword', 'manual', 'local', 'gemini', 'batch', 'cascade']
+
+
+# ==========================================
+# 지표 계산
+# ==========================================
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def score(labels, predictions, latencies, elapsed):
+    """
+    labels/predictions: 같은 길이의 카테고리 목록 (예측 None = 판단 보류)
+    latencies: 제목별 처리 시간(초), elapsed: 전체 소요 시간(초)
+    """
+    categories = sorted(set(VALID_CATEGORIES) | set(labels))
+    confusion = {actual: {predicted: 0 for predicted in categories + ['보류']} for actual in categories}
+    for actual, predicted in zip(labels, predictions):
+        confusion[actual][predicted if predicted is not None else '보류'] += 1
+
+    per_category = {}
+    for category in categories:
+        tp = confusion[category][category]
+        predicted_count = sum(confusion[a][category] for a in categories)
+        actual_count = sum(confusion[category].values())
+        precision = tp / predicted_count if predicted_count else 0.0
+        recall = tp / actual_count if actual_count else 0.0
+        per_category[category] = {
+            'precision': round(precision, 3),
+            'recall': round(recall, 3),
+            'f1': round(2 * precision * recall / (precision + recall), 3) if precision + recall else 0.0,
+            'support': actual_count,
+        }
+
+    answered = [p for p in predictions if p is not None]
+    correct = sum(1 for a, p in zip(labels, predictions) if a == p)
+    return {
+        'samples': len(labels),
+        'accuracy': round(correct / len(labels), 4) if labels else 0.0,
+        'coverage': round(len(answered) / len(labels), 4) if labels else 0.0,
+        'titles_per_sec': round(len(labels) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p95_ms': round(_percentile(latencies, 0.95) * 1000, 3),
+        'per_category': per_category,
+        'confusion': confusion,
+    }
+
+
+# ==========================================
+# 분류 방식별 실행
+# ==========================================
+def _run_each(titles, classify):
+    predictions, latencies = [], []
+    started = time.perf_counter()
+    for title in titles:
+        t0 = time.perf_counter()
+        predictions.append(classify(title))
+        latencies.append(time.perf_counter() - t0)
+    return predictions, latencies, time.perf_counter() - started
+
+
+def _run_batches(titles, client):
+    predictions, latencies = [], []
+    started = time.perf_counter()
+    for start in range(0, len(titles), BATCH):
+        chunk = titles[start:start + BATCH]
+        t0 = time.perf_counter()
+        text = client.generate(build_batch_prompt(chunk), json_output=True)
+        predictions.extend(parse_batch_categories(text, len(chunk)))
+        # 배치 안의 제목들은 같은 응답을 기다리므로 요청 시간 전체가 각 제목의 지연 시간
+        latencies.extend([time.perf_counter() - t0] * len(chunk))
+    return predictions, latencies, time.perf_counter() - started
+
+
+def evaluate_backends(train_set, test_set, client, backends=ALL_BACKENDS):
+    titles = [t for t, _ in test_set]
+    labels = [c for _, c in test_set]
+    index = build_index(train_set)
+    local_model = NaiveBayesTitleClassifier.train(train_set) if train_set else None
+
+    def manual(title):
+        return index.lookup(title)[0]
+
+    def local(title):
+        return local_model.predict(title)[0]
+
+    def gemini(title):
+        return match_category(client.generate(build_prompt(title)))
+
+    def cascade(title):
+        label = index.lookup(title)[0]
+        if label:
+            return label
+        category, confidence = local_model.predict(title)
+        if confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+            return category
+        return gemini(title) or keyword_fallback(title)
+
+    runners = {
+        'keyword': lambda: _run_each(titles, keyword_fallback),
+        'manual': lambda: _run_each(titles, manual),
+        'local': lambda: _run_each(titles, local),
+        'gemini': lambda: _run_each(titles, gemini),
+        'batch': lambda: _run_batches(titles, client),
+        'cascade': lambda: _run_each(titles, cascade),
+    }
+    results = {}
+    for name in backends:
+        predictions, latencies, elapsed = runners[name]()
+        results[name] = score(labels, predictions, latencies, elapsed)
+        r = results[name]
+        print(f"   - {name:<8} 정확도 {r['accuracy']:.3f} | 커버리지 {r['coverage']:.3f} | "
+              f"{r['titles_per_sec']}건/s | p95 {r['p95_ms']}ms")
+    return results
+
+
+# ==========================================
+# 저장 / 직전 결과와 비교
+# ==========================================
+def compare(previous, current):
+    """직전 결과 대비 회귀 목록 (문자열)"""
+    regressions = []
+    for name, now in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        if now['accuracy'] < before['accuracy'] - ACCURACY_TOLERANCE:
+            regressions.append(f"{name}: 정확도 {before['accuracy']:.3f} -> {now['accuracy']:.3f}")
+        if before['p95_ms'] > 0 and now['p95_ms'] > before['p95_ms'] * (1 + LATENCY_TOLERANCE):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+    return regressions
+
+
+def save_results(results, meta, path=RESULTS_PATH, history_path=HISTORY_PATH):
+    record = {'run_at': datetime.now().isoformat(timespec='seconds'), **meta, 'results': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    with open(history_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({**record, 'results': summarize(results)}, ensure_ascii=False) + "\n")
+
+
+def summarize(results):
+    return {name: {k: r[k] for k in SUMMARY_KEYS} for name, r in results.items()}
+
+
+def save_baseline(results, meta, path=BASELINE_PATH):
+    """커밋용 기준선: 요약 지표만 저장 (혼동 행렬/실행 시각 제외 -> diff가 지표 변화만 보임)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**meta, 'results': summarize(results)}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_previous(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def format_confusion(confusion):
+    columns = list(next(iter(confusion.values())))
+    lines = ["      실제\\예측 " + " ".join(f"{c:>5}" for c in columns)]
+    for actual, row in confusion.items():
+        lines.append(f"      {actual:<8} " + " ".join(f"{row[c]:>5}" for c in columns))
+    return "\n".join(lines)
+
+
+def noisy_answer(labels, accuracy, seed=0):
+    """대체 서버 응답: 정답을 accuracy 확률로, 아니면 다른 카테고리 (실제 모델 오분류 흉내)"""
+    rng = random.Random(seed)
+
+    def answer(title):
+        label = labels.get(title, keyword_fallback(title))
+        if rng.random() < accuracy:
+            return label
+        return rng.choice([c for c in VALID_CATEGORIES if c != label])
+    return answer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분류기 정확도/처리량 평가")
+    parser.add_argument('--data', default=DATASET_PATH)
+    parser.add_argument('--backends', default=",".join(ALL_BACKENDS))
+    parser.add_argument('--test-ratio', type=float, default=0.2)
+    parser.add_argument('--base-url', help="지정하지 않으면 로컬 대체 서버 사용")
+    parser.add_argument('--stub-latency', type=float, default=0.05, help="대체 서버 응답 지연(초)")
+    parser.add_argument('--stub-accuracy', type=float, default=0.9, help="대체 서버 정답 비율")
+    parser.add_argument('--limit', type=int, help="평가 세트 최대 개수")
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="비교 기준선 (저장소에 커밋된 파일)")
+    parser.add_argument('--update-baseline', action='store_true', help="이번 결과로 기준선 갱신")
+    parser.add_argument('--confusion', action='store_true', help="혼동 행렬 출력")
+    args = parser.parse_args()
+
+    samples = load_dataset(args.data)
+    train_set, test_set = split_dataset(samples, args.test_ratio)
+    if args.limit:
+        test_set = test_set[:args.limit]
+    backends = [b.strip() for b in args.backends.split(',') if b.strip()]
+    print(f"📂 데이터 {len(samples)}개 (학습 {len(train_set)} / 평가 {len(test_set)})")
+
+    server = None
+    base_url = args.base_url
+    if not base_url and any(b in backends for b in ('gemini', 'batch', 'cascade')):
+        from fake_gemini import FakeGeminiServer
+        server = FakeGeminiServer({'gemini-2.0-flash': {'latency': args.stub_latency}},
+                                  answer=noisy_answer(dict(samples), args.stub_accuracy)).start()
+        base_url = server.base_url
+        print(f"🧪 로컬 대체 서버: {base_url} (지연 {args.stub_latency}s, 정답률 {args.stub_accuracy})")
+
+    client = GeminiClient(api_key='' if server else None, base_url=base_url,
+                          budget=RequestBudget(rpm=100000 if server else 15),
+                          breaker=CircuitBreaker(failure_threshold=3, cooldown=300))
+    previous = load_previous(args.baseline)
+    try:
+        print("📊 평가 결과")
+        results = evaluate_backends(train_set, test_set, client, backends)
+    finally:
+        client.close()
+        if server:
+            server.stop()
+
+    if args.confusion:
+        for name, r in results.items():
+            print(f"\n   [{name}] 카테고리별 정밀도/재현율: "
+                  + ", ".join(f"{c} {m['precision']}/{m['recall']}" for c, m in r['per_category'].items()))
+            print(format_confusion(r['confusion']))
+
+    regressions = compare(previous, results)
+    if regressions:
+        print("\n⚠️ 기준선 대비 회귀:")
+        for line in regressions:
+            print(f"   - {line}")
+    elif previous:
+        print("\n✅ 기준선 대비 회귀 없음")
+    else:
+        print(f"\nℹ️ 기준선 없음: {args.baseline} (--update-baseline으로 생성)")
+
+    meta = {'data': os.path.basename(args.data), 'test_samples': len(test_set), 'stub': server is not None}
+    save_results(results, meta, args.output,
+                 os.path.join(os.path.dirname(os.path.abspath(args.output)), os.path.basename(HISTORY_PATH)))
+    print(f"💾 결과 저장: {args.output}")
+    if args.update_baseline:
+        save_baseline(results, meta, args.baseline)
+        print(f"📌 기준선 갱신: {args.baseline}")
@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from firebase_admin import exceptions, messaging
+
+# ==========================================
+# 로컬 FCM 대체 (벤치마크/테스트용 messaging 모듈 대역)
+# ==========================================
+# firebase_admin.messaging 자리에 넣어 쓰는 객체. 메시지 클래스는 실제 것을 그대로 쓰고
+# 발송 함수만 흉내냄 (send_each_for_multicast / send / subscribe_to_topic / unsubscribe_from_topic).
+# - latency: 요청 한 번당 지연(초)
+# - dead_rate: 토큰별 UnregisteredError 비율 (같은 토큰은 항상 같은 결과)
+# - failure_rate: 토큰별 일시적 오류(UNAVAILABLE) 비율 (시도마다 새로 뽑음)
+
+
+class FakeMessaging:
+    Message = messaging.Message
+    MulticastMessage = messaging.MulticastMessage
+    Notification = messaging.Notification
+    UnregisteredError = messaging.UnregisteredError
+
+    def __init__(self, latency=0.0, failure_rate=0.0, dead_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.dead_rate = dead_rate
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'tokens': 0, 'delivered': 0, 'dead': 0, 'transient': 0,
+                      'topic_sends': 0, 'max_in_flight': 0}
+        self._in_flight = 0
+
+    def _is_dead(self, token):
+        return random.Random(f"{self.seed}:{token}").random() < self.dead_rate
+
+    def _request(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            self._in_flight += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def send_each_for_multicast(self, message, dry_run=False):
+        self._request()
+        responses = []
+        with self._lock:
+            for token in message.tokens:
+                self.stats['tokens'] += 1
+                if self._is_dead(token):
+                    self.stats['dead'] += 1
+                    error = messaging.UnregisteredError('Requested entity was not found.')
+                elif self._rng.random() < self.failure_rate:
+                    self.stats['transient'] += 1
+                    error = exceptions.UnavailableError('The service is currently unavailable.')
+                else:
+                    self.stats['delivered'] += 1
+                    error = None
+                responses.append(SimpleNamespace(success=error is None, exception=error,
+                                                 message_id=None if error else f"m{self.stats['tokens']}"))
+        return SimpleNamespace(responses=responses,
+                               success_count=sum(1 for r in responses if r.success),
+                               failure_count=sum(1 for r in responses if not r.success))
+
+    def send(self, message, dry_run=False):
+        self._request()
+        with self._lock:
+            self.stats['topic_sends'] += 1
+            return f"projects/fake/messages/{self.stats['requests']}"
+
+    def _topic_management(self, tokens, topic):
+        self._request()
+        return SimpleNamespace(success_count=len(tokens), failure_count=0, errors=[])
+
+    subscribe_to_topic = _topic_management
+    unsubscribe_from_topic = _topic_management
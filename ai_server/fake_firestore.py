@@ -0,0 +1,316 @@
+import copy
+import itertools
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from firebase_admin import firestore
+
+# ==========================================
+# 테스트/벤치마크용 인메모리 Firestore
+# ==========================================
+# 실제 Firestore 없이 크롤러/푸시 로직을 검증하기 위한 최소 구현.
+# collection/document/where/order_by/limit/stream, batch, transaction, on_snapshot과
+# SERVER_TIMESTAMP / DELETE_FIELD / Increment / ArrayUnion / ArrayRemove를 지원하고
+# 문서 읽기/쓰기 횟수를 센다 (reads, writes).
+# on_snapshot 콜백은 (실제와 달리) 쓰기를 한 스레드에서 바로 호출됨.
+
+_OPS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a is not None and a < b,
+    '<=': lambda a, b: a is not None and a <= b,
+    '>': lambda a, b: a is not None and a > b,
+    '>=': lambda a, b: a is not None and a >= b,
+    'in': lambda a, b: a in b,
+    'array_contains': lambda a, b: isinstance(a, list) and b in a,
+}
+
+_MISSING = object()
+
+
+def _get_path(data, path):
+    value = data
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _apply_value(current, value):
+    if value is firestore.SERVER_TIMESTAMP:
+        return datetime.now(timezone.utc)
+    if isinstance(value, firestore.Increment):
+        return (current if isinstance(current, (int, float)) else 0) + value.value
+    if isinstance(value, firestore.ArrayUnion):
+        result = list(current) if isinstance(current, list) else []
+        for v in value.values:
+            if v not in result:
+                result.append(v)
+        return result
+    if isinstance(value, firestore.ArrayRemove):
+        return [v for v in (current if isinstance(current, list) else []) if v not in value.values]
+    return copy.deepcopy(value)
+
+
+def _merge(target, updates, dotted=False):
+    for key, value in updates.items():
+        parts = key.split('.') if dotted else [key]
+        node = target
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        last = parts[-1]
+        if value is firestore.DELETE_FIELD:
+            node.pop(last, None)
+        elif isinstance(value, dict) and not dotted:
+            # 중첩 맵도 필드 단위로 반영 (안쪽의 DELETE_FIELD / SERVER_TIMESTAMP 처리)
+            if not isinstance(node.get(last), dict):
+                node[last] = {}
+            _merge(node[last], value)
+        else:
+            node[last] = _apply_value(node.get(last), value)
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field):
+        value = _get_path(self._data or {}, field)
+        return None if value is _MISSING else value
+
+
+class FakeDocumentReference:
+    def __init__(self, db, collection, doc_id):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    def collection(self, name):
+        return self._db.collection(f"{self.path}/{name}")
+
+    def get(self, transaction=None):
+        self._db.reads += 1
+        return FakeSnapshot(self, copy.deepcopy(self._db._docs(self._collection).get(self.id)))
+
+    def set(self, data, merge=False):
+        self._db.writes += 1
+        docs = self._db._docs(self._collection)
+        if merge and self.id in docs:
+            _merge(docs[self.id], data)
+        else:
+            docs[self.id] = {}
+            _merge(docs[self.id], data)
+        self._db._notify(self._collection)
+
+    def update(self, data):
+        docs = self._db._docs(self._collection)
+        if self.id not in docs:
+            raise KeyError(f"No document to update: {self.path}")
+        self._db.writes += 1
+        _merge(docs[self.id], data, dotted=True)
+        self._db._notify(self._collection)
+
+    def delete(self):
+        self._db.writes += 1
+        self._db._docs(self._collection).pop(self.id, None)
+        self._db._notify(self._collection)
+
+
+class FakeQuery:
+    def __init__(self, db, collection, filters=None, order=None, limit=None):
+        self._db = db
+        self._collection = collection
+        self._filters = filters or []
+        self._order = order or []
+        self._limit = limit
+
+    def where(self, field, op, value):
+        return FakeQuery(self._db, self._collection, self._filters + [(field, op, value)], self._order, self._limit)
+
+    def order_by(self, field, direction='ASCENDING'):
+        return FakeQuery(self._db, self._collection, self._filters, self._order + [(field, direction)], self._limit)
+
+    def limit(self, count):
+        return FakeQuery(self._db, self._collection, self._filters, self._order, count)
+
+    def _matches(self):
+        results = []
+        for doc_id, data in list(self._db._docs(self._collection).items()):
+            if all(_get_path(data, f) is not _MISSING and _OPS[op](_get_path(data, f), v)
+                   for f, op, v in self._filters):
+                results.append((doc_id, data))
+        for field, direction in reversed(self._order):
+            results.sort(key=lambda item: _get_path(item[1], field), reverse=(direction == 'DESCENDING'))
+        if self._limit is not None:
+            results = results[:self._limit]
+        return results
+
+    def stream(self, transaction=None):
+        results = self._matches()
+        self._db.reads += max(len(results), 1)
+        for doc_id, data in results:
+            ref = FakeDocumentReference(self._db, self._collection, doc_id)
+            yield FakeSnapshot(ref, copy.deepcopy(data))
+
+    def get(self, transaction=None):
+        return list(self.stream())
+
+    def on_snapshot(self, callback):
+        """callback(docs, changes, read_time) — 구독 직후 한 번, 이후 결과가 바뀔 때마다"""
+        watch = FakeWatch(self, callback)
+        self._db._listeners.append(watch)
+        watch.refresh()
+        return watch
+
+
+class FakeWatch:
+    """on_snapshot 구독 핸들. close()로 스트림 끊김을 흉내낼 수 있음"""
+
+    def __init__(self, query, callback):
+        self._query = query
+        self._callback = callback
+        self._last = {}
+        self._started = False
+        self.is_active = True
+
+    def refresh(self):
+        if not self.is_active:
+            return
+        current = {doc_id: copy.deepcopy(data) for doc_id, data in self._query._matches()}
+        changes = []
+        for doc_id, data in current.items():
+            if doc_id not in self._last:
+                changes.append(('ADDED', doc_id, data))
+            elif self._last[doc_id] != data:
+                changes.append(('MODIFIED', doc_id, data))
+        for doc_id, data in self._last.items():
+            if doc_id not in current:
+                changes.append(('REMOVED', doc_id, data))
+        first = not self._started
+        self._started = True
+        self._last = current
+        if not changes and not first:
+            return
+        db, name = self._query._db, self._query._collection
+        db.reads += len(changes) if changes else 1
+        snapshot = lambda doc_id, data: FakeSnapshot(FakeDocumentReference(db, name, doc_id), copy.deepcopy(data))
+        docs = [snapshot(doc_id, data) for doc_id, data in current.items()]
+        change_objs = [SimpleNamespace(type=SimpleNamespace(name=kind), document=snapshot(doc_id, data))
+                       for kind, doc_id, data in changes]
+        self._callback(docs, change_objs, datetime.now(timezone.utc))
+
+    def close(self):
+        self.is_active = False
+
+    def unsubscribe(self):
+        self.is_active = False
+        if self in self._query._db._listeners:
+            self._query._db._listeners.remove(self)
+
+
+class FakeCollection(FakeQuery):
+    _ids = itertools.count(1)
+
+    def __init__(self, db, name):
+        super().__init__(db, name)
+        self.id = name
+
+    def document(self, doc_id=None):
+        return FakeDocumentReference(self._db, self._collection, doc_id or f"auto{next(self._ids)}")
+
+
+class FakeWriteBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append(lambda: ref.set(data, merge=merge))
+
+    def update(self, ref, data):
+        self._ops.append(lambda: ref.update(data))
+
+    def delete(self, ref):
+        self._ops.append(ref.delete)
+
+    def commit(self):
+        self._db.commits += 1
+        for op in self._ops:
+            op()
+        self._ops = []
+
+
+class FakeTransaction(FakeWriteBatch):
+    """
+    firestore.transactional 데코레이터와 함께 쓸 수 있는 트랜잭션.
+    시작부터 commit/rollback까지 DB 전체 잠금을 잡아서 트랜잭션끼리는 직렬로 실행됨 (충돌/재시도 없음)
+    """
+    _read_only = False
+    _max_attempts = 1
+    _id = b'fake-transaction'
+    _held = False
+
+    def _clean_up(self):
+        self._ops = []
+
+    def _begin(self, retry_id=None):
+        self._db._txn_lock.acquire()
+        self._held = True
+
+    def _release(self):
+        if self._held:
+            self._held = False
+            self._db._txn_lock.release()
+
+    def _commit(self):
+        try:
+            self.commit()
+        finally:
+            self._release()
+        return []
+
+    def _rollback(self):
+        self._ops = []
+        self._release()
+
+
+class FakeFirestore:
+    def __init__(self):
+        self._collections = {}
+        self._listeners = []
+        self._txn_lock = threading.RLock()
+        self.reads = 0
+        self.writes = 0
+        self.commits = 0
+
+    def _docs(self, name):
+        return self._collections.setdefault(name, {})
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def _notify(self, name):
+        for watch in list(self._listeners):
+            if watch._query._collection == name:
+                watch.refresh()
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    def dump(self, name):
+        """컬렉션 내용 (검증용, 읽기 횟수에 포함되지 않음)"""
+        return copy.deepcopy(self._docs(name))
@@ -0,0 +1,135 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ==========================================
+# 테스트/벤치마크용 Gemini 대체 서버 (로컬 HTTP)
+# ==========================================
+# 실제 API 키/쿼터 없이 GeminiClient, 모델 라우터, 분류기 평가를 돌리기 위한 최소 구현.
+# GET /v1beta/models, POST /v1beta/models/{model}:generateContent만 지원하고
+# 모델별로 응답 지연(초)과 429/403/500 비율을 지정할 수 있음.
+# 응답 내용은 answer(title) 함수로 정함 (기본: gemini_classifier.keyword_fallback).
+#
+#   server = FakeGeminiServer({'gemini-2.0-flash': {'latency': 0.05, 'error_rate': 0.1}})
+#   server.start()   # server.base_url을 GeminiClient(base_url=...)에 전달
+#   ...
+#   server.stop()
+
+_SINGLE_TITLE = re.compile(r'제목: "(.*)"')
+_NUMBERED_TITLE = re.compile(r'^(\d+)\. (.*)$', re.MULTILINE)
+
+
+def _default_answer(title):
+    from gemini_classifier import keyword_fallback
+    return keyword_fallback(title)
+
+
+class FakeGeminiServer:
+    def __init__(self, models=None, answer=None, seed=0):
+        """
+        models: {모델명: {'latency': 초, 'error_rate': 0~1, 'error_status': 429}}
+        """
+        self.models = models or {'gemini-2.0-flash': {}}
+        self.answer = answer or _default_answer
+        self.requests = {}          # 모델명 -> 받은 generateContent 요청 수
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def set_model(self, name, **options):
+        """실행 중에 모델 동작 변경 (예: 갑자기 429 반환)"""
+        with self._lock:
+            self.models.setdefault(name, {}).update(options)
+
+    # ---------- 응답 생성 ----------
+    def _respond(self, prompt, json_output):
+        numbered = _NUMBERED_TITLE.findall(prompt)
+        if json_output and numbered:
+            return json.dumps([self.answer(title) for _, title in numbered], ensure_ascii=False)
+        match = _SINGLE_TITLE.search(prompt)
+        return self.answer(match.group(1) if match else prompt)
+
+    def _handle_generate(self, model, body):
+        with self._lock:
+            options = dict(self.models.get(model, {}))
+            known = model in self.models
+            self.requests[model] = self.requests.get(model, 0) + 1
+            failed = self._random.random() < options.get('error_rate', 0.0)
+        if not known:
+            return 404, {'error': {'code': 404, 'message': f'model {model} not found'}}
+        time.sleep(options.get('latency', 0.0))
+        if failed:
+            status = options.get('error_status', 429)
+            return status, {'error': {'code': status, 'message': 'simulated failure'}}
+
+        prompt = body['contents'][0]['parts'][0]['text']
+        json_output = body.get('generationConfig', {}).get('responseMimeType') == 'application/json'
+        text = self._respond(prompt, json_output)
+        return 200, {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+
+    def _handle_list(self):
+        with self._lock:
+            names = list(self.models)
+        return 200, {'models': [{'name': f'models/{name}', 'supportedGenerationMethods': ['generateContent']}
+                                for name in names]}
+
+    # ---------- 서버 ----------
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True  # 헤더/본문이 따로 나가도 지연(약 40ms)이 생기지 않게
+
+            def _send(self, status, payload):
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.split('?')[0] == '/v1beta/models':
+                    self._send(*fake._handle_list())
+                else:
+                    self._send(404, {'error': {'code': 404}})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                match = re.match(r'^/v1beta/models/([^/:]+):generateContent', self.path)
+                if match:
+                    self._send(*fake._handle_generate(match.group(1), body))
+                else:
+                    self._send(404, {'error': {'code': 404}})
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
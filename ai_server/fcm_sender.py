@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from firebase_admin import exceptions
+
+# ==========================================
+# FCM 병렬 멀티캐스트 발송
+# ==========================================
+# 토큰을 500개씩 나눠 send_each_for_multicast(send_multicast는 deprecated)로
+# 스레드 풀에서 동시에 보냄. 사용자가 늘어도 청크들이 병렬로 나가므로 발송 시간은 거의 일정함.
+# - 동시 요청 수는 FCM_MAX_CONCURRENCY로 제한
+# - 일시적 오류(UNAVAILABLE/INTERNAL 등)로 실패한 토큰만 모아 지수 백오프 후 재시도
+# - 청크별 지연/성공 수를 보고하고, 최종 실패 토큰은 (token, exception)으로 돌려줌
+#   * failures: FCM이 토큰별로 돌려준 오류 (토큰 정리 대상)
+#   * request_failures: 요청 자체가 실패해 청크 전체가 같은 오류를 받은 경우 (토큰 탓이 아니므로 정리 대상 아님)
+
+FCM_BATCH = 500            # send_each_for_multicast 한 번에 최대 토큰 수
+FCM_MAX_CONCURRENCY = int(os.environ.get('FCM_MAX_CONCURRENCY', '4'))
+MAX_RETRIES = 2
+RETRY_DELAY = 1.0          # 1초, 2초 ...
+
+TRANSIENT_CODES = {
+    exceptions.UNAVAILABLE,
+    exceptions.INTERNAL,
+    exceptions.DEADLINE_EXCEEDED,
+    exceptions.RESOURCE_EXHAUSTED,
+    exceptions.UNKNOWN,
+}
+
+
+# firebase_admin 7.x는 MulticastMessage.tokens를 deprecated로 표시하고 fids(Firebase 설치 ID)를 권장하지만,
+# 앱이 저장하는 fcm_token은 FCM 등록 토큰이라 fids로 바꿀 수 없음 -> 메시지를 만드는 곳에서만 경고를 끔.
+# catch_warnings는 전역 필터를 바꾸므로 청크 스레드끼리 겹치지 않게 잠금 안에서 만듦.
+_TOKENS_DEPRECATION = r"MulticastMessage\.tokens is deprecated"
+_warnings_lock = threading.Lock()
+
+
+def build_multicast(messaging, tokens, **message_kwargs):
+    """등록 토큰 대상 MulticastMessage (tokens deprecated 경고 없이)"""
+    with _warnings_lock, warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message=_TOKENS_DEPRECATION, category=DeprecationWarning)
+        return messaging.MulticastMessage(tokens=tokens, **message_kwargs)
+
+
+def is_transient(error):
+    """재시도하면 성공할 수 있는 실패인지 (Firebase 오류가 아니면 네트워크 문제로 보고 재시도)"""
+    if isinstance(error, exceptions.FirebaseError):
+        return error.code in TRANSIENT_CODES
+    return True
+
+
+def _send_chunk(messaging, index, tokens, message_kwargs, max_retries, retry_delay, sleep):
+    pending = list(tokens)
+    result = {'chunk': index, 'size': len(tokens), 'success': 0, 'failure': 0, 'attempts': 0,
+              'retried': 0, 'latency_ms': 0.0, 'failures': [], 'request_failures': []}
+    started = time.perf_counter()
+
+    while pending:
+        result['attempts'] += 1
+        can_retry = result['attempts'] <= max_retries
+        failed = result['failures']
+        try:
+            response = messaging.send_each_for_multicast(build_multicast(messaging, pending, **message_kwargs))
+            outcomes = [(token, r.exception if not r.success else None)
+                        for token, r in zip(pending, response.responses)]
+        except Exception as e:
+            # 요청 자체가 실패하면 청크의 남은 토큰 전체가 같은 오류 (토큰별 실패로 세지 않음)
+            outcomes = [(token, e) for token in pending]
+            failed = result['request_failures']
+
+        retry = []
+        for token, error in outcomes:
+            if error is None:
+                result['success'] += 1
+            elif can_retry and is_transient(error):
+                retry.append(token)
+            else:
+                failed.append((token, error))
+        if retry:
+            result['retried'] += len(retry)
+            sleep(retry_delay * (2 ** (result['attempts'] - 1)))
+        pending = retry
+
+    result['failure'] = len(result['failures']) + len(result['request_failures'])
+    result['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def send_multicast_parallel(messaging, tokens, max_concurrency=FCM_MAX_CONCURRENCY, batch_size=FCM_BATCH,
+                            max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY, sleep=time.sleep, **message_kwargs):
+    """
+    tokens를 batch_size개씩 나눠 병렬 발송.
+    message_kwargs: MulticastMessage에 그대로 넘길 인자 (notification, data, android ...)
+    반환: {'tokens', 'success', 'failure', 'retried', 'elapsed_ms', 'max_in_flight', 'chunks',
+           'failures', 'request_failures'}
+    """
+    chunks = [tokens[i:i + batch_size] for i in range(0, len(tokens), batch_size)]
+    report = {'tokens': len(tokens), 'success': 0, 'failure': 0, 'retried': 0, 'elapsed_ms': 0.0,
+              'max_in_flight': 0, 'chunks': [], 'failures': [], 'request_failures': []}
+    if not chunks:
+        return report
+
+    in_flight = 0
+    lock = threading.Lock()
+
+    def run(index, chunk):
+        nonlocal in_flight
+        with lock:
+            in_flight += 1
+            report['max_in_flight'] = max(report['max_in_flight'], in_flight)
+        try:
+            return _send_chunk(messaging, index, chunk, message_kwargs, max_retries, retry_delay, sleep)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as executor:
+        futures = [executor.submit(run, i, chunk) for i, chunk in enumerate(chunks)]
+        for future in as_completed(futures):
+            result = future.result()
+            report['failures'].extend(result.pop('failures'))
+            report['request_failures'].extend(result.pop('request_failures'))
+            report['chunks'].append(result)
+            for key in ('success', 'failure', 'retried'):
+                report[key] += result[key]
+            print(f"   📦 청크 {result['chunk'] + 1}/{len(chunks)}: 성공 {result['success']}/{result['size']}"
+                  f" (시도 {result['attempts']}회, {result['latency_ms']}ms)")
+
+    report['chunks'].sort(key=lambda c: c['chunk'])
+    report['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return report
@@ -1,17 +1,82 @@
-import requests
 import json
-import time
 import os
+import threading
+from classification_cache import ClassificationCache
+import local_classifier
+from gemini_client import GeminiClient
+from model_router import ModelRouter
+from rate_limiter import RequestBudget, CircuitBreaker
 
 # 1. API 키 설정
-# 보안을 위해 환경변수 사용 권장
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    # 로컬 테스트용 (필요시 주석 처리 후 입력, 절대 커밋 금지)
-    # GEMINI_API_KEY = "YOUR_API_KEY_HERE"
+# 보안을 위해 환경변수 사용 권장 (GeminiClient가 GEMINI_API_KEY를 읽음)
+if not os.environ.get("GEMINI_API_KEY"):
     print("⚠️ GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
 
+# 모델/프롬프트가 바뀌면 PROMPT_VERSION을 올려서 기존 캐시가 쓰이지 않게 함
+# 캐시 버전은 실제로 응답한 모델 기준 ("모델:프롬프트") — 라우터가 다른 모델을 쓰면 다른 키로 저장
+MODEL_NAME = "gemini-2.0-flash"
+PROMPT_VERSION = "v1"
+
+def cache_version(model):
+    return f"{model or MODEL_NAME}:{PROMPT_VERSION}"
+
+# 프로세스 전체가 공유하는 분당 요청 예산 / 서킷 브레이커 / 동시 요청 수 제한
+GEMINI_RPM = int(os.environ.get('GEMINI_RPM', '15'))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get('GEMINI_MAX_CONCURRENCY', '2'))
+BREAKER_COOLDOWN = int(os.environ.get('GEMINI_BREAKER_COOLDOWN', '300'))  # 초
+
+client = GeminiClient(
+    model=MODEL_NAME,
+    budget=RequestBudget(rpm=GEMINI_RPM),
+    breaker=CircuitBreaker(failure_threshold=3, cooldown=BREAKER_COOLDOWN),
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+)
+
+_stats_lock = threading.Lock()
+_stats = {'fallbacks': 0, 'local': 0}
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+def classifier_stats():
+    """API 호출 지표(호출/재시도/상태/지연/브레이커) + 키워드 대체/로컬 분류 카운터"""
+    stats = client.metrics()
+    with _stats_lock:
+        stats.update(_stats)
+    if _router:
+        stats['models'] = _router.stats()
+    return stats
+
+_cache = None
+
+def get_cache():
+    """분류 캐시 (처음 호출 시 생성). CLASSIFICATION_CACHE=off면 None"""
+    global _cache
+    if os.environ.get('CLASSIFICATION_CACHE', 'on') == 'off':
+        return None
+    if _cache is None:
+        try:
+            _cache = ClassificationCache()
+        except Exception as e:
+            print(f"⚠️ 분류 캐시 사용 불가: {e}")
+            os.environ['CLASSIFICATION_CACHE'] = 'off'
+            return None
+    return _cache
+
+# 로컬 분류기 확신도가 이 값 이상이면 Gemini를 호출하지 않음. LOCAL_CLASSIFIER=off로 끌 수 있음
+LOCAL_CONFIDENCE_THRESHOLD = float(os.environ.get('LOCAL_CONFIDENCE_THRESHOLD', '0.9'))
+
+def local_category(title):
+    """로컬 모델이 충분히 확신하는 경우에만 카테고리 반환 (모델이 없으면 None)"""
+    if os.environ.get('LOCAL_CLASSIFIER', 'on') == 'off':
+        return None
+    category, confidence = local_classifier.predict_local(title)
+    if category in VALID_CATEGORIES and confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+        _count('local')
+        return category
+    return None
+
 def keyword_fallback(title):
     """
     Gemini API 실패 시 사용할 키워드 기반 분류기
@@ -44,15 +109,9 @@ def keyword_fallback(title):
     # 6. 학사 (기본값)
     return "학사"
 
-def classify_notice_with_gemini(title):
-    # 2. 모델 설정 (Gemini 2.0 Flash)
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-    headers = { 'Content-Type': 'application/json' }
+VALID_CATEGORIES = ["장학", "취업", "학사", "외부행사", "학과행사", "공모전"]
 
-    prompt_text = f"""
-    당신은 대학교 학과 공지사항 분류 전문가입니다.
-    아래 제목을 보고 [장학, 취업, 학사, 외부행사, 학과행사, 공모전] 중 가장 적절한 하나를 선택해서 단어만 출력하세요.
-    
+CATEGORY_CRITERIA = """
     [분류 기준]
     - 학사: 수강신청, 졸업, 성적, 휴학/복학, 예비군, 강의평가, 학적, 전과
     - 장학: 장학금 신청, 선발, 지급 안내, 근로장학생
@@ -60,53 +119,176 @@ def classify_notice_with_gemini(title):
     - 외부행사: 외부 기관 주최 특강, 설명회, 교육, 서포터즈 모집, 설문조사, 대외활동
     - 학과행사: 학생회 주관, MT, 간식행사, 총회, 학과 전용 행사, 학위수여식
     - 공모전: 경진대회, 공모전, 해커톤, 아이디어 대회, 챌린지, 캡스톤 팀 모집
+"""
+
+# 배치 분류 시 한 요청에 넣는 최대 제목 수
+BATCH_SIZE = 20
 
+def match_category(text):
+    """모델 출력에서 유효한 카테고리 찾기 (없으면 None)"""
+    if not isinstance(text, str):
+        return None
+    for v in VALID_CATEGORIES:
+        if v in text:
+            return v
+    return None
+
+def build_prompt(title):
+    """제목 하나 분류용 프롬프트 (응답: 카테고리 단어)"""
+    return f"""
+    당신은 대학교 학과 공지사항 분류 전문가입니다.
+    아래 제목을 보고 [장학, 취업, 학사, 외부행사, 학과행사, 공모전] 중 가장 적절한 하나를 선택해서 단어만 출력하세요.
+    {CATEGORY_CRITERIA}
     제목: "{title}"
     """
-    data = { "contents": [{ "parts": [{"text": prompt_text}] }] }
 
-    max_retries = 3
-    retry_delay = 2  # 시작 대기 시간 (초)
+def build_batch_prompt(titles):
+    """여러 제목 분류용 프롬프트 (응답: 카테고리 JSON 배열)"""
+    numbered = "\n".join(f"{n + 1}. {t}" for n, t in enumerate(titles))
+    return f"""
+    당신은 대학교 학과 공지사항 분류 전문가입니다.
+    아래 {len(titles)}개 제목 각각을 [장학, 취업, 학사, 외부행사, 학과행사, 공모전] 중 가장 적절한 하나로 분류하세요.
+    {CATEGORY_CRITERIA}
+    결과는 제목 순서대로 카테고리 단어만 담은 JSON 배열로 출력하세요. 예: ["학사", "취업"]
 
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(url, headers=headers, data=json.dumps(data))
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and result['candidates']:
-                    category = result['candidates'][0]['content']['parts'][0]['text'].strip()
-                    valid_list = ["장학", "취업", "학사", "외부행사", "학과행사", "공모전"]
-                    for v in valid_list:
-                        if v in category:
-                            return v
-                    return keyword_fallback(title) 
+    제목 목록:
+{numbered}
+    """
+
+# GEMINI_MODELS="gemini-2.0-flash,gemini-1.5-flash"(또는 "auto": 목록 조회) 지정 시
+# 모델 라우터가 호출마다 빠르고 건강한 모델을 고름. 미지정 시 MODEL_NAME 하나만 사용
+_router = None
+_router_lock = threading.Lock()
+
+def get_router():
+    """모델 라우터 (처음 호출 시 생성 + 지연 시간 측정). GEMINI_MODELS 미지정/실패 시 None"""
+    global _router
+    spec = os.environ.get('GEMINI_MODELS', '').strip()
+    if not spec:
+        return None
+    with _router_lock:
+        if _router is None:
+            try:
+                if spec == 'auto':
+                    _router = ModelRouter.discover(client, cooldown=BREAKER_COOLDOWN)
                 else:
-                    return keyword_fallback(title)
-            
-            elif response.status_code == 429:
-                print(f"   ⚠️ Gemini 429 Too Many Requests. {retry_delay}초 후 재시도... ({attempt+1}/{max_retries})")
-                time.sleep(retry_delay)
-                retry_delay *= 2 # 지수 백오프 (2초 -> 4초 -> 8초)
-                continue
-
-            elif response.status_code == 403:
-                # 403 (Quota/Permission) -> 즉시 키워드 백업 사용 (무료 API 한계)
-                print(f"   ⚠️ Gemini 403 (Quota/Perm). 키워드 분류로 대체.")
-                return keyword_fallback(title)
-            
-            else:
-                print(f"⚠️ Gemini 에러: {response.status_code}")
-                return keyword_fallback(title)
+                    _router = ModelRouter(client, [m.strip() for m in spec.split(',') if m.strip()],
+                                          cooldown=BREAKER_COOLDOWN)
+                print(f"🧭 모델 라우터: {_router.probe()}")
+            except Exception as e:
+                print(f"⚠️ 모델 라우터 사용 불가: {e}")
+                os.environ['GEMINI_MODELS'] = ''
+                return None
+    return _router
 
-        except Exception as e:
-            print(f"⚠️ 요청 실패: {e}")
-            return keyword_fallback(title)
-    
-    # 재시도 횟수 초과 시
-    print("   ❌ 재시도 횟수 초과. 키워드 분류로 넘어갑니다.")
+def _generate(prompt_text, json_output=False):
+    """
+    Gemini generateContent 호출 (재시도/예산/브레이커는 GeminiClient가 처리)
+    (응답 텍스트, 응답한 모델) 반환, 실패 시 (None, None) (호출 측에서 키워드 분류로 대체)
+    """
+    router = get_router()
+    if router:
+        return router.generate_with_model(prompt_text, json_output=json_output)
+    text = client.generate(prompt_text, json_output=json_output)
+    return text, (client.model if text is not None else None)
+
+def _cache_lookup(cache, title):
+    """라우터 후보(또는 기본 모델) 중 어느 모델의 결과든 캐시에 있으면 반환"""
+    router = _router if os.environ.get('GEMINI_MODELS', '').strip() else None
+    models = router.models if router else [MODEL_NAME]
+    return cache.get_any(title, [cache_version(m) for m in models])
+
+def classify_notice_with_gemini(title):
+    # 0. 캐시 확인 (같은 제목 + 같은 모델/프롬프트면 API 호출 없이 반환)
+    cache = get_cache()
+    if cache:
+        cached = _cache_lookup(cache, title)
+        if cached:
+            return cached
+
+    # 1. 로컬 분류기가 확신하면 바로 반환 (확신도가 낮은 제목만 Gemini로)
+    local = local_category(title)
+    if local:
+        return local
+
+    text, model = _generate(build_prompt(title))
+    category = match_category(text)
+    if category:
+        # Gemini가 준 결과만 캐시 (키워드 대체 결과는 저장하지 않음)
+        if cache:
+            cache.put(title, cache_version(model), category)
+        return category
+    _count('fallbacks')
     return keyword_fallback(title)
 
+def parse_batch_categories(text, count):
+    """
+    배치 응답(JSON 배열) -> 길이 count의 카테고리 목록
+    파싱 실패/개수 불일치/유효하지 않은 항목은 None (해당 제목만 키워드 분류로 대체)
+    """
+    if not text:
+        return [None] * count
+    text = text.strip()
+    if text.startswith("```"):
+        # ```json ... ``` 코드 블록으로 감싸서 주는 경우
+        text = text.strip('`')
+        if text.startswith('json'):
+            text = text[4:]
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        print("   ⚠️ 배치 응답 JSON 파싱 실패. 키워드 분류로 대체.")
+        return [None] * count
+    if isinstance(parsed, dict):
+        parsed = parsed.get('categories', [])
+    if not isinstance(parsed, list):
+        return [None] * count
+
+    categories = []
+    for i in range(count):
+        item = parsed[i] if i < len(parsed) else None
+        if isinstance(item, dict):
+            item = item.get('category')
+        categories.append(match_category(item))
+    return categories
+
+def classify_notices_with_gemini(titles, batch_size=BATCH_SIZE):
+    """
+    여러 제목을 한 요청(최대 batch_size개)으로 분류
+    캐시에 있거나 로컬 분류기가 확신하는 제목, 중복 제목은 요청에서 빼고,
+    항목별로 실패하면 keyword_fallback 사용
+    """
+    results = [None] * len(titles)
+    cache = get_cache()
+
+    pending = {}  # title -> 결과를 채울 인덱스 목록
+    for i, title in enumerate(titles):
+        cached = _cache_lookup(cache, title) if cache else None
+        if not cached and title not in pending:
+            cached = local_category(title)
+        if cached:
+            results[i] = cached
+        else:
+            pending.setdefault(title, []).append(i)
+
+    unique_titles = list(pending)
+    for start in range(0, len(unique_titles), batch_size):
+        chunk = unique_titles[start:start + batch_size]
+        text, model = _generate(build_batch_prompt(chunk), json_output=True)
+        categories = parse_batch_categories(text, len(chunk))
+
+        for title, category in zip(chunk, categories):
+            if category:
+                if cache:
+                    cache.put(title, cache_version(model), category)
+            else:
+                _count('fallbacks')
+                category = keyword_fallback(title)
+            for i in pending[title]:
+                results[i] = category
+
+    return results
+
 # 테스트
 if __name__ == "__main__":
     print(classify_notice_with_gemini("2025학년도 1학기 수강신청 안내"))
\ No newline at end of file
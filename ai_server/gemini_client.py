@@ -0,0 +1,202 @@
+import collections
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import RequestBudget, CircuitBreaker
+
+# ==========================================
+# Gemini API 클라이언트 (연결 재사용 + 타임아웃 + 공통 재시도 + 지표)
+# ==========================================
+# 호출마다 requests.post로 새 TLS 연결을 열고 타임아웃 없이 기다리던 것을
+# keep-alive Session 하나로 모음. 분당 예산/서킷 브레이커/동시 요청 수 제한도
+# 클라이언트가 갖고 있어서 분류기와 check_models.py가 같은 정책을 씀.
+#
+# GEMINI_API_KEY: API 키 (환경변수로만 받음)
+# GEMINI_BASE_URL: 테스트/벤치마크용 대체 엔드포인트 (기본: 실제 Gemini API)
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+CONNECT_TIMEOUT = float(os.environ.get('GEMINI_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.environ.get('GEMINI_READ_TIMEOUT', '30'))
+
+MAX_RETRIES = 3
+RETRY_DELAY = 2                                # 첫 재시도 대기(초), 이후 2배씩
+SERVER_ERRORS = {500, 502, 503, 504}           # 일시 장애: 재시도하지만 브레이커에는 반영 안 함
+LATENCY_WINDOW = 1000                          # p95 계산에 쓰는 최근 호출 수
+
+
+class GeminiClient:
+    def __init__(self, api_key=None, base_url=None, model=DEFAULT_MODEL,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY,
+                 budget=None, breaker=None, max_concurrency=2):
+        self.api_key = api_key if api_key is not None else os.environ.get('GEMINI_API_KEY')
+        self.base_url = (base_url or os.environ.get('GEMINI_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.budget = budget or RequestBudget(rpm=15)
+        self.breaker = breaker or CircuitBreaker(failure_threshold=3, cooldown=300)
+        self._concurrency = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+        self._lock = threading.Lock()
+        self._counters = {'calls': 0, 'retries': 0, 'breaker_rejects': 0}
+        self._statuses = collections.Counter()
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    # ---------- 지표 ----------
+    def _record(self, status, latency):
+        with self._lock:
+            self._counters['calls'] += 1
+            self._statuses[str(status)] += 1
+            self._latencies.append(latency)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def metrics(self):
+        """호출 수/재시도/상태 코드별 횟수/지연 시간(ms)/브레이커 상태"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['statuses'] = dict(self._statuses)
+            latencies = sorted(self._latencies)
+        if latencies:
+            stats['avg_latency_ms'] = round(sum(latencies) / len(latencies) * 1000, 1)
+            stats['p95_latency_ms'] = round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 1)
+        stats['breaker_trips'] = self.breaker.trips
+        stats['breaker_state'] = self.breaker.state
+        return stats
+
+    # ---------- 요청 ----------
+    def _request(self, method, path, **kwargs):
+        """한 번의 HTTP 요청 (지연 시간/상태 기록). 네트워크 예외는 그대로 올림"""
+        headers = {'x-goog-api-key': self.api_key} if self.api_key else {}
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, f"{self.base_url}/{path}", headers=headers,
+                                            timeout=self.timeout, **kwargs)
+        except requests.Timeout:
+            self._record('timeout', time.monotonic() - started)
+            raise
+        except requests.RequestException:
+            self._record('error', time.monotonic() - started)
+            raise
+        self._record(response.status_code, time.monotonic() - started)
+        return response
+
+    def generate(self, prompt_text, model=None, json_output=False, breaker=None):
+        """
+        generateContent 호출. 성공 시 응답 텍스트, 실패 시 None
+        429/5xx/타임아웃은 지수 백오프로 재시도, 403은 브레이커를 바로 엶
+        breaker: 모델별 브레이커 (모델 라우터). 지정해도 클라이언트 공용 브레이커는 항상 같이 적용됨
+                 -> 키 전체에 걸리는 403(쿼터/권한)과 반복되는 429는 공용 브레이커를 열어 모든 모델 호출을 멈춤
+        """
+        model_breaker = breaker if breaker is not None and breaker is not self.breaker else None
+        if model_breaker and not model_breaker.available():
+            self._count('breaker_rejects')
+            return None
+        if not self.breaker.allow():
+            self._count('breaker_rejects')
+            return None
+        if model_breaker and not model_breaker.allow():
+            self._count('breaker_rejects')
+            self.breaker.release()  # 요청을 보내지 않았으므로 공용 브레이커의 시험 기회를 돌려줌
+            return None
+        breakers = [b for b in (model_breaker, self.breaker) if b]
+
+        data = {"contents": [{"parts": [{"text": prompt_text}]}]}
+        if json_output:
+            data["generationConfig"] = {"responseMimeType": "application/json"}
+
+        with self._concurrency:
+            text = self._generate_with_retry(model or self.model, data, breakers)
+        for b in breakers:
+            if text is None and b.state == CircuitBreaker.HALF_OPEN:
+                # 시험 요청이 (5xx/타임아웃 등으로) 실패하면 다시 open
+                b.record_failure()
+        return text
+
+    def _generate_with_retry(self, model, data, breakers):
+        """breakers: [모델별 브레이커(있으면), 공용 브레이커]"""
+        delay = self.retry_delay
+        for attempt in range(self.max_retries):
+            if attempt:
+                self._count('retries')
+                time.sleep(delay)
+                delay *= 2  # 지수 백오프 (2초 -> 4초 -> 8초)
+
+            self.budget.acquire()
+            try:
+                response = self._request('POST', f"models/{model}:generateContent", json=data)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                print(f"   ⚠️ Gemini 연결 실패 ({type(e).__name__}). 재시도... ({attempt+1}/{self.max_retries})")
+                continue
+            except Exception as e:
+                print(f"⚠️ 요청 실패: {e}")
+                return None
+
+            if response.status_code == 200:
+                for b in breakers:
+                    b.record_success()
+                result = response.json()
+                if 'candidates' in result and result['candidates']:
+                    return result['candidates'][0]['content']['parts'][0]['text'].strip()
+                return None
+
+            elif response.status_code == 429:
+                for b in breakers:
+                    b.record_failure()
+                if any(b.state == CircuitBreaker.OPEN for b in breakers):
+                    scope = "공용" if self.breaker.state == CircuitBreaker.OPEN else model
+                    print(f"   ⚠️ Gemini 429 반복 -> 서킷 브레이커 열림 ({scope}, {self.breaker.cooldown}초)")
+                    return None
+                print(f"   ⚠️ Gemini 429 Too Many Requests. 재시도... ({attempt+1}/{self.max_retries})")
+                continue
+
+            elif response.status_code == 403:
+                # 403 (Quota/Permission)은 API 키 전체에 해당 -> 모델과 상관없이 공용 브레이커를 바로 엶
+                for b in breakers:
+                    b.record_failure(trip=True)
+                print(f"   ⚠️ Gemini 403 (Quota/Perm). {self.breaker.cooldown}초간 키워드 분류로 대체.")
+                return None
+
+            elif response.status_code in SERVER_ERRORS:
+                print(f"   ⚠️ Gemini {response.status_code}. 재시도... ({attempt+1}/{self.max_retries})")
+                continue
+
+            else:
+                print(f"⚠️ Gemini 에러: {response.status_code}")
+                return None
+
+        print("   ❌ 재시도 횟수 초과. 키워드 분류로 넘어갑니다.")
+        return None
+
+    def list_models(self, method='generateContent'):
+        """method를 지원하는 모델 목록 (models/... 형식의 dict 목록). 실패 시 예외"""
+        models = []
+        params = {'pageSize': 1000}
+        while True:
+            response = self._request('GET', 'models', params=params)
+            response.raise_for_status()
+            body = response.json()
+            models.extend(m for m in body.get('models', [])
+                          if method in m.get('supportedGenerationMethods', []))
+            if not body.get('nextPageToken'):
+                return models
+            params['pageToken'] = body['nextPageToken']
+
+    def close(self):
+        self.session.close()
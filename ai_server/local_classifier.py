@@ -0,0 +1,209 @@
+import argparse
+import csv
+import gzip
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+
+# ==========================================
+# 로컬 제목 분류기 (문자 n-gram 나이브 베이즈)
+# ==========================================
+# dataset.csv(get_data.py로 수집한 제목/카테고리)로 학습한 오프라인 분류기.
+# 외부 라이브러리 없이 dict만 사용하며, 모델은 gzip JSON 한 파일로 저장됨.
+# 확신도가 높은 제목은 Gemini를 부르지 않고 여기서 바로 분류함.
+#
+#   python local_classifier.py train      # 학습 + 홀드아웃 정확도 출력 + 모델 저장
+#   python local_classifier.py evaluate   # 저장된 모델을 dataset.csv 전체로 평가
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, 'dataset.csv')
+MODEL_PATH = os.environ.get('LOCAL_MODEL_PATH', os.path.join(BASE_DIR, 'local_model.json.gz'))
+
+NGRAM_RANGE = (1, 3)
+MIN_COUNT = 2       # 전체에서 이보다 적게 나온 n-gram은 버림 (모델 크기 축소)
+ALPHA = 0.5         # 라플라스 스무딩
+
+
+def title_ngrams(title):
+    text = unicodedata.normalize('NFKC', title).lower()
+    text = re.sub(r'\s+', '', text)
+    grams = []
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def load_dataset(path=DATASET_PATH):
+    """dataset.csv -> [(title, category)]"""
+    rows = []
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if len(row) >= 2 and row[0].strip() and row[1].strip():
+                rows.append((row[0].strip(), row[1].strip()))
+    return rows
+
+
+class NaiveBayesTitleClassifier:
+    def __init__(self, classes, log_priors, log_probs):
+        self.classes = classes
+        self.log_priors = log_priors    # [class]
+        self.log_probs = log_probs      # {ngram: [class]}
+
+    @classmethod
+    def train(cls, samples, min_count=MIN_COUNT, alpha=ALPHA):
+        classes = sorted({category for _, category in samples})
+        index = {c: i for i, c in enumerate(classes)}
+
+        doc_counts = [0] * len(classes)
+        counts = {}
+        for title, category in samples:
+            k = index[category]
+            doc_counts[k] += 1
+            for gram in title_ngrams(title):
+                counts.setdefault(gram, [0] * len(classes))[k] += 1
+
+        counts = {g: c for g, c in counts.items() if sum(c) >= min_count}
+        vocab = len(counts) + 1
+        totals = [sum(c[k] for c in counts.values()) for k in range(len(classes))]
+
+        log_priors = [math.log(doc_counts[k] / len(samples)) for k in range(len(classes))]
+        denominators = [math.log(totals[k] + alpha * vocab) for k in range(len(classes))]
+        log_probs = {
+            g: [round(math.log(c[k] + alpha) - denominators[k], 4) for k in range(len(classes))]
+            for g, c in counts.items()
+        }
+        return cls(classes, log_priors, log_probs)
+
+    def predict(self, title):
+        """(카테고리, 확신도 0~1)"""
+        scores = list(self.log_priors)
+        for gram in title_ngrams(title):
+            row = self.log_probs.get(gram)
+            if row is None:
+                continue  # 학습에 없던 n-gram은 무시
+            for k in range(len(scores)):
+                scores[k] += row[k]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        # softmax로 사후 확률 계산
+        top = scores[best]
+        total = sum(math.exp(s - top) for s in scores)
+        return self.classes[best], 1.0 / total
+
+    def save(self, path=MODEL_PATH):
+        payload = {
+            'classes': self.classes,
+            'log_priors': self.log_priors,
+            'log_probs': self.log_probs,
+            'ngram_range': list(NGRAM_RANGE),
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        return cls(payload['classes'], payload['log_priors'], payload['log_probs'])
+
+
+# ==========================================
+# 지연 로드 (처음 쓸 때 한 번만)
+# ==========================================
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """저장된 모델 (없으면 None)"""
+    global _model, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                if os.path.exists(MODEL_PATH):
+                    try:
+                        _model = NaiveBayesTitleClassifier.load(MODEL_PATH)
+                        print(f"🧠 로컬 분류 모델 로드: {len(_model.log_probs)}개 n-gram")
+                    except Exception as e:
+                        print(f"⚠️ 로컬 분류 모델 로드 실패: {e}")
+                _model_loaded = True
+    return _model
+
+
+def predict_local(title):
+    """(카테고리, 확신도) 또는 모델이 없으면 (None, 0.0)"""
+    model = get_model()
+    if model is None:
+        return None, 0.0
+    return model.predict(title)
+
+
+# ==========================================
+# 학습 / 평가
+# ==========================================
+def split_dataset(samples, test_ratio=0.2, seed=42):
+    shuffled = list(samples)
+    random.Random(seed).shuffle(shuffled)
+    n_test = max(1, int(len(shuffled) * test_ratio))
+    return shuffled[n_test:], shuffled[:n_test]
+
+
+def evaluate(model, samples, threshold=None):
+    """정확도와 (threshold 지정 시) 확신도 threshold 이상 항목의 커버리지/정확도"""
+    correct = 0
+    confident = 0
+    confident_correct = 0
+    started = time.perf_counter()
+    for title, label in samples:
+        category, confidence = model.predict(title)
+        correct += category == label
+        if threshold is not None and confidence >= threshold:
+            confident += 1
+            confident_correct += category == label
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'samples': len(samples),
+        'accuracy': round(correct / len(samples), 4) if samples else 0.0,
+        'avg_ms': round(elapsed / max(len(samples), 1) * 1000, 4),
+    }
+    if threshold is not None:
+        report['threshold'] = threshold
+        report['coverage'] = round(confident / len(samples), 4) if samples else 0.0
+        report['confident_accuracy'] = round(confident_correct / confident, 4) if confident else 0.0
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 제목 분류기 학습/평가")
+    parser.add_argument('command', choices=['train', 'evaluate'])
+    parser.add_argument('--data', default=DATASET_PATH)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--test-ratio', type=float, default=0.2)
+    parser.add_argument('--threshold', type=float, default=float(os.environ.get('LOCAL_CONFIDENCE_THRESHOLD', '0.9')))
+    args = parser.parse_args()
+
+    samples = load_dataset(args.data)
+    print(f"📂 데이터 {len(samples)}개 로드")
+
+    if args.command == 'train':
+        train_set, test_set = split_dataset(samples, args.test_ratio)
+        holdout = NaiveBayesTitleClassifier.train(train_set)
+        print(f"📊 홀드아웃 평가 (학습 {len(train_set)} / 평가 {len(test_set)}): "
+              f"{evaluate(holdout, test_set, args.threshold)}")
+
+        # 최종 모델은 전체 데이터로 학습
+        model = NaiveBayesTitleClassifier.train(samples)
+        model.save(args.model)
+        print(f"💾 모델 저장: {args.model} ({os.path.getsize(args.model) / 1024:.1f} KB, "
+              f"{len(model.log_probs)}개 n-gram)")
+    else:
+        model = NaiveBayesTitleClassifier.load(args.model)
+        print(f"📊 전체 데이터 평가: {evaluate(model, samples, args.threshold)}")
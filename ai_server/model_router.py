@@ -0,0 +1,253 @@
+import argparse
+import math
+import threading
+import time
+
+from rate_limiter import CircuitBreaker
+
+# ==========================================
+# 지연 시간 기반 Gemini 모델 라우터
+# ==========================================
+# check_models.py가 보여주는 generateContent 지원 모델들 중에서
+# 호출마다 "지금 가장 빠르고 건강한" 모델을 고름.
+# - 모델별 지연 시간(EWMA)과 오류율(EWMA, 시간이 지나면 반감)을 기록
+# - 429/403을 받은 모델은 모델별 서킷 브레이커로 cooldown 동안 제외 (강등)
+#   (403 쿼터/권한과 반복되는 429는 클라이언트 공용 브레이커도 열어서 다른 모델로 재시도하지 않음)
+# - 한 모델이 실패하면 다음 후보로 한 번 더 시도
+#
+#   python model_router.py bench                      # 로컬 대체 서버로 모델 비교
+#   python model_router.py bench --base-url URL ...   # 실제/다른 엔드포인트로 비교
+
+DEFAULT_MODELS = ["gemini-2.0-flash", "gemini-1.5-flash"]
+ALPHA = 0.3                 # EWMA 가중치 (최근 호출 비중)
+MAX_ERROR_RATE = 0.5        # 이 이상이면 건강하지 않은 것으로 보고 후순위
+ERROR_HALF_LIFE = 300       # 오류율이 절반으로 줄어드는 시간(초) — 호출이 없어도 회복되게
+DEMOTE_COOLDOWN = 600       # 429/403 받은 모델을 제외하는 시간(초)
+PROBE_PROMPT = '다음 중 하나만 출력하세요: [학사]\n제목: "수강신청 안내"'
+
+
+class ModelHealth:
+    def __init__(self, name, cooldown=DEMOTE_COOLDOWN):
+        self.name = name
+        self.latency = None         # 성공한 호출의 EWMA 지연 시간(초)
+        self._error_rate = 0.0
+        self._error_at = time.monotonic()
+        self.calls = 0
+        self.failures = 0
+        # 429/403 한 번이면 바로 강등 (다른 모델이 있으므로 같은 모델로 재시도하지 않음)
+        self.breaker = CircuitBreaker(failure_threshold=1, cooldown=cooldown)
+
+    def error_rate(self, now=None):
+        elapsed = (time.monotonic() if now is None else now) - self._error_at
+        return self._error_rate * math.pow(0.5, elapsed / ERROR_HALF_LIFE)
+
+    def observe(self, success, latency, alpha=ALPHA, now=None):
+        now = time.monotonic() if now is None else now
+        self.calls += 1
+        self._error_rate = (1 - alpha) * self.error_rate(now) + alpha * (0.0 if success else 1.0)
+        self._error_at = now
+        if success:
+            self.latency = latency if self.latency is None else (1 - alpha) * self.latency + alpha * latency
+        else:
+            self.failures += 1
+
+    def snapshot(self):
+        return {
+            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+            'error_rate': round(self.error_rate(), 3),
+            'calls': self.calls,
+            'failures': self.failures,
+            'state': self.breaker.state,
+        }
+
+
+class ModelRouter:
+    def __init__(self, client, models, alpha=ALPHA, max_error_rate=MAX_ERROR_RATE,
+                 cooldown=DEMOTE_COOLDOWN, max_attempts=2):
+        """
+        client: GeminiClient (연결/예산/재시도는 클라이언트가 처리)
+        models: 후보 모델 이름 목록 (앞쪽일수록 측정 전 우선순위가 높음)
+        """
+        self.client = client
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.max_attempts = max_attempts
+        self._health = {name: ModelHealth(name, cooldown) for name in models}
+        self._order = list(models)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def discover(cls, client, pattern='flash', **kwargs):
+        """list_models()로 generateContent 지원 모델을 찾아 라우터 생성 (pattern이 이름에 들어간 것만)"""
+        names = [m['name'].split('/', 1)[-1] for m in client.list_models()]
+        names = [n for n in names if not pattern or pattern in n]
+        # 기본 모델을 맨 앞에 (측정 전에는 기존과 같은 모델을 먼저 씀)
+        names.sort(key=lambda n: n != client.model)
+        return cls(client, names, **kwargs)
+
+    @property
+    def models(self):
+        return list(self._order)
+
+    def ranked(self):
+        """
+        후보 순서: 강등되지 않고 오류율이 낮은 모델을 빠른 순으로,
+        그다음 오류율이 높은 모델을 오류율 낮은 순으로 (강등된 모델은 제외)
+        """
+        with self._lock:
+            now = time.monotonic()
+            available = [h for h in (self._health[n] for n in self._order) if h.breaker.available()]
+            healthy = [h for h in available if h.error_rate(now) < self.max_error_rate]
+            unhealthy = [h for h in available if h.error_rate(now) >= self.max_error_rate]
+        # 측정 전 모델은 측정된 모델 뒤에 (목록 순서 유지)
+        healthy.sort(key=lambda h: (h.latency is None, h.latency or 0.0))
+        unhealthy.sort(key=lambda h: h.error_rate(now))
+        return healthy + unhealthy
+
+    def choose(self):
+        ranked = self.ranked()
+        return ranked[0].name if ranked else None
+
+    def _call(self, health, prompt_text, json_output):
+        started = time.monotonic()
+        text = self.client.generate(prompt_text, model=health.name, json_output=json_output,
+                                    breaker=health.breaker)
+        with self._lock:
+            health.observe(text is not None, time.monotonic() - started, self.alpha)
+        return text
+
+    def generate(self, prompt_text, json_output=False):
+        """가장 좋은 모델로 호출하고, 실패하면 다음 후보로 (최대 max_attempts개 모델)"""
+        return self.generate_with_model(prompt_text, json_output)[0]
+
+    def generate_with_model(self, prompt_text, json_output=False):
+        """generate와 같지만 (응답 텍스트, 응답한 모델) 반환. 실패 시 (None, None)"""
+        for health in self.ranked()[:self.max_attempts]:
+            # 키 전체가 막혔으면(공용 브레이커 open: 403 쿼터 등) 다른 모델로 넘기지 않고 바로 중단
+            if not self.client.breaker.available():
+                break
+            text = self._call(health, prompt_text, json_output)
+            if text is not None:
+                return text, health.name
+        return None, None
+
+    def probe(self, prompt_text=PROBE_PROMPT):
+        """모든 후보에 짧은 요청을 한 번씩 보내 지연 시간 초기값을 잡음"""
+        for name in self._order:
+            health = self._health[name]
+            if health.breaker.available():
+                self._call(health, prompt_text, False)
+        return self.stats()
+
+    def stats(self):
+        with self._lock:
+            return {name: self._health[name].snapshot() for name in self._order}
+
+
+# ==========================================
+# 벤치마크: 고정된 제목 목록으로 모델 비교
+# ==========================================
+SAMPLE_TITLES = [
+    ("2025학년도 1학기 수강신청 안내", "학사"),
+    ("국가장학금 2차 신청 안내", "장학"),
+    ("삼성전자 신입사원 채용 설명회", "취업"),
+    ("SW중심대학 해커톤 참가자 모집", "공모전"),
+    ("컴퓨터공학부 학생회 간식행사", "학과행사"),
+    ("외부기관 AI 특강 안내", "외부행사"),
+]
+
+
+def _parse_spec(spec, cast=float):
+    """'a=0.1,b=0.2' -> {'a': 0.1, 'b': 0.2}"""
+    result = {}
+    for part in filter(None, (spec or '').split(',')):
+        name, value = part.split('=')
+        result[name.strip()] = cast(value)
+    return result
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def benchmark(client, models, samples):
+    """모델별로 같은 제목들을 단건 분류해 지연 시간/성공률/정확도 측정, 이후 라우터로 한 번 더"""
+    from gemini_classifier import build_prompt, match_category
+
+    results = {}
+    for model in models:
+        latencies, ok, correct = [], 0, 0
+        for title, label in samples:
+            started = time.monotonic()
+            text = client.generate(build_prompt(title), model=model, breaker=CircuitBreaker(failure_threshold=1000))
+            latencies.append(time.monotonic() - started)
+            category = match_category(text)
+            ok += category is not None
+            correct += category == label
+        results[model] = {
+            'avg_ms': round(sum(latencies) / len(latencies) * 1000, 1),
+            'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+            'success_rate': round(ok / len(samples), 3),
+            'accuracy': round(correct / len(samples), 3),
+        }
+
+    router = ModelRouter(client, models)
+    router.probe()
+    started = time.monotonic()
+    routed_ok = sum(match_category(router.generate(build_prompt(title))) is not None for title, _ in samples)
+    results['router'] = {
+        'avg_ms': round((time.monotonic() - started) / len(samples) * 1000, 1),
+        'success_rate': round(routed_ok / len(samples), 3),
+        'models': router.stats(),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    from gemini_client import GeminiClient
+    from rate_limiter import RequestBudget
+
+    parser = argparse.ArgumentParser(description="Gemini 모델 라우터 벤치마크")
+    parser.add_argument('command', choices=['bench'])
+    parser.add_argument('--models', default=",".join(DEFAULT_MODELS))
+    parser.add_argument('--base-url', help="지정하지 않으면 로컬 대체 서버(fake_gemini) 사용")
+    parser.add_argument('--latency', default="gemini-2.0-flash=0.08,gemini-1.5-flash=0.03",
+                        help="대체 서버 모델별 지연(초), 예: a=0.1,b=0.2")
+    parser.add_argument('--errors', default="",
+                        help="대체 서버 모델별 429 비율, 예: a=0.1")
+    parser.add_argument('--data', help="title,category CSV (기본: 내장 샘플 제목)")
+    parser.add_argument('--limit', type=int, default=30)
+    parser.add_argument('--rpm', type=int, default=6000)
+    args = parser.parse_args()
+
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    if args.data:
+        from local_classifier import load_dataset
+        samples = load_dataset(args.data)[:args.limit]
+    else:
+        samples = (SAMPLE_TITLES * (args.limit // len(SAMPLE_TITLES) + 1))[:args.limit]
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        from fake_gemini import FakeGeminiServer
+        latency, errors = _parse_spec(args.latency), _parse_spec(args.errors)
+        server = FakeGeminiServer({m: {'latency': latency.get(m, 0.05), 'error_rate': errors.get(m, 0.0)}
+                                   for m in models}).start()
+        base_url = server.base_url
+        print(f"🧪 로컬 대체 서버: {base_url}")
+
+    client = GeminiClient(api_key='' if server else None, base_url=base_url,
+                          budget=RequestBudget(rpm=args.rpm), max_retries=1)
+    try:
+        print(f"⏱️ 제목 {len(samples)}개 x 모델 {len(models)}개 벤치마크")
+        for name, result in benchmark(client, models, samples).items():
+            print(f"   - {name:<20} {result}")
+        print(f"📈 클라이언트 지표: {client.metrics()}")
+    finally:
+        client.close()
+        if server:
+            server.stop()
@@ -0,0 +1,256 @@
+import queue
+import threading
+import time
+
+# ==========================================
+# 스트리밍 파이프라인 (스레드 + 제한 큐)
+# ==========================================
+# source -> Stage 1 -> Stage 2 -> ... 순서로 항목이 흘러가며,
+# 각 Stage는 자기 입력 큐(크기 제한)와 워커 수를 가짐.
+# 느린 단계(상세 수집, Gemini 분류)가 다른 단계와 겹쳐서 실행되고,
+# 큐가 가득 차면 앞 단계가 자연스럽게 대기함 (backpressure).
+#
+# Stage 함수 형태: func(item, emit)  — emit(out)을 0번 이상 호출 (map/filter/flatmap)
+# batch_size > 1이면 func(items, emit)로 최대 batch_size개를 묶어서 받음.
+
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.received = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self.started_at = None
+        self.finished_at = None
+
+
+class Stage:
+    def __init__(self, name, func, workers=1, queue_size=32, batch_size=1, batch_wait=0.5,
+                 setup=None, teardown=None):
+        """
+        setup/teardown: 워커 스레드 시작/종료 시 한 번씩 호출 (예: 워커별 Chrome 드라이버)
+        batch_wait: 배치를 채우기 위해 다음 항목을 기다리는 최대 시간(초)
+        """
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.setup = setup
+        self.teardown = teardown
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = StageStats()
+
+    def put(self, item):
+        self.queue.put(item)
+        depth = self.queue.qsize()
+        with self.stats.lock:
+            if depth > self.stats.max_queue_depth:
+                self.stats.max_queue_depth = depth
+
+    def snapshot(self):
+        s = self.stats
+        with s.lock:
+            end = s.finished_at or time.monotonic()
+            elapsed = (end - s.started_at) if s.started_at else 0.0
+            return {
+                'workers': self.workers,
+                'received': s.received,
+                'emitted': s.emitted,
+                'errors': s.errors,
+                'queue_depth': self.queue.qsize(),
+                'max_queue_depth': s.max_queue_depth,
+                'busy_seconds': round(s.busy_seconds, 3),
+                'throughput': round(s.received / elapsed, 3) if elapsed > 0 else 0.0,
+            }
+
+
+class Pipeline:
+    def __init__(self, stages, on_error=None, monitor_interval=None):
+        """
+        on_error(stage_name, item_or_items, exc): 항목 처리 중 예외 발생 시 호출 (항목은 버려짐)
+        monitor_interval: 지정 시 해당 주기(초)마다 단계별 처리량/큐 깊이 출력
+        """
+        self.stages = stages
+        self.on_error = on_error
+        self.monitor_interval = monitor_interval
+        self._threads = []
+        self._alive = {}
+        self._alive_lock = threading.Lock()
+        self._healthy = {}      # 단계별 setup에 성공했거나 아직 시작 중인 워커 수
+        self._setup_errors = []
+        self._finished = threading.Event()
+
+    # ---------- 워커 ----------
+    def _emitter(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        def emit(out):
+            with stage.stats.lock:
+                stage.stats.emitted += 1
+            if next_stage is not None:
+                next_stage.put(out)
+        return emit
+
+    def _take(self, stage):
+        """입력 큐에서 항목(또는 배치)을 꺼냄. 종료 신호를 만나면 (items, True)"""
+        item = stage.queue.get()
+        if item is _DONE:
+            return [], True
+        if stage.batch_size <= 1:
+            return [item], False
+
+        items = [item]
+        deadline = time.monotonic() + stage.batch_wait
+        while len(items) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                nxt = stage.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is _DONE:
+                return items, True
+            items.append(nxt)
+        return items, False
+
+    def _worker(self, index):
+        stage = self.stages[index]
+        emit = self._emitter(index)
+        if stage.setup:
+            try:
+                stage.setup()
+            except Exception as e:
+                self._setup_failed(index, e)
+                return
+        try:
+            done = False
+            while not done:
+                items, done = self._take(stage)
+                if not items:
+                    continue
+                with stage.stats.lock:
+                    stage.stats.received += len(items)
+                started = time.monotonic()
+                try:
+                    if stage.batch_size > 1:
+                        stage.func(items, emit)
+                    else:
+                        stage.func(items[0], emit)
+                except Exception as e:
+                    with stage.stats.lock:
+                        stage.stats.errors += 1
+                    print(f"   ❌ [{stage.name}] 처리 실패: {e}")
+                    if self.on_error:
+                        self.on_error(stage.name, items if stage.batch_size > 1 else items[0], e)
+                finally:
+                    with stage.stats.lock:
+                        stage.stats.busy_seconds += time.monotonic() - started
+        finally:
+            if stage.teardown:
+                try:
+                    stage.teardown()
+                except Exception as e:
+                    print(f"   ⚠️ [{stage.name}] 정리 실패: {e}")
+            self._worker_exited(index)
+
+    def _setup_failed(self, index, exc):
+        """
+        워커 시작(setup) 실패: 이 워커는 처리하지 않고 종료.
+        같은 단계의 워커가 모두 시작에 실패했으면 마지막 워커가 입력 큐를 비워서(항목은 on_error로 보고)
+        앞 단계의 put()이 막히지 않게 하고, run()이 끝난 뒤 예외를 올리도록 기록함
+        """
+        stage = self.stages[index]
+        print(f"   ❌ [{stage.name}] 워커 시작 실패: {exc}")
+        with stage.stats.lock:
+            stage.stats.errors += 1
+        with self._alive_lock:
+            self._healthy[index] -= 1
+            no_workers_left = self._healthy[index] == 0
+        try:
+            if no_workers_left:
+                self._setup_errors.append((stage.name, exc))
+                while True:
+                    item = stage.queue.get()
+                    if item is _DONE:
+                        break
+                    if self.on_error:
+                        self.on_error(stage.name, [item] if stage.batch_size > 1 else item, exc)
+        finally:
+            self._worker_exited(index)
+
+    def _worker_exited(self, index):
+        # 한 단계의 마지막 워커가 끝나면 다음 단계 워커 수만큼 종료 신호 전달
+        with self._alive_lock:
+            self._alive[index] -= 1
+            last = self._alive[index] == 0
+        if last:
+            stage = self.stages[index]
+            with stage.stats.lock:
+                stage.stats.finished_at = time.monotonic()
+            if index + 1 < len(self.stages):
+                nxt = self.stages[index + 1]
+                for _ in range(nxt.workers):
+                    nxt.queue.put(_DONE)
+            else:
+                self._finished.set()
+
+    # ---------- 실행 ----------
+    def run(self, source):
+        """
+        source(iterable)의 항목을 흘려보내고 모든 단계가 끝날 때까지 대기.
+        어떤 단계의 워커가 모두 setup에 실패하면 (항목은 on_error로 보고한 뒤) RuntimeError
+        """
+        now = time.monotonic()
+        for index, stage in enumerate(self.stages):
+            stage.stats.started_at = now
+            self._alive[index] = stage.workers
+            self._healthy[index] = stage.workers
+            for n in range(stage.workers):
+                t = threading.Thread(target=self._worker, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+        monitor = None
+        if self.monitor_interval:
+            monitor = threading.Thread(target=self._monitor, daemon=True)
+            monitor.start()
+
+        first = self.stages[0]
+        try:
+            for item in source:
+                first.put(item)
+        finally:
+            for _ in range(first.workers):
+                first.queue.put(_DONE)
+            self._finished.wait()
+            for t in self._threads:
+                t.join()
+        if self._setup_errors:
+            name, exc = self._setup_errors[0]
+            raise RuntimeError(f"[{name}] 모든 워커 시작 실패: {exc}") from exc
+        return self.stats()
+
+    def _monitor(self):
+        while not self._finished.wait(self.monitor_interval):
+            print("   📈 " + self.format_stats(compact=True))
+
+    def stats(self):
+        return {stage.name: stage.snapshot() for stage in self.stages}
+
+    def format_stats(self, compact=False):
+        parts = []
+        for name, s in self.stats().items():
+            if compact:
+                parts.append(f"{name}: {s['received']}건 q={s['queue_depth']}")
+            else:
+                parts.append(f"   - {name:<10} 워커 {s['workers']} | 입력 {s['received']} 출력 {s['emitted']} "
+                             f"에러 {s['errors']} | {s['throughput']}/s | 작업 {s['busy_seconds']}s "
+                             f"| 큐 최대 {s['max_queue_depth']}")
+        return " | ".join(parts) if compact else "\n".join(parts)
@@ -0,0 +1,220 @@
+import argparse
+import os
+import threading
+import zlib
+
+from firebase_admin import firestore
+
+from push_topics import CATEGORY_TOPICS, enabled_categories
+
+# ==========================================
+# 카테고리별 수신 토큰 인덱스 (push_index)
+# ==========================================
+# 토큰 방식 발송 때마다 users 전체를 읽는 대신, 카테고리별 수신 토큰을
+# push_index/{카테고리}__{샤드} 문서에 미리 모아 둠.
+#   { 'bucket': '장학', 'shard': 3, 'tokens': { uid: fcm_token, ... } }
+# - 사용자는 uid 해시로 샤드가 정해지고, 변경 시 그 샤드 문서의 tokens.{uid}만 갱신/삭제
+#   (토큰이 바뀌어도 uid 키라서 예전 토큰을 따로 찾을 필요 없음, 1MB 문서 제한은 샤드 수로 조절)
+# - ALL_BUCKET은 카테고리 토픽이 없는 공지(예: '전체')용으로 푸시를 켠 모든 사용자
+# - PushIndex: 푸시 모니터 안의 메모리 사본. 데워져 있으면 수신자 조회에 읽기 0회,
+#   아니면 해당 카테고리 샤드 문서 몇 개만 읽음
+# - IndexMaintainer: users를 on_snapshot으로 구독해서 메모리 사본과 인덱스 문서를 같이 갱신
+
+INDEX_COLLECTION = 'push_index'
+INDEX_SHARDS = int(os.environ.get('PUSH_INDEX_SHARDS', '8'))
+ALL_BUCKET = '_all'
+BUCKETS = list(CATEGORY_TOPICS) + [ALL_BUCKET]
+BATCH_LIMIT = 400
+
+
+def shard_of(uid, shards=INDEX_SHARDS):
+    return zlib.crc32(uid.encode('utf-8')) % shards
+
+
+def shard_doc_id(bucket, shard):
+    return f"{bucket}__{shard}"
+
+
+def bucket_for_category(category):
+    return category if category in CATEGORY_TOPICS else ALL_BUCKET
+
+
+def user_buckets(user_data):
+    """사용자 문서 -> (토큰, 들어가야 할 버킷 집합)"""
+    if not user_data or not user_data.get('isPushEnabled') or not user_data.get('fcm_token'):
+        return None, set()
+    return user_data['fcm_token'], enabled_categories(user_data) | {ALL_BUCKET}
+
+
+class PushIndex:
+    """버킷별 {uid: token} 메모리 사본"""
+
+    def __init__(self, shards=INDEX_SHARDS):
+        self.shards = shards
+        self._buckets = {bucket: {} for bucket in BUCKETS}
+        self._loaded = set()     # 메모리에 올라온 버킷
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'shard_reads': 0}
+
+    def _ref(self, db, bucket, shard):
+        return db.collection(INDEX_COLLECTION).document(shard_doc_id(bucket, shard))
+
+    @property
+    def warm(self):
+        return len(self._loaded) == len(BUCKETS)
+
+    def load(self, db):
+        """인덱스 문서 전체를 한 번에 읽음 (버킷 수 x 샤드 수 문서). 인덱스가 없으면 False"""
+        buckets = {bucket: {} for bucket in BUCKETS}
+        found = False
+        for doc in db.collection(INDEX_COLLECTION).stream():
+            data = doc.to_dict() or {}
+            if data.get('bucket') in buckets:
+                buckets[data['bucket']].update(data.get('tokens', {}))
+                found = True
+        if not found:
+            return False
+        with self._lock:
+            self._buckets = buckets
+            self._loaded = set(BUCKETS)
+        return True
+
+    def recipients(self, db, category):
+        """
+        카테고리 수신 토큰 목록. 메모리에 있으면 읽기 없이, 없으면 해당 버킷 샤드만 읽음.
+        인덱스가 아직 만들어지지 않았으면 None (호출 쪽에서 users 전체 조회로 대체)
+        """
+        bucket = bucket_for_category(category)
+        with self._lock:
+            if bucket in self._loaded:
+                self.stats['memory_hits'] += 1
+                return sorted(set(self._buckets[bucket].values()))
+
+        tokens, found = {}, False
+        for shard in range(self.shards):
+            snapshot = self._ref(db, bucket, shard).get()
+            self.stats['shard_reads'] += 1
+            if snapshot.exists:
+                found = True
+                tokens.update(snapshot.to_dict().get('tokens', {}))
+        if not found:
+            return None
+        with self._lock:
+            if bucket not in self._loaded:
+                self._buckets[bucket] = tokens
+                self._loaded.add(bucket)
+        return sorted(set(tokens.values()))
+
+    def diff_user(self, uid, user_data):
+        """메모리 사본 기준으로 바뀌는 항목 [(bucket, uid, token 또는 None)]을 계산하고 반영"""
+        token, wanted = user_buckets(user_data)
+        changes = []
+        with self._lock:
+            for bucket in BUCKETS:
+                current = self._buckets[bucket].get(uid)
+                new = token if bucket in wanted else None
+                if current == new:
+                    continue
+                if new is None:
+                    self._buckets[bucket].pop(uid, None)
+                else:
+                    self._buckets[bucket][uid] = new
+                changes.append((bucket, uid, new))
+        return changes
+
+    def known_uids(self):
+        with self._lock:
+            return set().union(*(tokens.keys() for tokens in self._buckets.values()))
+
+    def write(self, db, changes):
+        """변경 목록을 샤드 문서별 merge set으로 묶어서 배치 기록. 기록한 문서 수 반환"""
+        per_doc = {}
+        for bucket, uid, token in changes:
+            key = (bucket, shard_of(uid, self.shards))
+            per_doc.setdefault(key, {})[uid] = token if token is not None else firestore.DELETE_FIELD
+        batch, pending = db.batch(), 0
+        for (bucket, shard), tokens in per_doc.items():
+            batch.set(self._ref(db, bucket, shard), {'bucket': bucket, 'shard': shard, 'tokens': tokens},
+                      merge=True)
+            pending += 1
+            if pending == BATCH_LIMIT:
+                batch.commit()
+                batch, pending = db.batch(), 0
+        if pending:
+            batch.commit()
+        return len(per_doc)
+
+
+def rebuild(db, shards=INDEX_SHARDS):
+    """users 전체로 인덱스 문서를 처음부터 다시 만듦 (빈 샤드도 문서를 만들어 '인덱스 있음'을 표시)"""
+    docs = {(bucket, shard): {} for bucket in BUCKETS for shard in range(shards)}
+    users = 0
+    for user in db.collection('users').stream():
+        users += 1
+        token, wanted = user_buckets(user.to_dict())
+        for bucket in wanted:
+            docs[(bucket, shard_of(user.id, shards))][user.id] = token
+
+    batch, pending = db.batch(), 0
+    for (bucket, shard), tokens in docs.items():
+        ref = db.collection(INDEX_COLLECTION).document(shard_doc_id(bucket, shard))
+        batch.set(ref, {'bucket': bucket, 'shard': shard, 'tokens': tokens})
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    counts = {bucket: sum(len(docs[(bucket, s)]) for s in range(shards)) for bucket in BUCKETS}
+    print(f"📇 수신 인덱스 재생성: 사용자 {users}명, 버킷별 {counts}")
+    return counts
+
+
+class IndexMaintainer:
+    """users 변경을 받아 PushIndex 메모리 사본과 push_index 문서를 같이 갱신"""
+
+    def __init__(self, db, index):
+        self.db = db
+        self.index = index
+        self._watch = None
+        self.stats = {'snapshots': 0, 'changes': 0, 'doc_writes': 0}
+
+    def _on_snapshot(self, docs, changes, read_time):
+        first = self.stats['snapshots'] == 0
+        self.stats['snapshots'] += 1
+        pending = []
+        for change in changes:
+            data = None if change.type.name == 'REMOVED' else change.document.to_dict()
+            pending.extend(self.index.diff_user(change.document.id, data))
+        if first:
+            # 첫 스냅샷은 전체 사용자 -> 인덱스에만 남아 있는 사용자(삭제 누락) 정리
+            present = {doc.id for doc in docs}
+            for uid in self.index.known_uids() - present:
+                pending.extend(self.index.diff_user(uid, None))
+        if not pending:
+            return
+        self.stats['changes'] += len(pending)
+        try:
+            self.stats['doc_writes'] += self.index.write(self.db, pending)
+        except Exception as e:
+            print(f"   ❌ 수신 인덱스 기록 실패: {e}")
+
+    def start(self):
+        self._watch = self.db.collection('users').on_snapshot(self._on_snapshot)
+        print("👂 사용자 알림 설정 변경 구독 시작 (수신 인덱스)")
+        return self
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="카테고리별 수신 토큰 인덱스 관리")
+    parser.add_argument('command', choices=['rebuild'])
+    args = parser.parse_args()
+
+    from push_sender import db  # Firebase 초기화
+
+    rebuild(db)
@@ -0,0 +1,74 @@
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import firestore
+
+# ==========================================
+# 푸시 워커 임대(lease) 기반 작업 선점
+# ==========================================
+# 여러 push_sender 프로세스가 같은 push_requested 공지를 보더라도 한 워커만 발송하도록
+# 트랜잭션으로 공지에 push_claimed_by / push_lease_until을 기록하고 선점함.
+# - 임대 기간 안에는 다른 워커가 선점할 수 없음
+# - 워커가 죽으면 임대가 만료되고, 다른 워커의 안전 확인 폴링이 다시 가져감
+# - 발송이 끝나면 push_requested=False와 발송 기록을 쓰면서 임대 필드를 지움
+# 임대 시각은 워커 시계(UTC) 기준이므로 워커 간 시계 차이보다 충분히 길게 잡아야 함.
+
+LEASE_SECONDS = int(os.environ.get('PUSH_LEASE_SECONDS', '300'))
+
+
+def default_worker_id():
+    return os.environ.get('PUSH_WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+
+
+def claim_notice(db, notice_id, worker_id, lease_seconds=LEASE_SECONDS, now=None):
+    """
+    공지 선점 시도. 선점하면 공지 데이터(dict), 아니면 None
+    (공지 없음 / 이미 발송됨 / 다른 워커가 임대 중)
+    """
+    now = now or datetime.now(timezone.utc)
+    ref = db.collection('notices').document(notice_id)
+
+    @firestore.transactional
+    def _claim(transaction):
+        snapshot = ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return None
+        data = snapshot.to_dict()
+        if not data.get('push_requested'):
+            return None
+        holder = data.get('push_claimed_by')
+        lease_until = data.get('push_lease_until')
+        if holder and holder != worker_id and lease_until and lease_until > now:
+            return None
+        transaction.update(ref, {
+            'push_claimed_by': worker_id,
+            'push_lease_until': now + timedelta(seconds=lease_seconds),
+            'push_claim_count': firestore.Increment(1),
+        })
+        return data
+
+    return _claim(db.transaction())
+
+
+def complete_notice(db, notice_id, worker_id, updates):
+    """
+    발송 결과 기록 + 임대 해제. 끝까지 임대를 갖고 있었으면 True
+    (False면 임대가 만료돼 다른 워커가 가져간 것 -> 임대 시간이 발송 시간보다 짧다는 신호.
+     이때는 새 소유자의 상태를 덮어쓰지 않도록 아무것도 기록하지 않음)
+    """
+    ref = db.collection('notices').document(notice_id)
+
+    @firestore.transactional
+    def _complete(transaction):
+        snapshot = ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return False
+        if snapshot.to_dict().get('push_claimed_by') != worker_id:
+            return False
+        transaction.update(ref, {**updates,
+                                 'push_claimed_by': firestore.DELETE_FIELD,
+                                 'push_lease_until': firestore.DELETE_FIELD})
+        return True
+
+    return _complete(db.transaction())
@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+
+# ==========================================
+# 푸시 요청 실시간 감지 (on_snapshot + 재연결 + 폴링 대체)
+# ==========================================
+# push_requested == True 쿼리를 on_snapshot으로 구독해서 변경이 오자마자 발송함.
+# - 스냅샷 콜백은 Firestore 스레드에서 불리므로 문서 ID만 큐에 넣고, 발송은 run() 스레드에서 처리
+# - 스트림이 끊기면 지수 백오프로 재구독하고, 끊겨 있는 동안은 poll_interval마다 쿼리로 확인
+# - 연결 중에도 safety_interval마다 한 번씩 쿼리해서 놓친 변경이 없는지 확인
+
+
+class PushRequestWatcher:
+    def __init__(self, query, on_request, poll_interval=10, safety_interval=600,
+                 reconnect_delay=1, max_reconnect_delay=300, check_interval=1.0):
+        """
+        query: 감시할 Firestore 쿼리 (예: notices.where('push_requested', '==', True))
+        on_request(doc_id): 푸시 요청이 감지된 문서 처리 (run()을 돌리는 스레드에서 호출)
+        """
+        self.query = query
+        self.on_request = on_request
+        self.poll_interval = poll_interval
+        self.safety_interval = safety_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.check_interval = check_interval
+
+        self._queue = queue.Queue()
+        self._pending = set()          # 큐에 들어가 있거나 처리 중인 ID (중복 발송 방지)
+        self._pending_lock = threading.Lock()
+        self._watch = None
+        self._delay = reconnect_delay
+        self._next_connect = 0.0
+        self._last_poll = 0.0
+        self.stats = {'snapshots': 0, 'polls': 0, 'reconnects': 0, 'dispatched': 0}
+
+    # ---------- 수집 ----------
+    def _enqueue(self, doc_id):
+        with self._pending_lock:
+            if doc_id in self._pending:
+                return
+            self._pending.add(doc_id)
+        self._queue.put(doc_id)
+
+    def _on_snapshot(self, docs, changes, read_time):
+        self.stats['snapshots'] += 1
+        for change in changes:
+            if change.type.name in ('ADDED', 'MODIFIED'):
+                self._enqueue(change.document.id)
+
+    def poll(self):
+        """쿼리로 직접 확인 (스트림이 끊겼을 때 / 주기적 안전 확인)"""
+        self.stats['polls'] += 1
+        self._last_poll = time.monotonic()
+        for doc in self.query.stream():
+            self._enqueue(doc.id)
+
+    # ---------- 연결 관리 ----------
+    @property
+    def connected(self):
+        return self._watch is not None and getattr(self._watch, 'is_active', True)
+
+    def _connect(self):
+        try:
+            self._watch = self.query.on_snapshot(self._on_snapshot)
+            self._delay = self.reconnect_delay
+            self._last_poll = time.monotonic()  # 구독 직후 초기 스냅샷이 전체 결과를 주므로 폴링과 같음
+            print("👂 푸시 요청 실시간 구독 시작")
+        except Exception as e:
+            self._watch = None
+            self._next_connect = time.monotonic() + self._delay
+            print(f"⚠️ 구독 실패: {e} ({self._delay}초 후 재시도, 그동안 폴링)")
+            self._delay = min(self._delay * 2, self.max_reconnect_delay)
+
+    def _ensure_connected(self):
+        if self.connected:
+            return
+        if self._watch is not None:
+            # 스트림 에러로 닫힌 구독 정리 후 재연결
+            print("⚠️ 실시간 구독 끊김. 재연결 대기 중 폴링으로 전환")
+            self._close_watch()
+            self.stats['reconnects'] += 1
+            self._next_connect = time.monotonic() + self._delay
+            self._delay = min(self._delay * 2, self.max_reconnect_delay)
+        if time.monotonic() >= self._next_connect:
+            self._connect()
+
+    def _close_watch(self):
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception:
+                pass
+            self._watch = None
+
+    # ---------- 실행 ----------
+    def step(self, timeout=None):
+        """연결 확인 + 필요 시 폴링 + 큐에서 한 건 처리. 처리했으면 True"""
+        self._ensure_connected()
+        interval = self.safety_interval if self.connected else self.poll_interval
+        if time.monotonic() - self._last_poll >= interval:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ 폴링 실패: {e}")
+
+        try:
+            doc_id = self._queue.get(timeout=self.check_interval if timeout is None else timeout)
+        except queue.Empty:
+            return False
+        try:
+            self.on_request(doc_id)
+            self.stats['dispatched'] += 1
+        except Exception as e:
+            print(f"❌ 푸시 요청 처리 실패 ({doc_id}): {e}")
+        finally:
+            with self._pending_lock:
+                self._pending.discard(doc_id)
+        return True
+
+    def run(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set():
+                self.step()
+        finally:
+            self.close()
+
+    def close(self):
+        self._close_watch()
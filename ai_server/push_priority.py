@@ -0,0 +1,147 @@
+import heapq
+import itertools
+import os
+import time
+from datetime import datetime, timezone
+
+# ==========================================
+# 푸시 우선순위 큐 + 요약(digest) 묶음 + 우선순위별 SLO
+# ==========================================
+# 워커가 선점한 공지를 바로 보내지 않고 우선순위 큐에 넣은 뒤 urgent > important > normal 순으로 발송.
+# - normal 공지는 카테고리별로 DIGEST_WINDOW초 동안 모았다가 2건 이상이면 요약 알림 하나로 보냄
+#   (창이 닫힐 때 1건뿐이면 평소처럼 단건 발송)
+# - urgent/important는 묶지 않고 바로 큐 맨 앞쪽으로
+# - 요청(push_requested_at)부터 발송까지 걸린 시간을 우선순위별로 기록하고 SLO 초과를 셈
+
+PRIORITIES = ('urgent', 'important', 'normal')
+PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITIES)}
+SLO_SECONDS = {'urgent': 30, 'important': 120, 'normal': 600}
+DIGEST_WINDOW = int(os.environ.get('PUSH_DIGEST_WINDOW', '120'))
+
+
+def notice_priority(notice_data):
+    if notice_data.get('is_urgent'):
+        return 'urgent'
+    if notice_data.get('is_important'):
+        return 'important'
+    return 'normal'
+
+
+class PushJob:
+    """발송 단위. items: [(notice_id, notice_data)] (digest면 2건 이상)"""
+
+    def __init__(self, priority, category, items):
+        self.priority = priority
+        self.category = category
+        self.items = items
+
+    @property
+    def is_digest(self):
+        return len(self.items) > 1
+
+    @property
+    def notice_ids(self):
+        return [notice_id for notice_id, _ in self.items]
+
+    def __repr__(self):
+        return f"PushJob({self.priority}, {self.category}, {self.notice_ids})"
+
+
+class PushScheduler:
+    def __init__(self, digest_window=DIGEST_WINDOW):
+        self.digest_window = digest_window
+        self._heap = []
+        self._seq = itertools.count()
+        self._digests = {}     # category -> {'opened_at', 'items'}
+        self._queued = set()   # 큐/요약 대기 중인 공지 ID (선점 갱신 스냅샷으로 다시 들어와도 무시)
+        self.stats = {'submitted': 0, 'digests': 0, 'coalesced': 0}
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (PRIORITY_RANK[job.priority], next(self._seq), job))
+
+    def submit(self, notice_id, notice_data, now=None):
+        """큐에 넣음. 이미 대기 중인 공지면 False"""
+        now = time.monotonic() if now is None else now
+        if notice_id in self._queued:
+            return False
+        self._queued.add(notice_id)
+        self.stats['submitted'] += 1
+        priority = notice_priority(notice_data)
+        category = notice_data.get('category', '전체')
+        if priority != 'normal' or self.digest_window <= 0:
+            self._push(PushJob(priority, category, [(notice_id, notice_data)]))
+            return True
+        bucket = self._digests.setdefault(category, {'opened_at': now, 'items': []})
+        bucket['items'].append((notice_id, notice_data))
+        return True
+
+    def _flush_digests(self, now, force=False):
+        for category in list(self._digests):
+            bucket = self._digests[category]
+            if force or now - bucket['opened_at'] >= self.digest_window:
+                del self._digests[category]
+                if len(bucket['items']) > 1:
+                    self.stats['digests'] += 1
+                    self.stats['coalesced'] += len(bucket['items'])
+                self._push(PushJob('normal', category, bucket['items']))
+
+    def next_job(self, now=None, force=False):
+        """지금 보낼 작업 (없으면 None). force=True면 모으는 중인 요약도 바로 내보냄 (종료 시)"""
+        now = time.monotonic() if now is None else now
+        self._flush_digests(now, force)
+        if not self._heap:
+            return None
+        job = heapq.heappop(self._heap)[2]
+        self._queued.difference_update(job.notice_ids)
+        return job
+
+    def seconds_until_ready(self, now=None):
+        """다음 작업이 준비될 때까지 남은 시간 (바로 보낼 게 있으면 0, 아무것도 없으면 None)"""
+        now = time.monotonic() if now is None else now
+        if self._heap:
+            return 0.0
+        if not self._digests:
+            return None
+        opened = min(bucket['opened_at'] for bucket in self._digests.values())
+        return max(opened + self.digest_window - now, 0.0)
+
+    def __contains__(self, notice_id):
+        return notice_id in self._queued
+
+    def __len__(self):
+        return len(self._heap) + sum(len(b['items']) for b in self._digests.values())
+
+
+class SloTracker:
+    """우선순위별 요청 -> 발송 지연 (초)"""
+
+    def __init__(self, slo_seconds=SLO_SECONDS):
+        self.slo_seconds = slo_seconds
+        self._latencies = {name: [] for name in PRIORITIES}
+
+    def record(self, priority, requested_at, sent_at=None):
+        """requested_at: push_requested_at (datetime). 없으면 기록하지 않음. 지연(초) 반환"""
+        if not isinstance(requested_at, datetime):
+            return None
+        sent_at = sent_at or datetime.now(timezone.utc)
+        latency = max((sent_at - requested_at).total_seconds(), 0.0)
+        self._latencies[priority].append(latency)
+        if latency > self.slo_seconds[priority]:
+            print(f"⚠️ SLO 초과 [{priority}]: {latency:.1f}초 (목표 {self.slo_seconds[priority]}초)")
+        return latency
+
+    def summary(self):
+        result = {}
+        for name, values in self._latencies.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            result[name] = {
+                'count': len(values),
+                'p50': round(ordered[len(ordered) // 2], 2),
+                'p95': round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 2),
+                'max': round(ordered[-1], 2),
+                'slo': self.slo_seconds[name],
+                'breaches': sum(1 for v in values if v > self.slo_seconds[name]),
+            }
+        return result
@@ -1,8 +1,16 @@
 import firebase_admin
 from firebase_admin import credentials, messaging, firestore
-import time
 import os
 import json
+import threading
+from auto_push import discovery_latency_ms
+from fcm_sender import send_multicast_parallel
+from push_lease import LEASE_SECONDS, claim_notice, complete_notice, default_worker_id
+from push_listener import PushRequestWatcher
+from push_index import IndexMaintainer, PushIndex, rebuild
+from push_priority import DIGEST_WINDOW, PushJob, PushScheduler, SloTracker, notice_priority
+from push_topics import SubscriptionManager, delivery_mode, send_topic_message, topic_for_category
+from token_pruner import prune_failed_tokens
 
 # ==========================================
 # Firebase 초기화
@@ -31,120 +39,210 @@ if not firebase_admin._apps:
 
 db = firestore.client()
 
-def send_push_for_notice(notice_id):
-    """특정 공지에 대한 푸시 알림 발송"""
+# 이 프로세스의 워커 ID (여러 워커가 push_requested 공지를 나눠 처리)
+WORKER_ID = default_worker_id()
+
+# 카테고리별 수신 토큰 메모리 사본 (모니터 실행 중에는 users 리스너가 최신으로 유지)
+recipient_index = PushIndex()
+
+def scan_recipients(category):
+    """users 전체를 읽어 수신 토큰 목록 생성 (수신 인덱스가 아직 없을 때만 사용)"""
+    users_query = db.collection('users').where('isPushEnabled', '==', True).stream()
+
+    tokens = []
+    for user in users_query:
+        user_data = user.to_dict()
+
+        # 카테고리별 설정 확인
+        push_settings = user_data.get('notification_settings', {})
+        category_enabled = push_settings.get(category, True)  # 기본값 True
+
+        if category_enabled:
+            fcm_token = user_data.get('fcm_token')
+            if fcm_token:
+                tokens.append(fcm_token)
+    return tokens
+
+def resolve_recipients(category):
+    """수신 인덱스(메모리 -> push_index 샤드 문서)로 조회, 인덱스가 없으면 users 전체 조회"""
+    tokens = recipient_index.recipients(db, category)
+    if tokens is None:
+        print("⚠️ 수신 인덱스 없음 -> users 전체 조회")
+        tokens = scan_recipients(category)
+    return tokens
+
+def finish_notice(notice_id, worker_id, updates):
+    """발송 기록 + 임대 해제"""
+    if not complete_notice(db, notice_id, worker_id, updates):
+        print(f"⚠️ 공지 {notice_id}: 발송 중 임대 만료 -> 기록은 새 소유자에게 맡김 (PUSH_LEASE_SECONDS를 늘려야 함)")
+
+def send_notification(category, title, body, data):
+    """토픽 또는 토큰 방식으로 알림 하나 발송. 공지 문서에 남길 발송 기록 필드 반환"""
+    # 토픽 모드: 카테고리 토픽으로 한 번에 발송 (users 조회 없음)
+    if delivery_mode() == 'topic' and topic_for_category(category):
+        message_id = send_topic_message(messaging, category, title, body, data)
+        print(f"✅ 토픽 발송 완료: {topic_for_category(category)} ({message_id})")
+        return {'push_delivery': 'topic', 'push_message_id': message_id}
+
+    # 2. 푸시 수신 동의한 유저 찾기 (수신 인덱스)
+    tokens = resolve_recipients(category)
+
+    if not tokens:
+        print("⚠️ 푸시 수신 대상 없음")
+        return {'push_recipient_count': 0}
+
+    print(f"📱 수신 대상: {len(tokens)}명")
+
+    # 3. 메시지 생성 및 발송 (500개씩 병렬 처리)
+    report = send_multicast_parallel(
+        messaging,
+        tokens,
+        notification=messaging.Notification(title=title, body=body),
+        data=data,
+    )
+    total_success = report['success']
+
+    # 실패한 토큰 처리 (만료/잘못된 토큰은 users에서 삭제, 일시적 실패는 누적)
+    # 요청 자체가 실패한 청크는 토큰 탓이 아니므로 정리 대상에서 제외
+    pruned = {'pruned': 0}
+    if report['request_failures']:
+        print(f"⚠️ 요청 실패로 못 보낸 토큰 {len(report['request_failures'])}개 (토큰 정리 제외)")
+    if report['failures']:
+        print(f"⚠️ 실패한 토큰 {len(report['failures'])}개")
+        try:
+            pruned = prune_failed_tokens(db, report['failures'], sent=len(tokens))
+            print(f"🧹 토큰 정리: 삭제 {pruned['pruned']}명 (만료/잘못됨 {pruned['dead']}, "
+                  f"누적 초과 {pruned['struck_out']}, 일시적 {pruned['transient']})")
+        except Exception as e:
+            print(f"❌ 토큰 정리 실패: {e}")
+
+    print(f"✅ 푸시 발송 완료: 성공 {total_success}/{len(tokens)} "
+          f"({report['elapsed_ms']}ms, 청크 {len(report['chunks'])}개, 재시도 {report['retried']}건)")
+    return {'push_recipient_count': total_success, 'push_pruned_count': pruned['pruned']}
+
+def deliver_job(job, worker_id, slo=None):
+    """선점한 공지 발송 (단건 또는 같은 카테고리 요약). 끝나면 공지마다 플래그 초기화 및 발송 기록"""
+    category = job.category
+    titles = [data.get('title', '새 공지') for _, data in job.items]
     try:
-        # 1. 공지 정보 가져오기
-        notice_doc = db.collection('notices').document(notice_id).get()
-        if not notice_doc.exists:
-            print(f"❌ 공지 {notice_id} 없음")
-            return
-        
-        notice_data = notice_doc.to_dict()
-        title = notice_data.get('title', '새 공지')
-        category = notice_data.get('category', '전체')
-        
-        print(f"📢 푸시 발송 시작: [{category}] {title}")
-        
-        # 2. 푸시 수신 동의한 유저 찾기
-        users_query = db.collection('users').where('isPushEnabled', '==', True).stream()
-        
-        tokens = []
-        for user in users_query:
-            user_data = user.to_dict()
-            
-            # 카테고리별 설정 확인
-            push_settings = user_data.get('notification_settings', {})
-            category_enabled = push_settings.get(category, True)  # 기본값 True
-            
-            if category_enabled:
-                fcm_token = user_data.get('fcm_token')
-                if fcm_token:
-                    tokens.append(fcm_token)
-        
-        if not tokens:
-            print("⚠️ 푸시 수신 대상 없음")
-            # 플래그 초기화
-            db.collection('notices').document(notice_id).update({
-                'push_requested': False,
-                'push_sent_at': firestore.SERVER_TIMESTAMP,
-                'push_recipient_count': 0,
+        if job.is_digest:
+            print(f"📢 요약 발송 시작: [{category}] {len(titles)}건")
+            fields = send_notification(
+                category, f"[{category}] 새 공지 {len(titles)}건", f"{titles[0]} 외 {len(titles) - 1}건",
+                {'notice_ids': ",".join(job.notice_ids), 'category': category, 'type': 'digest'})
+            fields['push_digest_size'] = len(titles)
+        else:
+            print(f"📢 푸시 발송 시작: [{category}] {titles[0]} ({job.priority})")
+            fields = send_notification(category, f"[{category}] 새 공지", titles[0], {
+                'notice_id': job.notice_ids[0],
+                'category': category,
+                'type': 'notice',
             })
-            return
-        
-        print(f"📱 수신 대상: {len(tokens)}명")
-        
-        # 3. 메시지 생성 및 발송 (배치 처리)
-        # FCM은 한 번에 최대 500개 토큰 지원
-        batch_size = 500
-        total_success = 0
-        total_failure = 0
-        
-        for i in range(0, len(tokens), batch_size):
-            batch_tokens = tokens[i:i + batch_size]
-            
-            message = messaging.MulticastMessage(
-                notification=messaging.Notification(
-                    title=f"[{category}] 새 공지",
-                    body=title,
-                ),
-                data={
-                    'notice_id': notice_id,
-                    'category': category,
-                    'type': 'notice',
-                },
-                tokens=batch_tokens,
-            )
-            
-            try:
-                response = messaging.send_multicast(message)
-                total_success += response.success_count
-                total_failure += response.failure_count
-                
-                # 실패한 토큰 처리 (선택사항)
-                if response.failure_count > 0:
-                    failed_tokens = [
-                        batch_tokens[idx] for idx, resp in enumerate(response.responses)
-                        if not resp.success
-                    ]
-                    print(f"⚠️ 실패한 토큰 {len(failed_tokens)}개")
-                    # TODO: 실패한 토큰을 DB에서 제거하는 로직 추가 가능
-                    
-            except Exception as e:
-                print(f"❌ 배치 발송 실패: {e}")
-                total_failure += len(batch_tokens)
-        
-        print(f"✅ 푸시 발송 완료: 성공 {total_success}/{len(tokens)}")
-        
-        # 4. 플래그 초기화 및 발송 기록
-        db.collection('notices').document(notice_id).update({
+    except Exception as e:
+        # 임대가 만료되면 다른 워커(또는 다음 안전 확인)가 다시 시도
+        print(f"❌ 푸시 발송 오류: {e}")
+        return
+
+    for notice_id, data in job.items:
+        latency = slo.record(job.priority, data.get('push_requested_at')) if slo else None
+        updates = {
             'push_requested': False,
             'push_sent_at': firestore.SERVER_TIMESTAMP,
-            'push_recipient_count': total_success,
-        })
-        
+            'push_priority': job.priority,
+            **fields,
+        }
+        if latency is not None:
+            updates['push_latency_ms'] = int(latency * 1000)
+        # 크롤러가 자동으로 요청한 공지: 발견 -> 알림 시간
+        discovery_ms = discovery_latency_ms(data)
+        if discovery_ms is not None:
+            updates['push_discovery_latency_ms'] = discovery_ms
+            print(f"   ⏱️ 발견 -> 알림 {discovery_ms / 1000:.1f}초 ({notice_id})")
+        try:
+            finish_notice(notice_id, worker_id, updates)
+        except Exception as e:
+            print(f"❌ 발송 기록 실패 ({notice_id}): {e}")
+
+def send_push_for_notice(notice_id, worker_id=None):
+    """특정 공지에 대한 푸시 알림 바로 발송 (공지를 선점한 워커만 발송, 우선순위 큐 거치지 않음)"""
+    worker_id = worker_id or WORKER_ID
+    try:
+        # 1. 공지 선점 (다른 워커가 임대 중이거나 이미 발송된 공지는 건너뜀)
+        notice_data = claim_notice(db, notice_id, worker_id)
     except Exception as e:
         print(f"❌ 푸시 발송 오류: {e}")
+        return
+    if notice_data is None:
+        print(f"⏭️ 공지 {notice_id}: 없음/발송 완료/다른 워커 처리 중")
+        return
+    deliver_job(PushJob(notice_priority(notice_data), notice_data.get('category', '전체'),
+                        [(notice_id, notice_data)]), worker_id)
 
-def monitor_push_requests():
-    """push_requested가 true인 공지 감지 및 발송"""
+def monitor_push_requests(stop_event=None):
+    """push_requested가 true인 공지를 실시간 구독으로 감지해서 우선순위대로 발송 (끊기면 폴링으로 대체)"""
     print("🚀 푸시 알림 모니터링 시작...")
-    print("   - 10초마다 push_requested=true 공지 확인")
+    print("   - push_requested=true 공지를 실시간 구독 (구독이 끊기면 10초마다 폴링)")
+    print(f"   - 워커 ID: {WORKER_ID} (여러 프로세스 실행 가능, 공지는 선점한 워커만 발송)")
+    print(f"   - 긴급 > 중요 > 일반 순서로 발송, 일반 공지는 {DIGEST_WINDOW}초 동안 카테고리별로 묶음")
     print("   - Ctrl+C로 종료\n")
-    
+
+    scheduler = PushScheduler()
+    slo = SloTracker()
+
+    def on_request(notice_id):
+        # 선점만 하고 우선순위 큐에 넣음 (임대 시간은 요약 대기 시간 + 발송 시간보다 길어야 함)
+        # 선점 기록 자체도 스냅샷 변경으로 다시 들어오므로 이미 대기 중이면 건너뜀
+        if notice_id in scheduler:
+            return
+        notice_data = claim_notice(db, notice_id, WORKER_ID)
+        if notice_data is None or not scheduler.submit(notice_id, notice_data):
+            return
+        print(f"\n🔔 푸시 요청 감지: {notice_id} ({notice_priority(notice_data)})")
+
+    watcher = PushRequestWatcher(
+        db.collection('notices').where('push_requested', '==', True),
+        on_request,
+        poll_interval=10,
+        safety_interval=LEASE_SECONDS,  # 죽은 워커의 임대가 만료되면 이 주기 안에 다시 가져감
+    )
+    if delivery_mode() == 'topic':
+        # 시작 시 reconcile로 전체를 맞춘 뒤, 알림 설정/토큰 변경을 바로 토픽 구독에 반영
+        listener = SubscriptionManager(db, messaging).start()
+    else:
+        # 수신 인덱스를 메모리에 올리고 users 변경을 받아 갱신 (인덱스가 없으면 한 번 생성)
+        if not recipient_index.load(db):
+            rebuild(db)
+            recipient_index.load(db)
+        listener = IndexMaintainer(db, recipient_index).start()
+
+    stop_event = stop_event or threading.Event()
+    sent = 0
     try:
-        while True:
-            # push_requested가 true인 공지 찾기
-            notices = db.collection('notices').where('push_requested', '==', True).stream()
-            
-            for notice in notices:
-                print(f"\n🔔 푸시 요청 감지: {notice.id}")
-                send_push_for_notice(notice.id)
-            
-            time.sleep(10)  # 10초마다 체크
-            
+        while not stop_event.is_set():
+            # 들어와 있는 요청을 모두 큐에 넣은 뒤 가장 급한 것부터 발송
+            while watcher.step(timeout=0):
+                pass
+            job = scheduler.next_job()
+            if job:
+                deliver_job(job, WORKER_ID, slo)
+                sent += 1
+                if sent % 20 == 0:
+                    print(f"📈 우선순위별 지연(초): {slo.summary()}")
+                continue
+            wait = scheduler.seconds_until_ready()
+            watcher.step(timeout=watcher.check_interval if wait is None else min(wait, watcher.check_interval))
     except KeyboardInterrupt:
-        print("\n\n⏹️ 모니터링 종료")
+        pass
+    finally:
+        # 모으는 중인 요약은 임대가 끝나기 전에 보내고 종료
+        job = scheduler.next_job(force=True)
+        while job:
+            deliver_job(job, WORKER_ID, slo)
+            job = scheduler.next_job(force=True)
+        print(f"\n\n⏹️ 모니터링 종료 ({watcher.stats}, {scheduler.stats})")
+        print(f"📈 우선순위별 지연(초): {slo.summary()}")
+        watcher.close()
+        listener.stop()
 
 if __name__ == "__main__":
     monitor_push_requests()
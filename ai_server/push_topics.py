@@ -0,0 +1,243 @@
+import argparse
+import os
+from datetime import datetime, timezone
+
+# ==========================================
+# 카테고리별 FCM 토픽 구독 관리
+# ==========================================
+# 공지마다 users 전체를 읽어 토큰 목록을 만드는 대신, 사용자의 토큰을
+# 알림 설정에 맞는 카테고리 토픽에 미리 구독시켜 두고 푸시는 토픽 한 번으로 보냄.
+# - users 변경(토큰/알림 설정/isPushEnabled)을 on_snapshot으로 받아 바로 구독/해지
+# - 실제로 구독시킨 내역은 push_subscriptions/{uid}에 기록 (FCM은 구독 목록 조회 API가 없음)
+# - reconcile()이 users와 기록을 비교해 어긋난 구독을 바로잡음 (--full이면 전체 재구독)
+#
+# PUSH_DELIVERY_MODE=topic 일 때 push_sender가 토픽 발송을 사용함 (기본: tokens)
+
+SUBSCRIPTION_COLLECTION = 'push_subscriptions'
+
+# FCM 토픽 이름은 [a-zA-Z0-9-_.~%]만 가능하므로 카테고리별 ASCII 이름 사용
+CATEGORY_TOPICS = {
+    '학사': 'notice_academic',
+    '장학': 'notice_scholarship',
+    '취업': 'notice_career',
+    '외부행사': 'notice_external',
+    '학과행사': 'notice_department',
+    '공모전': 'notice_contest',
+}
+FCM_TOPIC_BATCH = 1000   # subscribe_to_topic 한 번에 보낼 수 있는 최대 토큰 수
+
+
+def delivery_mode():
+    return os.environ.get('PUSH_DELIVERY_MODE', 'tokens')
+
+
+def topic_for_category(category):
+    return CATEGORY_TOPICS.get(category)
+
+
+def enabled_categories(user_data):
+    """사용자 문서 -> 알림을 받는 카테고리 집합 (push_sender의 카테고리 필터와 같은 규칙, 기본값 True)"""
+    if not user_data or not user_data.get('isPushEnabled') or not user_data.get('fcm_token'):
+        return set()
+    settings = user_data.get('notification_settings') or {}
+    return {category for category in CATEGORY_TOPICS if settings.get(category, True)}
+
+
+def desired_topics(user_data):
+    """사용자 문서 -> 구독해야 할 토픽 집합"""
+    return {CATEGORY_TOPICS[category] for category in enabled_categories(user_data)}
+
+
+def plan_user(user_data, record):
+    """
+    (토큰, 구독할 토픽, 해지할 토픽, 해지 대상 토큰) 계산
+    토큰이 바뀌었으면 예전 토큰은 기록된 모든 토픽에서 해지하고 새 토큰은 전부 구독
+    """
+    record = record or {}
+    token = (user_data or {}).get('fcm_token')
+    wanted = desired_topics(user_data)
+    old_token = record.get('token')
+    old_topics = set(record.get('topics', []))
+
+    if old_token and old_token != token:
+        return token, wanted, old_topics, old_token
+    return token, wanted - old_topics, old_topics - wanted, old_token
+
+
+def _apply(messaging, ops, report):
+    """ops: {(topic, 'subscribe'|'unsubscribe'): [tokens]} -> 토픽별로 최대 1000개씩 요청"""
+    for (topic, action), tokens in ops.items():
+        call = messaging.subscribe_to_topic if action == 'subscribe' else messaging.unsubscribe_from_topic
+        for start in range(0, len(tokens), FCM_TOPIC_BATCH):
+            chunk = tokens[start:start + FCM_TOPIC_BATCH]
+            try:
+                response = call(chunk, topic)
+                report[f'{action}d'] += response.success_count
+                report['errors'] += response.failure_count
+            except Exception as e:
+                print(f"   ❌ 토픽 {action} 실패 ({topic}, {len(chunk)}개): {e}")
+                report['errors'] += len(chunk)
+
+
+def _new_report():
+    return {'users': 0, 'subscribed': 0, 'unsubscribed': 0, 'errors': 0}
+
+
+def sync_user(db, messaging, uid, user_data):
+    """사용자 한 명의 토픽 구독을 현재 설정에 맞춤 (users 리스너에서 호출)"""
+    ref = db.collection(SUBSCRIPTION_COLLECTION).document(uid)
+    snapshot = ref.get()
+    record = snapshot.to_dict() if snapshot.exists else {}
+    token, subscribe, unsubscribe, old_token = plan_user(user_data, record)
+
+    report = _new_report()
+    report['users'] = 1
+    if not subscribe and not unsubscribe and record.get('token') == token:
+        return report
+    ops = {}
+    for topic in unsubscribe:
+        ops.setdefault((topic, 'unsubscribe'), []).append(old_token)
+    for topic in subscribe:
+        ops.setdefault((topic, 'subscribe'), []).append(token)
+    _apply(messaging, ops, report)
+
+    if token and desired_topics(user_data):
+        ref.set({'token': token, 'topics': sorted(desired_topics(user_data)),
+                 'updated_at': datetime.now(timezone.utc)})
+    elif snapshot.exists:
+        ref.delete()
+    return report
+
+
+def reconcile(db, messaging, full=False):
+    """
+    users 전체와 구독 기록을 비교해서 어긋난 구독을 토픽별로 모아 한 번에 처리
+    full=True면 기록과 상관없이 원하는 구독을 전부 다시 보냄 (FCM 쪽에서 빠진 구독 복구)
+    """
+    records = {doc.id: doc.to_dict() for doc in db.collection(SUBSCRIPTION_COLLECTION).stream()}
+    report = _new_report()
+    ops = {}
+    updates = {}
+
+    def add(topic, action, token):
+        ops.setdefault((topic, action), []).append(token)
+
+    for user in db.collection('users').stream():
+        report['users'] += 1
+        user_data = user.to_dict()
+        record = records.pop(user.id, None)
+        token, subscribe, unsubscribe, old_token = plan_user(user_data, None if full else record)
+        if full and record and record.get('token') and record.get('token') != token:
+            for topic in record.get('topics', []):
+                add(topic, 'unsubscribe', record['token'])
+        for topic in unsubscribe:
+            add(topic, 'unsubscribe', old_token)
+        for topic in subscribe:
+            add(topic, 'subscribe', token)
+        wanted = sorted(desired_topics(user_data))
+        if wanted and (full or subscribe or unsubscribe or (record or {}).get('token') != token):
+            updates[user.id] = {'token': token, 'topics': wanted}
+        elif not wanted and record:
+            updates[user.id] = None
+
+    # 기록만 남고 사용자 문서가 없어진 경우 전부 해지
+    for uid, record in records.items():
+        for topic in record.get('topics', []):
+            add(topic, 'unsubscribe', record.get('token'))
+        updates[uid] = None
+
+    _apply(messaging, ops, report)
+
+    now = datetime.now(timezone.utc)
+    batch, pending = db.batch(), 0
+    for uid, record in updates.items():
+        ref = db.collection(SUBSCRIPTION_COLLECTION).document(uid)
+        if record is None:
+            batch.delete(ref)
+        else:
+            batch.set(ref, {**record, 'updated_at': now})
+        pending += 1
+        if pending == 400:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+
+    print(f"🔁 토픽 구독 점검 완료: {report}")
+    return report
+
+
+class SubscriptionManager:
+    """users 컬렉션을 구독해서 바뀐 사용자만 토픽 구독을 갱신"""
+
+    def __init__(self, db, messaging):
+        self.db = db
+        self.messaging = messaging
+        self._watch = None
+        self._initial = True
+        self.report = _new_report()
+
+    def _on_snapshot(self, docs, changes, read_time):
+        if self._initial:
+            # 첫 스냅샷은 전체 사용자라서 개별 동기화 대신 reconcile()로 한 번에 맞춤
+            # (스냅샷 이후에 읽으므로 그 사이 변경도 빠지지 않고, 이후 변경은 아래 증분으로 처리)
+            self._initial = False
+            try:
+                result = reconcile(self.db, self.messaging)
+                for key in ('subscribed', 'unsubscribed', 'errors'):
+                    self.report[key] += result[key]
+            except Exception as e:
+                print(f"   ❌ 초기 토픽 구독 점검 실패: {e}")
+            return
+        for change in changes:
+            data = None if change.type.name == 'REMOVED' else change.document.to_dict()
+            try:
+                result = sync_user(self.db, self.messaging, change.document.id, data)
+                for key in ('subscribed', 'unsubscribed', 'errors'):
+                    self.report[key] += result[key]
+            except Exception as e:
+                print(f"   ❌ 토픽 구독 갱신 실패 ({change.document.id}): {e}")
+
+    def start(self):
+        self._watch = self.db.collection('users').on_snapshot(self._on_snapshot)
+        print("👂 사용자 알림 설정 변경 구독 시작 (토픽 모드)")
+        return self
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+
+def send_topic_message(messaging, category, title, body, data):
+    """카테고리 토픽으로 알림 하나 발송. 메시지 ID 반환 (토픽이 없는 카테고리는 None)"""
+    topic = topic_for_category(category)
+    if not topic:
+        return None
+    message = messaging.Message(
+        notification=messaging.Notification(title=title, body=body),
+        data=data,
+        topic=topic,
+    )
+    return messaging.send(message)
+
+
+def send_to_topic(messaging, notice_id, title, category):
+    """공지 하나를 카테고리 토픽으로 한 번에 발송"""
+    return send_topic_message(messaging, category, f"[{category}] 새 공지", title, {
+        'notice_id': notice_id,
+        'category': category,
+        'type': 'notice',
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="카테고리 FCM 토픽 구독 점검")
+    parser.add_argument('command', choices=['reconcile'])
+    parser.add_argument('--full', action='store_true', help="기록과 상관없이 모든 구독을 다시 보냄")
+    args = parser.parse_args()
+
+    from firebase_admin import messaging
+    from push_sender import db  # Firebase 초기화
+
+    reconcile(db, messaging, full=args.full)
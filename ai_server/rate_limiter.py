@@ -0,0 +1,128 @@
+import threading
+import time
+
+# ==========================================
+# 호스트별 요청 간격 제한
+# ==========================================
+# 여러 게시판을 동시에 크롤링해도 같은 호스트(www.gnu.ac.kr)에는
+# 최소 간격을 두고 요청하도록 모든 워커가 하나의 리미터를 공유함 (403 Too Fast 방지)
+
+
+class HostRateLimiter:
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}  # host -> 다음 요청 가능 시각 (monotonic)
+
+    def wait(self, host):
+        """host에 요청해도 될 때까지 대기. 슬롯은 호출 순서대로 예약됨"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+# ==========================================
+# 분당 요청 예산 (프로세스 전체 공유)
+# ==========================================
+class RequestBudget:
+    """
+    토큰 버킷: 분당 rpm개까지 허용, 최대 burst개까지 몰아서 사용 가능
+    여러 스레드가 같은 예산을 나눠 쓰므로 API 쿼터를 넘기기 전에 스스로 속도를 줄임
+    """
+
+    def __init__(self, rpm, burst=None):
+        self.rate = rpm / 60.0  # 초당 토큰
+        self.capacity = burst or max(int(rpm), 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """토큰 하나를 쓸 수 있을 때까지 대기. timeout 안에 못 얻으면 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+# ==========================================
+# 서킷 브레이커
+# ==========================================
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 open -> cooldown초 동안 요청을 바로 거절
+    cooldown이 지나면 half-open으로 요청 하나만 시험해 보고, 성공하면 closed로 복귀
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, cooldown=300):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def available(self):
+        """상태를 바꾸지 않고 지금 요청을 보낼 수 있는지 (open이어도 cooldown이 지났으면 True)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self._opened_at >= self.cooldown
+            return not (self.state == self.HALF_OPEN and self._probe_in_flight)
+
+    def release(self):
+        """allow()로 받은 half-open 시험 기회를 요청 없이 돌려줌 (다른 브레이커에 막혀 보내지 못했을 때)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, trip=False):
+        """trip=True면 (예: 쿼터 소진 403) 누적 횟수와 상관없이 바로 open"""
+        with self._lock:
+            self.failures += 1
+            if trip or self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+from firebase_admin import firestore
+
+# ==========================================
+# 상세 수집 실패 재시도 큐
+# ==========================================
+# 상세 페이지 수집에 실패한 공지는 crawl_retry_queue/{doc_id}에 시도 횟수와
+# 다음 시도 시각을 기록하고, 크롤링 마지막 단계(drain)에서만 다시 수집함.
+# MAX_ATTEMPTS번 실패하면 crawl_quarantine으로 옮겨 더 이상 시도하지 않음.
+
+RETRY_COLLECTION = 'crawl_retry_queue'
+QUARANTINE_COLLECTION = 'crawl_quarantine'
+
+MAX_ATTEMPTS = 6
+BASE_DELAY = 10 * 60       # 첫 재시도: 10분 후
+MAX_DELAY = 24 * 60 * 60   # 최대 하루 간격
+
+
+def retry_delay(attempts):
+    """attempts번 실패한 뒤 다음 시도까지 대기 시간(초): 10분, 20분, 40분 ... 최대 1일"""
+    return min(BASE_DELAY * (2 ** max(attempts - 1, 0)), MAX_DELAY)
+
+
+def is_detail_failed(detail_data):
+    return bool(detail_data.get('error')) or not detail_data.get('content')
+
+
+def schedule_retry(db, record, error, now=None):
+    """
+    상세 수집 실패 기록. 시도 횟수를 1 늘리고 다음 시도 시각을 정함.
+    한도를 넘으면 격리(quarantine)하고 True 반환
+    """
+    now = now or datetime.now(timezone.utc)
+    ref = db.collection(RETRY_COLLECTION).document(record['doc_id'])
+    snapshot = ref.get()
+    entry = snapshot.to_dict() if snapshot.exists else {}
+
+    attempts = entry.get('attempts', 0) + 1
+    entry.update({
+        'doc_id': record['doc_id'],
+        'board': record['board'],
+        'url': record['url'],
+        'title': record['title'],
+        'attempts': attempts,
+        'last_error': str(error)[:500],
+        'updated_at': now,
+    })
+    entry.setdefault('first_failed_at', now)
+
+    if attempts >= MAX_ATTEMPTS:
+        quarantine(db, entry, now)
+        return True
+
+    entry['next_attempt_at'] = now + timedelta(seconds=retry_delay(attempts))
+    ref.set(entry)
+    return False
+
+
+def enqueue_missing_content(db, record, now=None):
+    """본문 없이 저장된 기존 공지를 바로 시도 가능한 상태로 큐에 넣음 (시도 횟수 증가 없음)"""
+    now = now or datetime.now(timezone.utc)
+    ref = db.collection(RETRY_COLLECTION).document(record['doc_id'])
+    ref.set({
+        'doc_id': record['doc_id'],
+        'board': record['board'],
+        'url': record['url'],
+        'title': record['title'],
+        'attempts': 0,
+        'next_attempt_at': now,
+        'first_failed_at': now,
+        'updated_at': now,
+    }, merge=True)
+    db.collection('notices').document(record['doc_id']).set({'content_pending': True}, merge=True)
+
+
+def quarantine(db, entry, now=None):
+    now = now or datetime.now(timezone.utc)
+    batch = db.batch()
+    batch.set(db.collection(QUARANTINE_COLLECTION).document(entry['doc_id']), {**entry, 'quarantined_at': now})
+    batch.delete(db.collection(RETRY_COLLECTION).document(entry['doc_id']))
+    batch.set(db.collection('notices').document(entry['doc_id']), {
+        'content_pending': False,
+        'content_failed': True,
+    }, merge=True)
+    batch.commit()
+    print(f"   🚫 상세 수집 {entry['attempts']}회 실패 -> 격리: {entry.get('title', '')[:10]}...")
+
+
+def due_entries(db, board_id, now=None, limit=20):
+    """board의 재시도 대상 (next_attempt_at 지난 것, 오래된 순)"""
+    now = now or datetime.now(timezone.utc)
+    # 복합 색인 없이 조회하기 위해 board로만 거르고 시각 비교는 여기서 함 (큐는 작음)
+    docs = db.collection(RETRY_COLLECTION).where('board', '==', board_id).stream()
+    entries = [d.to_dict() for d in docs]
+    due = [e for e in entries if e.get('next_attempt_at') and e['next_attempt_at'] <= now]
+    due.sort(key=lambda e: e['next_attempt_at'])
+    return due[:limit]
+
+
+def drain_retry_queue(db, board_id, fetch_detail, build_update, limit=20):
+    """
+    크롤링 마지막에 실행되는 저우선순위 재시도 단계
+    fetch_detail(url) -> 상세 수집 결과, build_update(entry, detail) -> notices 갱신 필드
+    """
+    entries = due_entries(db, board_id, limit=limit)
+    if not entries:
+        return {'retried': 0, 'recovered': 0, 'quarantined': 0}
+
+    print(f"\n🔁 [{board_id}] 재시도 큐 처리: {len(entries)}건")
+    recovered = 0
+    quarantined = 0
+
+    for entry in entries:
+        detail_data = fetch_detail(entry['url'])
+        if is_detail_failed(detail_data):
+            if schedule_retry(db, entry, detail_data.get('error') or 'empty content'):
+                quarantined += 1
+            continue
+
+        batch = db.batch()
+        batch.set(db.collection('notices').document(entry['doc_id']), {
+            **build_update(entry, detail_data),
+            'content_pending': firestore.DELETE_FIELD,
+        }, merge=True)
+        batch.delete(db.collection(RETRY_COLLECTION).document(entry['doc_id']))
+        batch.commit()
+        recovered += 1
+        print(f"   ✅ 재수집 성공 ({entry['attempts']}회 실패 후): {entry['title'][:10]}...")
+
+    return {'retried': len(entries), 'recovered': recovered, 'quarantined': quarantined}
@@ -1,9 +1,12 @@
+import sys
 from crawler import crawl_gnu_cse
 
 if __name__ == "__main__":
-    print("🚀 Starting full export to Firebase...")
+    # --resume: 중단된 전체 수집을 마지막 체크포인트부터 이어서 진행
+    resume = '--resume' in sys.argv
+    print(f"🚀 Starting full export to Firebase...{' (resume)' if resume else ''}")
     try:
-        crawl_gnu_cse(mode='all', headless=True)
+        crawl_gnu_cse(mode='all', headless=True, resume=resume)
         print("✅ Export completed successfully.")
     except Exception as e:
         print(f"❌ Export failed: {e}")
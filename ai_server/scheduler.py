@@ -0,0 +1,218 @@
+import argparse
+import datetime
+import time
+
+import pytz
+
+# ==========================================
+# 장기 실행 스케줄러 데몬
+# ==========================================
+# cron + run_scrapers.sh 방식은 실행할 때마다 Selenium import, Firebase 초기화,
+# Chrome 실행을 반복함. 이 데몬은 한 프로세스 안에서 클라이언트/브라우저를 유지하고
+# 공지 크롤링은 적응형 주기로, 학식/자정 초기화/DB 정리는 정해진 시각에 실행함.
+
+KST = pytz.timezone("Asia/Seoul")
+
+# 학기 시작 전후 (게시 빈도가 평소보다 높은 시기): (월, 일) 범위
+SEMESTER_START_WINDOWS = [
+    ((2, 15), (3, 20)),
+    ((8, 15), (9, 20)),
+]
+
+# Chrome이 오래 떠 있으면 메모리가 늘어나므로 일정 횟수마다 재시작
+DRIVER_RECYCLE_RUNS = 50
+
+
+def is_semester_start(now):
+    for (start_m, start_d), (end_m, end_d) in SEMESTER_START_WINDOWS:
+        if (start_m, start_d) <= (now.month, now.day) <= (end_m, end_d):
+            return True
+    return False
+
+
+# ==========================================
+# 1. 적응형 폴링 주기
+# ==========================================
+class AdaptivePollInterval:
+    """
+    시간대/요일/학기 시작 여부로 기본 주기를 정하고,
+    관측된 게시 빈도(EWMA, 시간당 새 글 수)로 주기를 늘리거나 줄임
+    """
+
+    def __init__(self, min_interval=5 * 60, max_interval=3 * 60 * 60, alpha=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.alpha = alpha
+        self.post_rate = None  # 시간당 새 글 수 (관측 전에는 None)
+
+    def observe(self, new_items, elapsed_seconds):
+        """직전 폴링 이후 elapsed_seconds 동안 new_items개의 새 글이 발견됨"""
+        hours = max(elapsed_seconds, 60) / 3600
+        rate = new_items / hours
+        if self.post_rate is None:
+            self.post_rate = rate
+        else:
+            self.post_rate = self.alpha * rate + (1 - self.alpha) * self.post_rate
+
+    def base_interval(self, now):
+        if now.hour < 7:
+            return 2 * 60 * 60  # 새벽
+        if now.weekday() >= 5:
+            return 60 * 60  # 주말
+        if 9 <= now.hour < 18:
+            # 평일 업무 시간 (학기 시작 시기엔 더 자주)
+            return 8 * 60 if is_semester_start(now) else 15 * 60
+        return 45 * 60  # 평일 아침/저녁
+
+    def next_interval(self, now):
+        interval = self.base_interval(now)
+        if self.post_rate is not None:
+            # 한 번 폴링할 때 새 글이 1개 정도 잡히도록 0.5~2배 범위에서 보정
+            expected = self.post_rate * interval / 3600
+            factor = 1.0 / expected if expected > 0 else 2.0
+            interval *= min(max(factor, 0.5), 2.0)
+        return int(min(max(interval, self.min_interval), self.max_interval))
+
+
+# ==========================================
+# 2. 정시 작업
+# ==========================================
+class TimedTask:
+    """
+    매일 (또는 매월 day일) KST hour:minute에 한 번 실행되는 작업
+    catch_up=False면 데몬 시작 시점에 이미 지난 오늘 실행분은 건너뜀
+    (예: 오전에 재시작했다고 일일 조회수를 다시 0으로 만들면 안 됨)
+    """
+
+    def __init__(self, name, func, hour, minute=0, day=None, catch_up=False):
+        self.name = name
+        self.func = func
+        self.hour = hour
+        self.minute = minute
+        self.day = day
+        self.catch_up = catch_up
+        self.last_run_key = None
+
+    def _period_key(self, now):
+        if self.day is not None:
+            return now.strftime("%Y-%m")
+        return now.strftime("%Y-%m-%d")
+
+    def scheduled_time(self, now):
+        if self.day is not None:
+            return now.replace(day=self.day, hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        return now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+
+    def prime(self, now):
+        if not self.catch_up and now >= self.scheduled_time(now):
+            self.last_run_key = self._period_key(now)
+
+    def is_due(self, now):
+        return self._period_key(now) != self.last_run_key and now >= self.scheduled_time(now)
+
+    def seconds_until_due(self, now):
+        if self.is_due(now):
+            return 0
+        target = self.scheduled_time(now)
+        if target <= now:
+            # 이번 주기 실행분은 끝남 -> 다음 날(또는 다음 달)
+            if self.day is not None:
+                year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+                target = target.replace(year=year, month=month)
+            else:
+                target = target + datetime.timedelta(days=1)
+        return (target - now).total_seconds()
+
+    def run(self, now):
+        self.last_run_key = self._period_key(now)
+        print(f"\n⏰ [{self.name}] 실행: {now.strftime('%Y-%m-%d %H:%M')}")
+        try:
+            self.func()
+        except Exception as e:
+            print(f"❌ [{self.name}] 실패: {e}")
+
+
+# ==========================================
+# 3. 데몬 루프
+# ==========================================
+def run_scheduler(headless=True, once=False):
+    # 무거운 모듈/Firebase 초기화는 데몬 시작 시 한 번만
+    import crawler
+    import cafeteria_scraper
+    import db_maintenance
+    import db_cleanup
+    import push_topics
+
+    tasks = [
+        TimedTask("자정 조회수 초기화", crawler.reset_daily_views, hour=0, minute=0),
+        TimedTask("학식 수집", cafeteria_scraper.scrape_and_save_menu, hour=0, minute=5, catch_up=True),
+        TimedTask("DB 정리 (공지/식단)", lambda: (db_maintenance.delete_old_notices(days_to_keep=1095),
+                                             db_maintenance.delete_old_menus(days_to_keep=7)), hour=9),
+        TimedTask("월간 DB 정리", db_cleanup.cleanup_old_data, hour=3, day=1),
+    ]
+    if push_topics.delivery_mode() == 'topic':
+        from firebase_admin import messaging
+        tasks.append(TimedTask("토픽 구독 점검", lambda: push_topics.reconcile(crawler.db, messaging), hour=4, minute=30))
+    poll = AdaptivePollInterval()
+
+    now = datetime.datetime.now(KST)
+    for task in tasks:
+        task.prime(now)
+
+    pool = crawler.DriverPool(headless)  # Chrome 드라이버 (크롤링 사이에도 유지)
+    crawl_runs = 0
+    last_crawl_at = None
+    next_crawl_at = now
+
+    print("🚀 스케줄러 데몬 시작 (Ctrl+C로 종료)")
+    try:
+        while True:
+            now = datetime.datetime.now(KST)
+
+            for task in tasks:
+                if task.is_due(now):
+                    task.run(now)
+
+            if now >= next_crawl_at:
+                try:
+                    new_items = crawler.crawl_all_boards(mode='recent', headless=headless, pool=pool)
+                    crawl_runs += 1
+                except Exception as e:
+                    print(f"❌ 크롤링 실패 (드라이버 재시작): {e}")
+                    new_items = 0
+                    crawl_runs = DRIVER_RECYCLE_RUNS
+
+                if crawl_runs >= DRIVER_RECYCLE_RUNS:
+                    pool.close()
+                    crawl_runs = 0
+
+                now = datetime.datetime.now(KST)
+                if last_crawl_at is not None:
+                    poll.observe(new_items, (now - last_crawl_at).total_seconds())
+                last_crawl_at = now
+                interval = poll.next_interval(now)
+                next_crawl_at = now + datetime.timedelta(seconds=interval)
+                rate = f"{poll.post_rate:.2f}/h" if poll.post_rate is not None else "-"
+                print(f"💤 다음 크롤링: {next_crawl_at.strftime('%H:%M:%S')} ({interval // 60}분 후, 게시 빈도 {rate})")
+
+            if once:
+                break
+
+            now = datetime.datetime.now(KST)
+            wait = min([(next_crawl_at - now).total_seconds()] + [t.seconds_until_due(now) for t in tasks])
+            # 시스템 시간 변경/절전 복귀에 대비해 최대 60초 단위로 깨어남
+            time.sleep(min(max(wait, 1), 60))
+
+    except KeyboardInterrupt:
+        print("\n⏹️ 스케줄러 종료")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공지/학식/DB 정리 스케줄러 데몬")
+    parser.add_argument('--once', action='store_true', help="크롤링과 밀린 작업을 한 번만 실행하고 종료")
+    parser.add_argument('--no-headless', action='store_true', help="브라우저 창 표시")
+    args = parser.parse_args()
+
+    run_scheduler(headless=not args.no_headless, once=args.once)
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from auto_push import DEFAULT_RULES, AutoPushPolicy, discovery_latency_ms, load_rules, parse_notice_date
+
+TODAY = date(2026, 3, 2)
+
+
+def new_notice(title='일반 안내', date_str='2026.03.02', pinned=False, important=False, urgent=False,
+               category='학사', board='cse'):
+    record = {'doc_id': title, 'title': title, 'date': date_str, 'is_pinned': pinned}
+    doc = {'title': title, 'date': date_str, 'category': category, 'board': board,
+           'is_important': important or pinned, 'is_urgent': urgent}
+    return record, doc
+
+
+def rules(**overrides):
+    return {**DEFAULT_RULES, **overrides}
+
+
+class TestAutoPushPolicy(unittest.TestCase):
+    def test_pinned_and_important_notices_are_requested(self):
+        policy = AutoPushPolicy(rules())
+        record, doc = new_notice('학과 행사 안내', pinned=True)
+        self.assertEqual(policy.apply(record, doc, today=TODAY), 'pinned')
+        self.assertTrue(doc['push_requested'])
+        self.assertEqual(doc['push_source'], 'crawler')
+
+        record, doc = new_notice('2026-1 수강신청 안내', important=True)
+        self.assertEqual(policy.apply(record, doc, today=TODAY), 'important')
+
+    def test_ordinary_notice_is_left_alone(self):
+        record, doc = new_notice()
+        self.assertIsNone(AutoPushPolicy(rules()).apply(record, doc, today=TODAY))
+        self.assertNotIn('push_requested', doc)
+
+    def test_urgent_takes_precedence(self):
+        record, doc = new_notice('장학금 신청 ~3.5', important=True, urgent=True)
+        self.assertEqual(AutoPushPolicy(rules()).decide(record, doc, today=TODAY), 'urgent')
+
+    def test_extra_keywords_and_filters(self):
+        policy = AutoPushPolicy(rules(keywords=['해커톤'], categories=['공모전']))
+        record, doc = new_notice('교내 해커톤 참가자 모집', category='공모전')
+        self.assertEqual(policy.decide(record, doc, today=TODAY), 'keyword')
+        record, doc = new_notice('교내 해커톤 결과', category='학사')
+        self.assertIsNone(policy.decide(record, doc, today=TODAY))
+
+    def test_backfill_mode_never_requests(self):
+        record, doc = new_notice(pinned=True)
+        policy = AutoPushPolicy(rules(), mode='all')
+        self.assertFalse(policy.active)
+        self.assertIsNone(policy.apply(record, doc, today=TODAY))
+
+    def test_old_or_undated_notices_are_skipped(self):
+        policy = AutoPushPolicy(rules(max_age_days=3))
+        record, doc = new_notice(pinned=True, date_str='2026.02.20')
+        self.assertIsNone(policy.decide(record, doc, today=TODAY))
+        record, doc = new_notice('날짜 없음', pinned=True, date_str='')
+        self.assertIsNone(policy.decide(record, doc, today=TODAY))
+        self.assertEqual(policy.summary()['old'], 2)
+
+    def test_per_run_limit(self):
+        policy = AutoPushPolicy(rules(max_per_run=2))
+        results = [policy.decide(*new_notice(f'고정 {i}', pinned=True), today=TODAY) for i in range(4)]
+        self.assertEqual(results.count('pinned'), 2)
+        self.assertEqual(policy.summary(), {'requested': 2, 'old': 0, 'limit': 2, 'pending': 0})
+
+    def test_failed_detail_scrape_is_not_pushed(self):
+        policy = AutoPushPolicy(rules())
+        record, doc = new_notice('장학금 신청 ~3.5', important=True, urgent=True)
+        doc['content_pending'] = True   # 상세 수집 실패로 본문 없이 저장되는 공지
+        self.assertIsNone(policy.apply(record, doc, today=TODAY))
+        self.assertNotIn('push_requested', doc)
+        self.assertEqual(policy.summary()['pending'], 1)
+
+
+class TestRulesAndLatency(unittest.TestCase):
+    def test_load_rules_merges_defaults_and_env_switch(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump({'max_per_run': 3}, f)
+        try:
+            loaded = load_rules(f.name)
+            self.assertEqual(loaded['max_per_run'], 3)
+            self.assertTrue(loaded['pinned'])
+            os.environ['AUTO_PUSH'] = 'off'
+            self.assertFalse(load_rules(f.name)['enabled'])
+        finally:
+            os.environ.pop('AUTO_PUSH', None)
+            os.unlink(f.name)
+
+    def test_parse_notice_date(self):
+        self.assertEqual(parse_notice_date('2026.03.02'), TODAY)
+        self.assertEqual(parse_notice_date('2026-03-02 10:00'), TODAY)
+        self.assertIsNone(parse_notice_date('공지'))
+
+    def test_discovery_latency(self):
+        found = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+        self.assertEqual(discovery_latency_ms({'discovered_at': found}, found + timedelta(seconds=4.5)), 4500)
+        self.assertIsNone(discovery_latency_ms({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,18 @@ import unittest
 from unittest.mock import patch, MagicMock
 import time
 from gemini_classifier import classify_notice_with_gemini
+from gemini_client import RETRY_DELAY
 
 class TestBackoff(unittest.TestCase):
-    @patch('requests.post')
+    def setUp(self):
+        # 분류 캐시에 남은 결과 때문에 API 호출이 생략되지 않도록 캐시 비활성화
+        # (로컬 분류 모델이 학습되어 있어도 API 경로를 타도록 로컬 분류도 끔)
+        for target in ('gemini_classifier.get_cache', 'gemini_classifier.local_category'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch('requests.Session.request')
     @patch('time.sleep')
     def test_backoff_logic(self, mock_sleep, mock_post):
         # Setup mock to fail with 429 twice, then succeed
@@ -29,14 +38,12 @@ class TestBackoff(unittest.TestCase):
         self.assertEqual(mock_post.call_count, 3)
         
         # Check sleep calls
-        # Expected waits: 15, 30
+        # GeminiClient 지수 백오프: RETRY_DELAY(2초) -> 4초 (분당 예산 대기 sleep은 제외)
+        schedule = [RETRY_DELAY * 2 ** n for n in range(3)]
         calls = mock_sleep.call_args_list
-        # We might have other sleeps (like 1 sec for other errors), but here we expect backoff
-        # Filter for our backoff values
-        backoff_waits = [args[0] for args, _ in calls if args[0] >= 15]
+        backoff_waits = [args[0] for args, _ in calls if args[0] in schedule]
         print(f"Sleep calls: {backoff_waits}")
-        self.assertIn(15, backoff_waits)
-        self.assertIn(30, backoff_waits)
+        self.assertEqual(backoff_waits, [RETRY_DELAY, RETRY_DELAY * 2])
 
 if __name__ == '__main__':
     unittest.main()
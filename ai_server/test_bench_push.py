@@ -0,0 +1,26 @@
+import contextlib
+import io
+import unittest
+
+from bench_push import run_benchmark
+
+
+class TestBenchPush(unittest.TestCase):
+    def test_modes_send_and_index_cuts_reads(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_benchmark([300], latency=0.0, dead_rate=0.05)
+        by_mode = {r['mode']: r for r in results}
+
+        self.assertTrue(all(r['sent'] for r in results))
+        self.assertGreater(by_mode['scan']['reads'], 250)
+        self.assertLess(by_mode['cold']['reads'], 40)   # 샤드 8개 + 토큰 정리 쿼리
+        self.assertLess(by_mode['warm']['reads'], by_mode['cold']['reads'])
+        self.assertEqual(by_mode['topic']['requests'], 1)
+        self.assertGreater(by_mode['warm']['pruned'], 0)
+        # 조회 방식과 상관없이 같은 수신자
+        self.assertEqual(by_mode['scan']['recipients'] + by_mode['scan']['pruned'],
+                         by_mode['warm']['recipients'] + by_mode['warm']['pruned'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import patch
+
+from boards import load_boards, get_board, list_url, detail_url, notice_doc_id, DEFAULT_SELECTORS
+from rate_limiter import HostRateLimiter
+
+
+class TestBoards(unittest.TestCase):
+    def test_default_board_keeps_legacy_urls_and_ids(self):
+        board = get_board('cse')
+        self.assertEqual(list_url(board), "https://www.gnu.ac.kr/cse/na/ntt/selectNttList.do?mi=17093&bbsId=4753")
+        self.assertEqual(detail_url(board, "123"),
+                         "https://www.gnu.ac.kr/cse/na/ntt/selectNttInfo.do?mi=17093&bbsId=4753&nttSn=123")
+        self.assertEqual(notice_doc_id(board, "123"), "123")
+
+    def test_namespaced_board_ids_do_not_collide(self):
+        board = get_board('gnu')
+        self.assertEqual(notice_doc_id(board, "123"), "gnu_123")
+
+    def test_selectors_filled_with_defaults(self):
+        for board in load_boards(only_enabled=False):
+            for key in DEFAULT_SELECTORS:
+                self.assertIn(key, board['selectors'])
+
+    def test_disabled_boards_skipped(self):
+        ids = [b['id'] for b in load_boards()]
+        self.assertIn('cse', ids)
+        self.assertNotIn('gnu', ids)
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    @patch('rate_limiter.time.sleep')
+    @patch('rate_limiter.time.monotonic', return_value=100.0)
+    def test_same_host_is_spaced(self, mock_monotonic, mock_sleep):
+        limiter = HostRateLimiter(min_interval=1.0)
+        self.assertEqual(limiter.wait("a.com"), 0)
+        self.assertEqual(limiter.wait("a.com"), 1.0)
+        self.assertEqual(limiter.wait("a.com"), 2.0)
+        # 다른 호스트는 독립적
+        self.assertEqual(limiter.wait("b.com"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
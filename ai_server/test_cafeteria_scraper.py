@@ -0,0 +1,156 @@
+import datetime
+import threading
+import time
+import unittest
+
+import requests
+
+from cafeteria_scraper import (fetch_all_menus, load_cafeterias, make_session, menu_hash, parse_menu_table,
+                               save_menus, target_weeks, week_start_of)
+from fake_firestore import FakeFirestore
+
+MONDAY = datetime.date(2026, 3, 2)
+
+WEEK_HTML = """
+<div class="cal_box"><table>
+  <thead><tr><th>구분</th><th>월 2026.03.02</th><th>화 2026.03.03</th></tr></thead>
+  <tbody>
+    <tr><th>중식</th><td>김치찌개<br/>쌀밥</td><td>돈까스</td></tr>
+    <tr><th>석식</th><td>비빔밥</td><td></td></tr>
+    <tr><th>알레르기 정보</th><td>5.대두<br/>9.돼지고기</td><td>6.밀</td></tr>
+  </tbody>
+</table></div>
+"""
+
+CONFIG = {'base_url': 'http://stub.local/menu', 'mi': '1341'}
+
+
+def day(meal, *dishes):
+    return {'text': f"[{meal}]\n" + "\n".join(dishes), 'slots': [{'meal': meal, 'dishes': list(dishes)}],
+            'allergens': []}
+
+
+def cafe(name, seq, timeout=(1, 2)):
+    return {'name': name, 'seq': seq, 'sysId': 'main', 'timeout': timeout}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """restSeq별 지연/오류를 흉내내는 세션"""
+
+    def __init__(self, delays, errors=()):
+        self.delays = delays
+        self.errors = set(errors)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.calls.append((params['restSeq'], params['schDt'], timeout))
+        time.sleep(self.delays.get(params['restSeq'], 0))
+        if params['restSeq'] in self.errors:
+            raise requests.Timeout("read timed out")
+        return FakeResponse(WEEK_HTML)
+
+
+class TestParseMenuTable(unittest.TestCase):
+    def test_slots_and_allergens_per_day(self):
+        menus = parse_menu_table(WEEK_HTML, '중앙식당', MONDAY)
+        monday = menus['2026-03-02']
+        self.assertEqual(monday['slots'], [{'meal': '중식', 'dishes': ['김치찌개', '쌀밥']},
+                                           {'meal': '석식', 'dishes': ['비빔밥']}])
+        self.assertEqual(monday['allergens'], ['5.대두', '9.돼지고기'])
+        self.assertEqual(menus['2026-03-03']['slots'], [{'meal': '중식', 'dishes': ['돈까스']}])
+
+    def test_legacy_text_keeps_old_format(self):
+        menus = parse_menu_table(WEEK_HTML, '중앙식당', MONDAY)
+        self.assertEqual(menus['2026-03-02']['text'],
+                         "[중식]\n김치찌개\n쌀밥\n\n[석식]\n비빔밥\n\n[알레르기 정보]\n5.대두\n9.돼지고기")
+
+    def test_missing_table(self):
+        self.assertEqual(parse_menu_table("<div></div>", '중앙식당', MONDAY), {})
+
+
+class TestFetchAllMenus(unittest.TestCase):
+    def test_cafeterias_fetched_concurrently_and_failures_isolated(self):
+        cafeterias = [cafe('A', '1'), cafe('B', '2'), cafe('C', '3', timeout=(3, 15))]
+        session = FakeSession({'1': 0.2, '2': 0.2, '3': 0.2}, errors={'2'})
+
+        started = time.monotonic()
+        all_menus, report = fetch_all_menus(cafeterias, CONFIG, [MONDAY], session=session)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(set(all_menus['2026-03-02']), {'A', 'C'})
+        self.assertIn('error', report['B 2026-03-02'])
+        self.assertEqual(report['A 2026-03-02']['days'], 2)
+        self.assertIn(('3', '2026-03-02', (3, 15)), session.calls)
+
+    def test_prefetch_requests_every_week(self):
+        weeks = target_weeks(datetime.date(2026, 3, 4), prefetch_weeks=2)
+        self.assertEqual(weeks, [MONDAY, datetime.date(2026, 3, 9), datetime.date(2026, 3, 16)])
+        session = FakeSession({})
+        _, report = fetch_all_menus([cafe('A', '1'), cafe('B', '2')], CONFIG, weeks, session=session)
+        self.assertEqual(len(session.calls), 6)
+        self.assertEqual({c[1] for c in session.calls}, {'2026-03-02', '2026-03-09', '2026-03-16'})
+        self.assertEqual(len(report), 6)
+
+    def test_config_and_session(self):
+        config, cafeterias = load_cafeterias()
+        self.assertTrue(config['base_url'].startswith('https://'))
+        self.assertTrue(all(len(c['timeout']) == 2 for c in cafeterias))
+        adapter = make_session(pool_size=4).get_adapter('https://www.gnu.ac.kr')
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+
+class TestSaveMenus(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.week = {
+            '2026-03-02': {'중앙식당': day('중식', '김치찌개'), '교직원식당': day('중식', '제육')},
+            '2026-03-03': {'중앙식당': day('중식', '돈까스')},
+        }
+
+    def test_week_document_and_day_documents_written(self):
+        stats = save_menus(self.db, self.week)
+        self.assertEqual(stats, {'weeks': 1, 'changed': 2, 'unchanged': 0})
+        week = self.db.dump('cafeteria_weeks')['2026-03-02']
+        self.assertEqual(week['days']['2026-03-03']['menus'], {'중앙식당': "[중식]\n돈까스"})
+        self.assertEqual(week['days']['2026-03-03']['slots'], {'중앙식당': [{'meal': '중식', 'dishes': ['돈까스']}]})
+        self.assertEqual(len(week['days']['2026-03-02']['hash']), 40)
+        day_doc = self.db.dump('cafeteria_menus')['2026-03-02']
+        self.assertEqual(day_doc['menus']['교직원식당'], "[중식]\n제육")
+        self.assertIn('slots', day_doc)
+
+    def test_unchanged_rescrape_costs_no_writes(self):
+        save_menus(self.db, self.week)
+        writes = self.db.writes
+        stats = save_menus(self.db, dict(self.week))
+        self.assertEqual(stats, {'weeks': 0, 'changed': 0, 'unchanged': 2})
+        self.assertEqual(self.db.writes, writes)
+
+    def test_only_changed_day_rewritten_and_failed_cafeteria_kept(self):
+        save_menus(self.db, self.week)
+        # 교직원식당 수집 실패 + 화요일 메뉴 변경
+        stats = save_menus(self.db, {'2026-03-02': {'중앙식당': day('중식', '김치찌개')},
+                                     '2026-03-03': {'중앙식당': day('중식', '치킨까스')}})
+        self.assertEqual(stats['changed'], 1)
+        week = self.db.dump('cafeteria_weeks')['2026-03-02']
+        self.assertEqual(week['days']['2026-03-02']['menus']['교직원식당'], "[중식]\n제육")
+        self.assertEqual(self.db.dump('cafeteria_menus')['2026-03-03']['menus']['중앙식당'], "[중식]\n치킨까스")
+
+    def test_week_start_and_hash_order(self):
+        self.assertEqual(week_start_of('2026-03-08'), '2026-03-02')
+        self.assertEqual(menu_hash({'a': '1', 'b': '2'}), menu_hash({'b': '2', 'a': '1'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
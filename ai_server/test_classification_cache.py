@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from classification_cache import ClassificationCache, normalize_title
+
+
+class TestClassificationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalized_titles_share_entry(self):
+        cache = ClassificationCache(self.path)
+        cache.put("2025학년도  1학기 수강신청 안내", "m:v1", "학사")
+        self.assertEqual(cache.get(" 2025학년도 1학기 수강신청 안내", "m:v1"), "학사")
+        self.assertEqual(normalize_title("ＡＢＣ  공지"), "abc 공지")
+        cache.close()
+
+    def test_version_is_part_of_key(self):
+        cache = ClassificationCache(self.path)
+        cache.put("제목", "m:v1", "학사")
+        self.assertIsNone(cache.get("제목", "m:v2"))
+        self.assertEqual(cache.stats()['misses'], 1)
+        cache.close()
+
+    def test_ttl_expiry(self):
+        cache = ClassificationCache(self.path, ttl=10)
+        with patch('classification_cache.time.time', return_value=1000.0):
+            cache.put("제목", "v", "장학")
+        with patch('classification_cache.time.time', return_value=1005.0):
+            self.assertEqual(cache.get("제목", "v"), "장학")
+        with patch('classification_cache.time.time', return_value=1011.0):
+            self.assertIsNone(cache.get("제목", "v"))
+        self.assertEqual(cache.stats()['entries'], 0)
+        cache.close()
+
+    def test_size_bounded_eviction_keeps_recently_used(self):
+        cache = ClassificationCache(self.path, max_entries=2)
+        with patch('classification_cache.time.time', return_value=1.0):
+            cache.put("a", "v", "학사")
+        with patch('classification_cache.time.time', return_value=2.0):
+            cache.put("b", "v", "학사")
+        with patch('classification_cache.time.time', return_value=3.0):
+            cache.get("a", "v")  # a를 최근 사용으로 갱신
+        with patch('classification_cache.time.time', return_value=4.0):
+            cache.put("c", "v", "학사")
+            self.assertIsNotNone(cache.get("a", "v"))
+            self.assertIsNone(cache.get("b", "v"))
+        self.assertEqual(cache.stats()['entries'], 2)
+        cache.close()
+
+    def test_persists_across_instances(self):
+        ClassificationCache(self.path).put("제목", "v", "취업")
+        self.assertEqual(ClassificationCache(self.path).get("제목", "v"), "취업")
+
+
+    def test_get_any_checks_versions_in_order_and_counts_once(self):
+        cache = ClassificationCache(self.path)
+        cache.put("제목", "b:v1", "취업")
+        self.assertEqual(cache.get_any("제목", ["a:v1", "b:v1"]), "취업")
+        self.assertIsNone(cache.get_any("없는 제목", ["a:v1", "b:v1"]))
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (1, 1))
+        cache.close()
+
+class TestClassifierUsesCache(unittest.TestCase):
+    def test_second_call_skips_api(self):
+        import gemini_classifier
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ClassificationCache(os.path.join(tmp, 'cache.sqlite3'))
+            response = MagicMock(status_code=200)
+            response.json.return_value = {'candidates': [{'content': {'parts': [{'text': '장학'}]}}]}
+            with patch('gemini_classifier.get_cache', return_value=cache), \
+                 patch('gemini_classifier.local_category', return_value=None), \
+                 patch('requests.Session.request', return_value=response) as mock_post:
+                self.assertEqual(gemini_classifier.classify_notice_with_gemini("국가장학금 신청"), "장학")
+                self.assertEqual(gemini_classifier.classify_notice_with_gemini("국가장학금 신청"), "장학")
+            self.assertEqual(mock_post.call_count, 1)
+            self.assertEqual(cache.stats()['hits'], 1)
+            cache.close()
+
+
+    def test_result_cached_under_model_that_answered(self):
+        import gemini_classifier
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ClassificationCache(os.path.join(tmp, 'cache.sqlite3'))
+            with patch('gemini_classifier.get_cache', return_value=cache), \
+                 patch('gemini_classifier.local_category', return_value=None), \
+                 patch('gemini_classifier._generate', return_value=('취업', 'gemini-1.5-flash')):
+                gemini_classifier.classify_notice_with_gemini("삼성전자 채용")
+            self.assertEqual(cache.get("삼성전자 채용", gemini_classifier.cache_version('gemini-1.5-flash')), "취업")
+            self.assertIsNone(cache.get("삼성전자 채용", gemini_classifier.cache_version(gemini_classifier.MODEL_NAME)))
+            cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+
+from evaluate_classifiers import (score, compare, save_results, save_baseline, load_previous, evaluate_backends,
+                                  noisy_answer)
+from fake_gemini import FakeGeminiServer
+from gemini_client import GeminiClient
+from rate_limiter import RequestBudget
+
+TRAIN = [
+    ("2024학년도 국가장학금 신청 안내", "장학"),
+    ("교내 장학생 선발 안내", "장학"),
+    ("삼성전자 신입 채용 공고", "취업"),
+    ("LG전자 인턴 채용", "취업"),
+    ("2024학년도 1학기 수강신청 안내", "학사"),
+    ("졸업논문 제출 안내", "학사"),
+]
+TEST = [
+    ("2026학년도 국가장학금 신청 안내", "장학"),
+    ("현대자동차 신입 채용 공고", "취업"),
+    ("2026학년도 2학기 수강신청 안내", "학사"),
+]
+
+
+class TestScore(unittest.TestCase):
+    def test_precision_recall_and_confusion(self):
+        result = score(["장학", "장학", "취업", "학사"], ["장학", "취업", "취업", None],
+                       [0.001, 0.002, 0.003, 0.004], elapsed=0.01)
+        self.assertEqual(result['accuracy'], 0.5)
+        self.assertEqual(result['coverage'], 0.75)
+        self.assertEqual(result['titles_per_sec'], 400.0)
+        self.assertEqual(result['p95_ms'], 4.0)
+        self.assertEqual(result['per_category']['장학'], {'precision': 1.0, 'recall': 0.5, 'f1': 0.667, 'support': 2})
+        self.assertEqual(result['per_category']['취업']['precision'], 0.5)
+        self.assertEqual(result['confusion']['장학']['취업'], 1)
+        self.assertEqual(result['confusion']['학사']['보류'], 1)
+
+
+class TestCompareAndSave(unittest.TestCase):
+    def test_flags_accuracy_drop_and_latency_increase(self):
+        before = {'local': {'accuracy': 0.9, 'p95_ms': 1.0}, 'keyword': {'accuracy': 0.8, 'p95_ms': 1.0}}
+        after = {'local': {'accuracy': 0.85, 'p95_ms': 1.0}, 'keyword': {'accuracy': 0.8, 'p95_ms': 1.5},
+                 'gemini': {'accuracy': 0.5, 'p95_ms': 99.0}}
+        regressions = compare(before, after)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('local'))
+        self.assertTrue(regressions[1].startswith('keyword'))
+
+    def test_save_and_load_round_trip_with_history(self):
+        results = {'keyword': score(["장학"], ["장학"], [0.001], 0.001)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path, history = os.path.join(tmp, 'r.json'), os.path.join(tmp, 'h.jsonl')
+            save_results(results, {'data': 'x.csv'}, path, history)
+            save_results(results, {'data': 'x.csv'}, path, history)
+            self.assertEqual(load_previous(path)['keyword']['accuracy'], 1.0)
+            with open(history, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertNotIn('confusion', lines[0]['results']['keyword'])
+
+
+    def test_baseline_holds_summary_only_and_loads_for_compare(self):
+        results = {'keyword': score(["장학"], ["장학"], [0.001], 0.001)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            save_baseline(results, {'data': 'x.csv'}, path)
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            self.assertNotIn('run_at', saved)
+            self.assertNotIn('confusion', saved['results']['keyword'])
+            self.assertEqual(compare(load_previous(path), results), [])
+
+class TestEvaluateBackends(unittest.TestCase):
+    def test_all_backends_against_fake_server(self):
+        labels = dict(TRAIN + TEST)
+        with FakeGeminiServer(answer=noisy_answer(labels, accuracy=1.0)) as server:
+            client = GeminiClient(api_key='', base_url=server.base_url, budget=RequestBudget(rpm=100000))
+            results = evaluate_backends(TRAIN, TEST, client)
+            client.close()
+            self.assertEqual(server.requests['gemini-2.0-flash'], len(TEST) + 1)  # 단건 3 + 배치 1 (cascade는 로컬/족보로 해결)
+
+        self.assertEqual(set(results), {'keyword', 'manual', 'local', 'gemini', 'batch', 'cascade'})
+        self.assertEqual(results['gemini']['accuracy'], 1.0)
+        self.assertEqual(results['batch']['accuracy'], 1.0)
+        # 연도/학기만 다른 두 제목은 족보로 맞히고, 처음 보는 회사 채용 공고는 판단 보류
+        self.assertEqual(results['manual']['coverage'], 0.6667)
+        self.assertEqual(results['manual']['per_category']['장학']['recall'], 1.0)
+        for result in results.values():
+            self.assertEqual(result['samples'], len(TEST))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+import warnings
+from types import SimpleNamespace
+
+from firebase_admin import exceptions, messaging
+
+from fcm_sender import build_multicast, send_multicast_parallel, is_transient
+
+
+class FakeMessaging:
+    """send_each_for_multicast만 흉내내는 messaging 모듈 대역"""
+    MulticastMessage = messaging.MulticastMessage
+    Notification = messaging.Notification
+
+    def __init__(self, latency=0.0, fail=None):
+        self.latency = latency
+        self.fail = fail or (lambda token, attempt: None)   # -> exception 또는 None
+        self.attempts = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def send_each_for_multicast(self, message):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        responses = []
+        for token in message.tokens:
+            with self.lock:
+                self.attempts[token] = self.attempts.get(token, 0) + 1
+                attempt = self.attempts[token]
+            error = self.fail(token, attempt)
+            responses.append(SimpleNamespace(success=error is None, exception=error))
+        return SimpleNamespace(responses=responses)
+
+
+def tokens(n):
+    return [f"tok{i}" for i in range(n)]
+
+
+class TestSendMulticastParallel(unittest.TestCase):
+    def test_chunks_run_concurrently_under_cap(self):
+        fake = FakeMessaging(latency=0.1)
+        started = time.perf_counter()
+        report = send_multicast_parallel(fake, tokens(2000), max_concurrency=4,
+                                         notification=messaging.Notification(title='t', body='b'))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(report['success'], 2000)
+        self.assertEqual(len(report['chunks']), 4)
+        self.assertLessEqual(report['max_in_flight'], 4)
+        self.assertLess(elapsed, 0.3)   # 순차면 0.4초
+
+        fake = FakeMessaging(latency=0.05)
+        report = send_multicast_parallel(fake, tokens(2000), max_concurrency=2)
+        self.assertEqual(report['max_in_flight'], 2)
+
+    def test_transient_failures_are_retried_with_backoff(self):
+        unavailable = exceptions.UnavailableError('busy')
+        fake = FakeMessaging(fail=lambda token, attempt: unavailable if token in ('tok1', 'tok2') and attempt == 1
+                             else None)
+        delays = []
+        report = send_multicast_parallel(fake, tokens(10), retry_delay=0.5, sleep=delays.append)
+        self.assertEqual(report['success'], 10)
+        self.assertEqual(report['retried'], 2)
+        self.assertEqual(delays, [0.5])
+        self.assertEqual(report['chunks'][0]['attempts'], 2)
+        self.assertEqual(fake.calls, 2)
+
+    def test_permanent_failures_are_not_retried(self):
+        dead = messaging.UnregisteredError('gone')
+        fake = FakeMessaging(fail=lambda token, attempt: dead if token == 'tok3' else None)
+        report = send_multicast_parallel(fake, tokens(10), sleep=lambda s: None)
+        self.assertEqual(report['failure'], 1)
+        self.assertEqual(report['failures'], [('tok3', dead)])
+        self.assertEqual(fake.calls, 1)
+
+    def test_retries_stop_after_limit(self):
+        unavailable = exceptions.UnavailableError('busy')
+        fake = FakeMessaging(fail=lambda token, attempt: unavailable)
+        delays = []
+        report = send_multicast_parallel(fake, tokens(3), max_retries=2, retry_delay=1, sleep=delays.append)
+        self.assertEqual(report['failure'], 3)
+        self.assertEqual(delays, [1, 2])
+
+    def test_request_level_errors_are_kept_apart_from_token_failures(self):
+        class DownMessaging(FakeMessaging):
+            def send_each_for_multicast(self, message):
+                raise ConnectionError('connection reset')
+
+        report = send_multicast_parallel(DownMessaging(), tokens(3), max_retries=1, sleep=lambda s: None)
+        self.assertEqual(report['failure'], 3)
+        self.assertEqual(report['failures'], [])
+        self.assertEqual([t for t, _ in report['request_failures']], tokens(3))
+
+    def test_multicast_built_without_tokens_deprecation_warning(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            message = build_multicast(messaging, ['tok0', 'tok1'], data={'k': 'v'})
+        self.assertEqual(message.tokens, ['tok0', 'tok1'])
+        self.assertEqual(caught, [])
+
+    def test_is_transient(self):
+        self.assertTrue(is_transient(exceptions.InternalError('x')))
+        self.assertTrue(is_transient(ConnectionError()))
+        self.assertFalse(is_transient(exceptions.InvalidArgumentError('x')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import gemini_classifier
+from gemini_classifier import parse_batch_categories, classify_notices_with_gemini
+
+
+def gemini_response(text, status=200):
+    response = MagicMock(status_code=status)
+    response.json.return_value = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+    return response
+
+
+class TestParseBatchCategories(unittest.TestCase):
+    def test_valid_array(self):
+        self.assertEqual(parse_batch_categories('["학사", "취업"]', 2), ["학사", "취업"])
+
+    def test_invalid_and_missing_items_are_none(self):
+        self.assertEqual(parse_batch_categories('["학사", "기타"]', 3), ["학사", None, None])
+
+    def test_code_fence_and_object_forms(self):
+        self.assertEqual(parse_batch_categories('```json\n["장학"]\n```', 1), ["장학"])
+        self.assertEqual(parse_batch_categories('{"categories": [{"category": "공모전"}]}', 1), ["공모전"])
+
+    def test_garbage(self):
+        self.assertEqual(parse_batch_categories('학사입니다', 2), [None, None])
+        self.assertEqual(parse_batch_categories(None, 1), [None])
+
+
+class TestClassifyNoticesBatch(unittest.TestCase):
+    def setUp(self):
+        for target in ('gemini_classifier.get_cache', 'gemini_classifier.local_category'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch('requests.Session.request')
+    def test_one_request_per_batch_with_per_item_fallback(self, mock_post):
+        mock_post.return_value = gemini_response(json.dumps(["장학", "없는카테고리"]))
+        titles = ["국가장학금 신청 안내", "삼성전자 신입 채용", "국가장학금 신청 안내"]
+
+        result = classify_notices_with_gemini(titles)
+
+        self.assertEqual(mock_post.call_count, 1)  # 중복 제목은 한 번만 요청
+        body = mock_post.call_args.kwargs['json']
+        self.assertEqual(body['generationConfig']['responseMimeType'], 'application/json')
+        # 두 번째 항목은 유효하지 않아 키워드 분류로 대체
+        self.assertEqual(result, ["장학", gemini_classifier.keyword_fallback("삼성전자 신입 채용"), "장학"])
+
+    @patch('requests.Session.request')
+    def test_splits_into_batches(self, mock_post):
+        mock_post.side_effect = lambda *a, **kw: gemini_response(json.dumps(["학사"] * 2))
+        result = classify_notices_with_gemini([f"제목 {i}" for i in range(5)], batch_size=2)
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(len(result), 5)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_api_failure_falls_back_for_all(self, mock_post, mock_sleep):
+        mock_post.return_value = MagicMock(status_code=500)
+        titles = ["해커톤 참가자 모집", "수강신청 안내"]
+        self.assertEqual(classify_notices_with_gemini(titles),
+                         [gemini_classifier.keyword_fallback(t) for t in titles])
+
+
+if __name__ == '__main__':
+    unittest.main()
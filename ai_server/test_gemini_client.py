@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from check_models import list_models
+from gemini_client import GeminiClient
+from rate_limiter import CircuitBreaker, RequestBudget
+
+
+def gemini_response(text, status=200):
+    response = MagicMock(status_code=status)
+    response.json.return_value = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+    return response
+
+
+def make_client(**kwargs):
+    return GeminiClient(api_key='test-key', base_url='http://stub.local/v1beta',
+                        budget=RequestBudget(rpm=6000), **kwargs)
+
+
+class TestGeminiClient(unittest.TestCase):
+    @patch('requests.Session.request')
+    def test_generate_uses_session_with_timeouts_and_key_header(self, mock_request):
+        mock_request.return_value = gemini_response(" 학사 ")
+        client = make_client(connect_timeout=3, read_timeout=10)
+
+        self.assertEqual(client.generate("prompt", json_output=True), "학사")
+
+        args, kwargs = mock_request.call_args
+        self.assertEqual(args, ('POST', 'http://stub.local/v1beta/models/gemini-2.0-flash:generateContent'))
+        self.assertEqual(kwargs['timeout'], (3, 10))
+        self.assertEqual(kwargs['headers'], {'x-goog-api-key': 'test-key'})
+        self.assertNotIn('key=', args[1])
+        self.assertEqual(kwargs['json']['generationConfig']['responseMimeType'], 'application/json')
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_retries_server_errors_and_timeouts_without_tripping_breaker(self, mock_request, mock_sleep):
+        mock_request.side_effect = [MagicMock(status_code=503), requests.Timeout(), gemini_response("장학")]
+        client = make_client()
+
+        self.assertEqual(client.generate("prompt", model="gemini-test"), "장학")
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [2, 4])
+        self.assertIn('gemini-test', mock_request.call_args.args[1])
+
+        metrics = client.metrics()
+        self.assertEqual(metrics['calls'], 3)
+        self.assertEqual(metrics['retries'], 2)
+        self.assertEqual(metrics['statuses'], {'503': 1, 'timeout': 1, '200': 1})
+        self.assertIn('p95_latency_ms', metrics)
+        self.assertEqual(metrics['breaker_state'], CircuitBreaker.CLOSED)
+
+    @patch('requests.Session.request')
+    def test_403_opens_breaker(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=403)
+        client = make_client()
+        self.assertIsNone(client.generate("a"))
+        self.assertIsNone(client.generate("b"))
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(client.metrics()['breaker_rejects'], 1)
+
+    @patch('requests.Session.request')
+    def test_key_level_403_trips_shared_breaker_even_with_model_breaker(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=403)
+        shared = CircuitBreaker(failure_threshold=3, cooldown=300)
+        client = make_client(breaker=shared)
+
+        self.assertIsNone(client.generate("a", model="m1", breaker=CircuitBreaker(failure_threshold=1)))
+        self.assertEqual(shared.state, CircuitBreaker.OPEN)
+        # 다른 모델의 브레이커가 닫혀 있어도 공용 브레이커가 막음
+        self.assertIsNone(client.generate("b", model="m2", breaker=CircuitBreaker(failure_threshold=1)))
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_failed_half_open_probe_reopens_breaker(self, mock_request, mock_sleep):
+        mock_request.return_value = MagicMock(status_code=500)
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+        client = make_client(breaker=breaker)
+
+        self.assertIsNone(client.generate("probe"))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    @patch('requests.Session.request')
+    def test_list_models_filters_and_follows_pages(self, mock_request):
+        page1 = MagicMock(status_code=200)
+        page1.json.return_value = {
+            'models': [{'name': 'models/a', 'supportedGenerationMethods': ['generateContent']},
+                       {'name': 'models/embed', 'supportedGenerationMethods': ['embedContent']}],
+            'nextPageToken': 'next',
+        }
+        page2 = MagicMock(status_code=200)
+        page2.json.return_value = {'models': [{'name': 'models/b', 'supportedGenerationMethods': ['generateContent']}]}
+        mock_request.side_effect = [page1, page2]
+
+        names = [m['name'] for m in list_models(make_client())]
+        self.assertEqual(names, ['models/a', 'models/b'])
+        self.assertEqual(mock_request.call_args.kwargs['params']['pageToken'], 'next')
+
+    def test_list_models_without_key_does_not_request(self):
+        with patch('requests.Session.request') as mock_request:
+            self.assertEqual(list_models(GeminiClient(api_key='')), [])
+        mock_request.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
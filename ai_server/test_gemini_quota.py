@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import gemini_classifier
+from gemini_classifier import classify_notice_with_gemini, keyword_fallback
+from gemini_client import GeminiClient
+from rate_limiter import CircuitBreaker, RequestBudget
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    @patch('rate_limiter.time.monotonic')
+    def test_opens_after_threshold_and_half_opens_after_cooldown(self, mock_time):
+        mock_time.return_value = 0.0
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        mock_time.return_value = 61.0
+        self.assertTrue(breaker.allow())       # half-open: 시험 요청 하나만
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.trips, 1)
+
+    @patch('rate_limiter.time.monotonic', return_value=0.0)
+    def test_trip_opens_immediately(self, mock_time):
+        breaker = CircuitBreaker(failure_threshold=5, cooldown=60)
+        breaker.record_failure(trip=True)
+        self.assertFalse(breaker.allow())
+
+
+class TestRequestBudget(unittest.TestCase):
+    def test_burst_then_timeout(self):
+        budget = RequestBudget(rpm=60, burst=2)
+        self.assertTrue(budget.acquire(timeout=0))
+        self.assertTrue(budget.acquire(timeout=0))
+        self.assertFalse(budget.acquire(timeout=0.1))  # 다음 토큰은 1초 뒤
+
+
+class TestClassifierQuota(unittest.TestCase):
+    def setUp(self):
+        for target in ('gemini_classifier.get_cache', 'gemini_classifier.local_category'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        client = GeminiClient(api_key='test', budget=RequestBudget(rpm=6000),
+                              breaker=CircuitBreaker(failure_threshold=3, cooldown=300))
+        patcher = patch('gemini_classifier.client', client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('requests.Session.request')
+    def test_403_opens_breaker_for_following_titles(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=403)
+        titles = ["국가장학금 신청 안내", "해커톤 참가자 모집", "수강신청 안내"]
+        results = [classify_notice_with_gemini(t) for t in titles]
+
+        self.assertEqual(mock_post.call_count, 1)  # 403 이후에는 요청하지 않음
+        self.assertEqual(results, [keyword_fallback(t) for t in titles])
+        stats = gemini_classifier.classifier_stats()
+        self.assertEqual(stats['breaker_state'], CircuitBreaker.OPEN)
+        self.assertGreaterEqual(stats['breaker_rejects'], 2)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_repeated_429_stops_retrying(self, mock_post, mock_sleep):
+        mock_post.return_value = MagicMock(status_code=429)
+        classify_notice_with_gemini("제목1")
+        classify_notice_with_gemini("제목2")
+        self.assertEqual(mock_post.call_count, 3)  # 3번째 429에서 브레이커가 열림
+
+
+if __name__ == '__main__':
+    unittest.main()
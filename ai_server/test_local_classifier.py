@@ -0,0 +1,94 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import gemini_classifier
+from local_classifier import NaiveBayesTitleClassifier, evaluate, split_dataset, title_ngrams
+
+SAMPLES = [
+    ("2025학년도 국가장학금 신청 안내", "장학"),
+    ("교내 장학금 신청 공고", "장학"),
+    ("장학생 선발 결과 안내", "장학"),
+    ("삼성전자 신입사원 채용 공고", "취업"),
+    ("LG전자 채용 설명회", "취업"),
+    ("현대자동차 인턴 채용 안내", "취업"),
+    ("2학기 수강신청 일정 안내", "학사"),
+    ("졸업논문 제출 일정 안내", "학사"),
+    ("수강정정 기간 안내", "학사"),
+    ("SW 공모전 참가자 모집", "공모전"),
+    ("아이디어 공모전 개최 안내", "공모전"),
+    ("창업 공모전 참가 신청", "공모전"),
+]
+
+
+class TestLocalClassifier(unittest.TestCase):
+    def setUp(self):
+        self.model = NaiveBayesTitleClassifier.train(SAMPLES, min_count=1)
+
+    def test_ngrams_ignore_whitespace_and_case(self):
+        self.assertEqual(title_ngrams("A b"), title_ngrams("ab"))
+        self.assertIn("장학금", title_ngrams("국가 장학금"))
+
+    def test_predicts_category_with_confidence(self):
+        category, confidence = self.model.predict("2026학년도 장학금 신청")
+        self.assertEqual(category, "장학")
+        self.assertGreater(confidence, 0.5)
+        self.assertLessEqual(confidence, 1.0)
+
+        category, _ = self.model.predict("네이버 신입 채용")
+        self.assertEqual(category, "취업")
+
+    def test_unknown_title_has_low_confidence(self):
+        _, confident = self.model.predict("국가장학금 신청 공고")
+        _, unknown = self.model.predict("xyz")
+        self.assertLess(unknown, confident)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.json.gz')
+            self.model.save(path)
+            loaded = NaiveBayesTitleClassifier.load(path)
+        for title, _ in SAMPLES:
+            self.assertEqual(loaded.predict(title)[0], self.model.predict(title)[0])
+
+    def test_prediction_is_sub_millisecond(self):
+        started = time.perf_counter()
+        for _ in range(200):
+            self.model.predict("2025학년도 2학기 수강신청 일정 안내")
+        self.assertLess((time.perf_counter() - started) / 200, 0.001)
+
+    def test_evaluate_reports_accuracy_and_coverage(self):
+        train_set, test_set = split_dataset(SAMPLES, test_ratio=0.25, seed=1)
+        self.assertEqual(len(train_set) + len(test_set), len(SAMPLES))
+        report = evaluate(self.model, SAMPLES, threshold=0.0)
+        self.assertEqual(report['samples'], len(SAMPLES))
+        self.assertEqual(report['coverage'], 1.0)
+        self.assertGreaterEqual(report['accuracy'], 0.9)
+
+
+class TestGeminiUsesLocalClassifier(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('gemini_classifier.get_cache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('requests.Session.request')
+    def test_confident_title_skips_api(self, mock_post):
+        with patch('local_classifier.predict_local', return_value=("장학", 0.99)):
+            self.assertEqual(gemini_classifier.classify_notice_with_gemini("국가장학금 신청"), "장학")
+            self.assertEqual(gemini_classifier.classify_notices_with_gemini(["a", "b"]), ["장학", "장학"])
+        mock_post.assert_not_called()
+
+    @patch('requests.Session.request')
+    def test_low_confidence_title_goes_to_api(self, mock_post):
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {'candidates': [{'content': {'parts': [{'text': '취업'}]}}]}
+        with patch('local_classifier.predict_local', return_value=("장학", 0.4)):
+            self.assertEqual(gemini_classifier.classify_notice_with_gemini("애매한 제목"), "취업")
+        self.assertEqual(mock_post.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
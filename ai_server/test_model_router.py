@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fake_gemini import FakeGeminiServer
+from gemini_client import GeminiClient
+from model_router import ModelHealth, ModelRouter
+from rate_limiter import CircuitBreaker, RequestBudget
+
+
+class TestModelHealth(unittest.TestCase):
+    def test_latency_ewma_and_error_decay(self):
+        health = ModelHealth('m')
+        health.observe(True, 1.0, alpha=0.5, now=0.0)
+        health.observe(True, 3.0, alpha=0.5, now=0.0)
+        self.assertAlmostEqual(health.latency, 2.0)
+
+        health.observe(False, 0.1, alpha=0.5, now=0.0)
+        self.assertAlmostEqual(health.error_rate(now=0.0), 0.5)
+        self.assertAlmostEqual(health.error_rate(now=300.0), 0.25)  # 반감기 지나면 절반
+        self.assertAlmostEqual(health.latency, 2.0)  # 실패한 호출은 지연 시간에 반영 안 함
+
+
+class TestModelRouterRanking(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.router = ModelRouter(self.client, ['slow', 'fast', 'new'])
+        health = self.router._health
+        health['slow'].observe(True, 0.5)
+        health['fast'].observe(True, 0.1)
+
+    def test_fastest_healthy_first_and_unmeasured_last(self):
+        self.assertEqual([h.name for h in self.router.ranked()], ['fast', 'slow', 'new'])
+        self.assertEqual(self.router.choose(), 'fast')
+
+    def test_demoted_model_is_skipped(self):
+        self.router._health['fast'].breaker.record_failure(trip=True)
+        self.assertEqual(self.router.choose(), 'slow')
+
+    def test_unhealthy_model_moves_behind_healthy_ones(self):
+        for _ in range(3):
+            self.router._health['fast'].observe(False, 0.1)
+        self.assertEqual([h.name for h in self.router.ranked()], ['slow', 'new', 'fast'])
+
+    def test_falls_back_to_next_model_on_failure(self):
+        self.client.generate.side_effect = [None, "학사"]
+        self.assertEqual(self.router.generate("prompt"), "학사")
+        models = [c.kwargs['model'] for c in self.client.generate.call_args_list]
+        self.assertEqual(models, ['fast', 'slow'])
+        self.assertEqual(self.router.stats()['fast']['failures'], 1)
+
+
+    def test_stops_when_shared_breaker_is_open(self):
+        self.client.breaker = CircuitBreaker(failure_threshold=1)
+        self.client.generate.side_effect = lambda *a, **kw: self.client.breaker.record_failure(trip=True)
+        self.assertEqual(self.router.generate_with_model("prompt"), (None, None))
+        self.assertEqual(self.client.generate.call_count, 1)
+
+    def test_reports_model_that_answered(self):
+        self.client.breaker = CircuitBreaker()
+        self.client.generate.side_effect = [None, "학사"]
+        self.assertEqual(self.router.generate_with_model("prompt"), ("학사", 'slow'))
+
+class TestModelRouterWithFakeServer(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeGeminiServer({
+            'gemini-2.0-flash': {'latency': 0.03},
+            'gemini-1.5-flash': {'latency': 0.0},
+            'gemini-1.5-pro': {'latency': 0.0},
+        }).start()
+        self.addCleanup(self.server.stop)
+        self.client = GeminiClient(api_key='', base_url=self.server.base_url, budget=RequestBudget(rpm=6000),
+                                   breaker=CircuitBreaker(failure_threshold=1000))
+        self.addCleanup(self.client.close)
+
+    def test_discover_filters_and_puts_default_model_first(self):
+        router = ModelRouter.discover(self.client)
+        self.assertEqual(router.models, ['gemini-2.0-flash', 'gemini-1.5-flash'])
+
+    def test_routes_to_fastest_then_demotes_on_429(self):
+        router = ModelRouter(self.client, ['gemini-2.0-flash', 'gemini-1.5-flash'])
+        router.probe()
+        self.assertEqual(router.choose(), 'gemini-1.5-flash')
+        self.assertEqual(router.generate('제목: "국가장학금 신청"'), "장학")
+
+        self.server.set_model('gemini-1.5-flash', error_rate=1.0, error_status=429)
+        with patch('time.sleep'):
+            self.assertEqual(router.generate('제목: "삼성전자 채용"'), "취업")
+        self.assertEqual(router.stats()['gemini-1.5-flash']['state'], CircuitBreaker.OPEN)
+        self.assertEqual(router.choose(), 'gemini-2.0-flash')
+        # 강등된 모델에는 더 이상 요청하지 않음
+        before = self.server.requests['gemini-1.5-flash']
+        router.generate('제목: "수강신청 안내"')
+        self.assertEqual(self.server.requests['gemini-1.5-flash'], before)
+
+
+if __name__ == '__main__':
+    unittest.main()
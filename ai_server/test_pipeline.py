@@ -0,0 +1,148 @@
+import threading
+import time
+import unittest
+
+from pipeline import Pipeline, Stage
+from checkpoint import PageTracker
+
+
+class TestPipeline(unittest.TestCase):
+    def test_map_filter_and_batch(self):
+        results = []
+        lock = threading.Lock()
+
+        def double(x, emit):
+            emit(x * 2)
+
+        def only_multiple_of_four(x, emit):
+            if x % 4 == 0:
+                emit(x)
+
+        def collect(items, emit):
+            self.assertLessEqual(len(items), 3)
+            with lock:
+                results.extend(items)
+
+        pipeline = Pipeline([
+            Stage('double', double, workers=3, queue_size=2),
+            Stage('filter', only_multiple_of_four, workers=2, queue_size=2),
+            Stage('sink', collect, batch_size=3, batch_wait=0.05),
+        ])
+        stats = pipeline.run(range(20))
+
+        self.assertEqual(sorted(results), [x * 2 for x in range(20) if (x * 2) % 4 == 0])
+        self.assertEqual(stats['double']['received'], 20)
+        self.assertEqual(stats['filter']['emitted'], 10)
+        self.assertEqual(stats['sink']['received'], 10)
+        self.assertLessEqual(stats['double']['max_queue_depth'], 2)
+
+    def test_slow_stage_overlaps_with_workers(self):
+        def slow(x, emit):
+            time.sleep(0.05)
+            emit(x)
+
+        started = time.monotonic()
+        Pipeline([Stage('slow', slow, workers=10), Stage('sink', lambda x, emit: None)]).run(range(10))
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    def test_errors_are_counted_and_reported(self):
+        failed = []
+
+        def boom(x, emit):
+            if x == 3:
+                raise ValueError("bad item")
+            emit(x)
+
+        stats = Pipeline([Stage('boom', boom), Stage('sink', lambda x, emit: None)],
+                         on_error=lambda stage, item, exc: failed.append((stage, item))).run(range(5))
+        self.assertEqual(stats['boom']['errors'], 1)
+        self.assertEqual(failed, [('boom', 3)])
+        self.assertEqual(stats['sink']['received'], 4)
+
+    def test_setup_and_teardown_per_worker(self):
+        calls = []
+        lock = threading.Lock()
+
+        def record(name):
+            def fn():
+                with lock:
+                    calls.append(name)
+            return fn
+
+        Pipeline([Stage('w', lambda x, emit: None, workers=3, setup=record('setup'), teardown=record('teardown'))]).run([1])
+        self.assertEqual(calls.count('setup'), 3)
+        self.assertEqual(calls.count('teardown'), 3)
+
+
+    def test_setup_failure_on_every_worker_raises_instead_of_hanging(self):
+        reported = []
+
+        def broken_setup():
+            raise RuntimeError("chrome failed to start")
+
+        pipeline = Pipeline([
+            Stage('source', lambda x, emit: emit(x), workers=2, queue_size=2),
+            Stage('detail', lambda x, emit: None, workers=2, queue_size=2, setup=broken_setup),
+        ], on_error=lambda name, item, exc: reported.append((name, item)))
+
+        result = {}
+        runner = threading.Thread(target=lambda: result.setdefault('error', self._run_catching(pipeline, range(10))))
+        runner.start()
+        runner.join(timeout=5)
+        self.assertFalse(runner.is_alive(), "setup 실패 시 run()이 멈춤")
+        self.assertIsInstance(result['error'], RuntimeError)
+        self.assertEqual(sorted(item for _, item in reported), list(range(10)))
+
+    def test_partial_setup_failure_keeps_healthy_workers(self):
+        results = []
+        attempts = iter([True, False, True])
+        lock = threading.Lock()
+
+        def flaky_setup():
+            with lock:
+                ok = next(attempts)
+            if not ok:
+                raise RuntimeError("one browser failed")
+
+        def collect(x, emit):
+            with lock:
+                results.append(x)
+
+        stats = Pipeline([Stage('detail', collect, workers=3, setup=flaky_setup)]).run(range(10))
+        self.assertEqual(sorted(results), list(range(10)))
+        self.assertEqual(stats['detail']['errors'], 1)
+
+    @staticmethod
+    def _run_catching(pipeline, source):
+        try:
+            pipeline.run(source)
+        except Exception as e:
+            return e
+        return None
+
+
+class TestPageTracker(unittest.TestCase):
+    def test_checkpoint_waits_for_earlier_pages(self):
+        tracker = PageTracker(first_page=1)
+        tracker.add(1); tracker.add(1); tracker.close(1)
+        tracker.add(2); tracker.close(2)
+        self.assertEqual(tracker.next_page, 1)
+
+        tracker.done(2)          # 2페이지가 먼저 끝나도
+        self.assertEqual(tracker.next_page, 1)
+        tracker.done(1)
+        self.assertEqual(tracker.next_page, 1)
+        tracker.done(1)          # 1페이지가 끝나면 3페이지로
+        self.assertEqual(tracker.next_page, 3)
+
+    def test_open_page_is_not_complete(self):
+        tracker = PageTracker(first_page=5)
+        tracker.add(5)
+        tracker.done(5)
+        self.assertEqual(tracker.next_page, 5)
+        tracker.close(5)
+        self.assertEqual(tracker.next_page, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
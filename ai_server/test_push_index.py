@@ -0,0 +1,92 @@
+import unittest
+
+from fake_firestore import FakeFirestore
+from push_index import (ALL_BUCKET, BUCKETS, INDEX_COLLECTION, IndexMaintainer, PushIndex,
+                        rebuild, shard_doc_id, shard_of)
+
+SHARDS = 4
+
+
+def seed_users(db):
+    users = db.collection('users')
+    users.document('a').set({'isPushEnabled': True, 'fcm_token': 'ta'})
+    users.document('b').set({'isPushEnabled': True, 'fcm_token': 'tb', 'notification_settings': {'취업': False}})
+    users.document('c').set({'isPushEnabled': False, 'fcm_token': 'tc'})
+    users.document('d').set({'isPushEnabled': True})
+
+
+class TestRebuildAndLookup(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        seed_users(self.db)
+
+    def test_rebuild_writes_every_shard_and_respects_settings(self):
+        counts = rebuild(self.db, shards=SHARDS)
+        self.assertEqual(len(self.db.dump(INDEX_COLLECTION)), len(BUCKETS) * SHARDS)
+        self.assertEqual(counts['취업'], 1)
+        self.assertEqual(counts[ALL_BUCKET], 2)
+
+        doc = self.db.dump(INDEX_COLLECTION)[shard_doc_id('장학', shard_of('b', SHARDS))]
+        self.assertEqual(doc['tokens']['b'], 'tb')
+
+    def test_cold_lookup_reads_only_bucket_shards_then_memory(self):
+        rebuild(self.db, shards=SHARDS)
+        index = PushIndex(shards=SHARDS)
+        reads = self.db.reads
+        self.assertEqual(index.recipients(self.db, '취업'), ['ta'])
+        self.assertEqual(self.db.reads - reads, SHARDS)
+
+        reads = self.db.reads
+        self.assertEqual(index.recipients(self.db, '취업'), ['ta'])
+        self.assertEqual(self.db.reads, reads)
+        # 토픽이 없는 카테고리는 전체 버킷
+        self.assertEqual(index.recipients(self.db, '전체'), ['ta', 'tb'])
+
+    def test_missing_index_returns_none(self):
+        self.assertIsNone(PushIndex(shards=SHARDS).recipients(self.db, '학사'))
+
+
+class TestIndexMaintainer(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        seed_users(self.db)
+        rebuild(self.db, shards=SHARDS)
+        self.index = PushIndex(shards=SHARDS)
+        self.assertTrue(self.index.load(self.db))
+        self.maintainer = IndexMaintainer(self.db, self.index).start()
+
+    def tearDown(self):
+        self.maintainer.stop()
+
+    def fresh_recipients(self, category):
+        return PushIndex(shards=SHARDS).recipients(self.db, category)
+
+    def test_initial_snapshot_matching_index_writes_nothing(self):
+        self.assertEqual(self.maintainer.stats['doc_writes'], 0)
+
+    def test_setting_toggle_updates_memory_and_docs(self):
+        writes = self.db.writes
+        self.db.collection('users').document('b').update({'notification_settings.취업': True})
+        self.assertEqual(self.index.recipients(self.db, '취업'), ['ta', 'tb'])
+        self.assertEqual(self.fresh_recipients('취업'), ['ta', 'tb'])
+        # 사용자 문서 1회 + 인덱스 샤드 문서 1회
+        self.assertEqual(self.db.writes - writes, 2)
+
+    def test_token_refresh_and_disable(self):
+        self.db.collection('users').document('a').update({'fcm_token': 'ta2'})
+        self.assertEqual(self.fresh_recipients('학사'), ['ta2', 'tb'])
+
+        self.db.collection('users').document('a').update({'isPushEnabled': False})
+        self.assertEqual(self.index.recipients(self.db, '학사'), ['tb'])
+        self.assertEqual(self.fresh_recipients(ALL_BUCKET), ['tb'])
+
+        self.db.collection('users').document('b').delete()
+        self.assertEqual(self.fresh_recipients('학사'), [])
+
+    def test_new_user_is_indexed(self):
+        self.db.collection('users').document('e').set({'isPushEnabled': True, 'fcm_token': 'te'})
+        self.assertIn('te', self.fresh_recipients('공모전'))
+
+
+if __name__ == '__main__':
+    unittest.main()
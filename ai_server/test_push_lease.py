@@ -0,0 +1,71 @@
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fake_firestore import FakeFirestore
+from push_lease import claim_notice, complete_notice
+
+NOW = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+class TestPushLease(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.notices = self.db.collection('notices')
+        self.notices.document('n1').set({'title': '장학 안내', 'push_requested': True})
+
+    def test_only_one_worker_claims_until_lease_expires(self):
+        self.assertEqual(claim_notice(self.db, 'n1', 'w1', lease_seconds=60, now=NOW)['title'], '장학 안내')
+        self.assertIsNone(claim_notice(self.db, 'n1', 'w2', lease_seconds=60, now=NOW + timedelta(seconds=30)))
+
+        # w1이 죽어서 임대 만료 -> w2가 가져감
+        self.assertIsNotNone(claim_notice(self.db, 'n1', 'w2', lease_seconds=60, now=NOW + timedelta(seconds=61)))
+        self.assertEqual(self.db.dump('notices')['n1']['push_claimed_by'], 'w2')
+        self.assertEqual(self.db.dump('notices')['n1']['push_claim_count'], 2)
+
+    def test_complete_clears_lease_and_blocks_reclaim(self):
+        claim_notice(self.db, 'n1', 'w1', now=NOW)
+        self.assertTrue(complete_notice(self.db, 'n1', 'w1', {'push_requested': False}))
+        doc = self.db.dump('notices')['n1']
+        self.assertNotIn('push_claimed_by', doc)
+        self.assertNotIn('push_lease_until', doc)
+        self.assertIsNone(claim_notice(self.db, 'n1', 'w2', now=NOW))
+
+    def test_complete_after_takeover_reports_lost_lease(self):
+        claim_notice(self.db, 'n1', 'w1', lease_seconds=60, now=NOW)
+        claim_notice(self.db, 'n1', 'w2', lease_seconds=60, now=NOW + timedelta(seconds=90))
+        self.assertFalse(complete_notice(self.db, 'n1', 'w1', {'push_requested': False, 'push_sent_at': NOW}))
+        doc = self.db.dump('notices')['n1']
+        self.assertEqual(doc['push_claimed_by'], 'w2')
+        # 임대를 잃은 워커는 새 소유자의 상태를 건드리지 않음
+        self.assertTrue(doc['push_requested'])
+        self.assertNotIn('push_sent_at', doc)
+
+    def test_missing_or_finished_notice_is_not_claimed(self):
+        self.notices.document('done').set({'push_requested': False})
+        self.assertIsNone(claim_notice(self.db, 'done', 'w1'))
+        self.assertIsNone(claim_notice(self.db, 'nope', 'w1'))
+
+    def test_concurrent_workers_claim_each_notice_once(self):
+        for i in range(50):
+            self.notices.document(f"c{i}").set({'push_requested': True})
+        claims = {}
+        lock = threading.Lock()
+
+        def worker(name):
+            for i in range(50):
+                if claim_notice(self.db, f"c{i}", name):
+                    with lock:
+                        claims.setdefault(f"c{i}", []).append(name)
+
+        threads = [threading.Thread(target=worker, args=(f"w{n}",)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(claims), 50)
+        self.assertTrue(all(len(names) == 1 for names in claims.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+
+from fake_firestore import FakeFirestore
+from push_listener import PushRequestWatcher
+
+
+class TestPushRequestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.notices = self.db.collection('notices')
+        self.notices.document('old').set({'title': '기존 요청', 'push_requested': True})
+        self.notices.document('idle').set({'title': '요청 없음', 'push_requested': False})
+        self.sent = []
+
+        def on_request(doc_id):
+            self.sent.append(doc_id)
+            self.notices.document(doc_id).update({'push_requested': False})
+
+        self.watcher = PushRequestWatcher(self.notices.where('push_requested', '==', True), on_request,
+                                          poll_interval=10, check_interval=0)
+
+    def drain(self):
+        while self.watcher.step(timeout=0):
+            pass
+
+    def test_initial_snapshot_and_new_request_dispatch_without_polling(self):
+        self.drain()
+        self.assertEqual(self.sent, ['old'])
+
+        self.notices.document('idle').update({'push_requested': True})
+        self.drain()
+        self.assertEqual(self.sent, ['old', 'idle'])
+        self.assertEqual(self.watcher.stats['polls'], 0)
+
+    def test_idle_costs_no_reads(self):
+        self.drain()
+        reads = self.db.reads
+        for _ in range(50):
+            self.watcher.step(timeout=0)
+        self.assertEqual(self.db.reads, reads)
+
+    def test_same_request_is_not_dispatched_twice(self):
+        self.watcher._enqueue('old')
+        self.watcher.poll()
+        self.drain()
+        self.assertEqual(self.sent, ['old'])
+
+    def test_reconnects_after_stream_error_and_polls_meanwhile(self):
+        self.drain()
+        self.watcher._watch.close()  # 스트림 끊김
+
+        with patch('push_listener.time.monotonic', return_value=10_000.0):
+            self.notices.document('idle').update({'push_requested': True})
+            self.watcher.step(timeout=0)
+        self.assertEqual(self.watcher.stats['reconnects'], 1)
+        self.assertGreaterEqual(self.watcher.stats['polls'], 1)
+        self.drain()
+        self.assertEqual(self.sent, ['old', 'idle'])
+
+        # 백오프가 지나면 다시 구독
+        with patch('push_listener.time.monotonic', return_value=20_000.0):
+            self.watcher.step(timeout=0)
+        self.assertTrue(self.watcher.connected)
+
+    def test_failed_subscription_falls_back_to_polling(self):
+        with patch.object(self.notices.where('push_requested', '==', True).__class__, 'on_snapshot',
+                          side_effect=RuntimeError('unavailable')):
+            self.drain()
+        self.assertFalse(self.watcher.connected)
+        self.assertEqual(self.sent, ['old'])
+        self.assertEqual(self.watcher.stats['polls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from push_priority import PushScheduler, SloTracker, notice_priority
+
+NOW = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def notice(category='학사', **flags):
+    return {'title': f'{category} 공지', 'category': category, **flags}
+
+
+class TestPushScheduler(unittest.TestCase):
+    def test_priority(self):
+        self.assertEqual(notice_priority(notice(is_urgent=True, is_important=True)), 'urgent')
+        self.assertEqual(notice_priority(notice(is_important=True)), 'important')
+        self.assertEqual(notice_priority(notice()), 'normal')
+
+    def test_urgent_jumps_ahead_of_earlier_requests(self):
+        scheduler = PushScheduler(digest_window=0)
+        scheduler.submit('n1', notice(), now=0)
+        scheduler.submit('i1', notice(is_important=True), now=1)
+        scheduler.submit('u1', notice(is_urgent=True), now=2)
+        scheduler.submit('n2', notice('장학'), now=3)
+        order = []
+        while (job := scheduler.next_job(now=4)):
+            order.extend(job.notice_ids)
+        self.assertEqual(order, ['u1', 'i1', 'n1', 'n2'])
+
+    def test_same_category_normals_coalesce_within_window(self):
+        scheduler = PushScheduler(digest_window=60)
+        scheduler.submit('a', notice(), now=0)
+        scheduler.submit('b', notice(), now=10)
+        scheduler.submit('c', notice('장학'), now=20)
+        scheduler.submit('u', notice(is_urgent=True), now=30)
+
+        self.assertEqual(scheduler.next_job(now=30).notice_ids, ['u'])
+        self.assertIsNone(scheduler.next_job(now=59))
+        self.assertEqual(scheduler.seconds_until_ready(now=59), 1)
+
+        digest = scheduler.next_job(now=60)
+        self.assertTrue(digest.is_digest)
+        self.assertEqual((digest.category, digest.notice_ids), ('학사', ['a', 'b']))
+        single = scheduler.next_job(now=80)
+        self.assertFalse(single.is_digest)
+        self.assertEqual(single.notice_ids, ['c'])
+        self.assertEqual(scheduler.stats['digests'], 1)
+        self.assertIsNone(scheduler.seconds_until_ready(now=80))
+
+    def test_duplicate_submit_ignored_until_popped(self):
+        scheduler = PushScheduler(digest_window=60)
+        self.assertTrue(scheduler.submit('a', notice(), now=0))
+        self.assertFalse(scheduler.submit('a', notice(), now=1))
+        self.assertIn('a', scheduler)
+        self.assertEqual(scheduler.next_job(now=0, force=True).notice_ids, ['a'])
+        self.assertNotIn('a', scheduler)
+
+
+class TestSloTracker(unittest.TestCase):
+    def test_latency_and_breaches(self):
+        slo = SloTracker({'urgent': 30, 'important': 120, 'normal': 600})
+        self.assertEqual(slo.record('urgent', NOW, NOW + timedelta(seconds=5)), 5)
+        slo.record('urgent', NOW, NOW + timedelta(seconds=45))
+        self.assertIsNone(slo.record('normal', None))
+        summary = slo.summary()
+        self.assertEqual(summary['urgent']['count'], 2)
+        self.assertEqual(summary['urgent']['breaches'], 1)
+        self.assertEqual(summary['urgent']['max'], 45)
+        self.assertNotIn('normal', summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
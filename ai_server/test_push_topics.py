@@ -0,0 +1,147 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fake_firestore import FakeFirestore
+from push_topics import (CATEGORY_TOPICS, SUBSCRIPTION_COLLECTION, SubscriptionManager,
+                         desired_topics, reconcile, send_to_topic, sync_user)
+
+ALL_TOPICS = set(CATEGORY_TOPICS.values())
+
+
+def fake_messaging():
+    messaging = MagicMock()
+    ok = lambda tokens, topic: SimpleNamespace(success_count=len(tokens), failure_count=0)
+    messaging.subscribe_to_topic.side_effect = ok
+    messaging.unsubscribe_from_topic.side_effect = ok
+    return messaging
+
+
+def calls(mock):
+    """{topic: set(tokens)}"""
+    result = {}
+    for args, _ in mock.call_args_list:
+        result.setdefault(args[1], set()).update(args[0])
+    return result
+
+
+class TestDesiredTopics(unittest.TestCase):
+    def test_defaults_to_all_categories(self):
+        self.assertEqual(desired_topics({'isPushEnabled': True, 'fcm_token': 't'}), ALL_TOPICS)
+
+    def test_disabled_category_and_missing_token(self):
+        user = {'isPushEnabled': True, 'fcm_token': 't', 'notification_settings': {'취업': False, 'urgent': True}}
+        self.assertEqual(desired_topics(user), ALL_TOPICS - {'notice_career'})
+        self.assertEqual(desired_topics({'isPushEnabled': True}), set())
+        self.assertEqual(desired_topics({'isPushEnabled': False, 'fcm_token': 't'}), set())
+
+
+class TestSyncUser(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.messaging = fake_messaging()
+
+    def record(self, uid):
+        return self.db.collection(SUBSCRIPTION_COLLECTION).document(uid).get().to_dict()
+
+    def test_setting_change_only_touches_changed_topic(self):
+        user = {'isPushEnabled': True, 'fcm_token': 'tok'}
+        sync_user(self.db, self.messaging, 'u1', user)
+        self.assertEqual(set(calls(self.messaging.subscribe_to_topic)), ALL_TOPICS)
+
+        self.messaging.reset_mock()
+        sync_user(self.db, self.messaging, 'u1', {**user, 'notification_settings': {'장학': False}})
+        self.assertEqual(calls(self.messaging.unsubscribe_from_topic), {'notice_scholarship': {'tok'}})
+        self.messaging.subscribe_to_topic.assert_not_called()
+        self.assertNotIn('notice_scholarship', self.record('u1')['topics'])
+
+    def test_token_refresh_moves_subscriptions(self):
+        sync_user(self.db, self.messaging, 'u1', {'isPushEnabled': True, 'fcm_token': 'old'})
+        self.messaging.reset_mock()
+        sync_user(self.db, self.messaging, 'u1', {'isPushEnabled': True, 'fcm_token': 'new'})
+        self.assertEqual(calls(self.messaging.unsubscribe_from_topic), {t: {'old'} for t in ALL_TOPICS})
+        self.assertEqual(calls(self.messaging.subscribe_to_topic), {t: {'new'} for t in ALL_TOPICS})
+        self.assertEqual(self.record('u1')['token'], 'new')
+
+    def test_push_disabled_removes_record(self):
+        sync_user(self.db, self.messaging, 'u1', {'isPushEnabled': True, 'fcm_token': 'tok'})
+        sync_user(self.db, self.messaging, 'u1', {'isPushEnabled': False, 'fcm_token': 'tok'})
+        self.assertIsNone(self.record('u1'))
+        self.assertEqual(set(calls(self.messaging.unsubscribe_from_topic)), ALL_TOPICS)
+
+    def test_unchanged_user_makes_no_calls(self):
+        user = {'isPushEnabled': True, 'fcm_token': 'tok'}
+        sync_user(self.db, self.messaging, 'u1', user)
+        self.messaging.reset_mock()
+        sync_user(self.db, self.messaging, 'u1', user)
+        self.messaging.subscribe_to_topic.assert_not_called()
+        self.messaging.unsubscribe_from_topic.assert_not_called()
+
+
+class TestReconcile(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.messaging = fake_messaging()
+        users = self.db.collection('users')
+        users.document('a').set({'isPushEnabled': True, 'fcm_token': 'ta'})
+        users.document('b').set({'isPushEnabled': True, 'fcm_token': 'tb', 'notification_settings': {'학사': False}})
+        users.document('c').set({'isPushEnabled': False, 'fcm_token': 'tc'})
+
+    def test_groups_tokens_per_topic_and_repairs_drift(self):
+        report = reconcile(self.db, self.messaging)
+        subscribed = calls(self.messaging.subscribe_to_topic)
+        self.assertEqual(subscribed['notice_career'], {'ta', 'tb'})
+        self.assertEqual(subscribed['notice_academic'], {'ta'})
+        # 토픽 하나당 요청 한 번
+        self.assertEqual(self.messaging.subscribe_to_topic.call_count, len(ALL_TOPICS))
+        self.assertEqual(report['users'], 3)
+
+        # 기록이 맞으면 다시 돌려도 호출 없음
+        self.messaging.reset_mock()
+        reconcile(self.db, self.messaging)
+        self.messaging.subscribe_to_topic.assert_not_called()
+
+        # 사용자 문서가 지워졌는데 리스너가 놓친 경우
+        self.db.collection('users').document('a').delete()
+        reconcile(self.db, self.messaging)
+        self.assertEqual(calls(self.messaging.unsubscribe_from_topic), {t: {'ta'} for t in ALL_TOPICS})
+        self.assertFalse(self.db.collection(SUBSCRIPTION_COLLECTION).document('a').get().exists)
+
+    def test_full_resubscribes_everything(self):
+        reconcile(self.db, self.messaging)
+        self.messaging.reset_mock()
+        reconcile(self.db, self.messaging, full=True)
+        self.assertEqual(calls(self.messaging.subscribe_to_topic)['notice_career'], {'ta', 'tb'})
+
+
+class TestSubscriptionManager(unittest.TestCase):
+    def test_listener_syncs_changed_users_only(self):
+        db = FakeFirestore()
+        messaging = fake_messaging()
+        db.collection('users').document('a').set({'isPushEnabled': True, 'fcm_token': 'ta'})
+        manager = SubscriptionManager(db, messaging).start()
+        # 시작 전부터 있던 사용자는 첫 스냅샷에서 reconcile로 한 번에 구독
+        self.assertEqual(calls(messaging.subscribe_to_topic), {t: {'ta'} for t in ALL_TOPICS})
+        self.assertIn('a', db.dump(SUBSCRIPTION_COLLECTION))
+        messaging.subscribe_to_topic.reset_mock()
+
+        db.collection('users').document('b').set({'isPushEnabled': True, 'fcm_token': 'tb'})
+        self.assertEqual(calls(messaging.subscribe_to_topic), {t: {'tb'} for t in ALL_TOPICS})
+
+        db.collection('users').document('b').delete()
+        self.assertEqual(calls(messaging.unsubscribe_from_topic), {t: {'tb'} for t in ALL_TOPICS})
+        manager.stop()
+
+
+class TestSendToTopic(unittest.TestCase):
+    def test_single_send_to_category_topic(self):
+        messaging = MagicMock()
+        messaging.send.return_value = 'projects/x/messages/1'
+        self.assertEqual(send_to_topic(messaging, 'n1', '장학금 신청', '장학'), 'projects/x/messages/1')
+        self.assertEqual(messaging.Message.call_args.kwargs['topic'], 'notice_scholarship')
+        self.assertIsNone(send_to_topic(messaging, 'n2', '공지', '전체'))
+        messaging.send.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fake_firestore import FakeFirestore
+import retry_queue
+from retry_queue import retry_delay, schedule_retry, enqueue_missing_content, drain_retry_queue, MAX_ATTEMPTS
+
+RECORD = {'doc_id': '100', 'board': 'cse', 'url': 'https://example.com/100', 'title': '테스트 공지'}
+OK_DETAIL = {'content': '<p>본문</p>', 'text': '본문', 'images': [], 'files': [], 'metadata': {}}
+FAILED_DETAIL = {'content': '', 'text': '', 'images': [], 'files': [], 'metadata': {}, 'error': 'timeout'}
+
+
+class TestRetryQueue(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.db.collection('notices').document('100').set({'title': '테스트 공지', 'content': '', 'content_pending': True})
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        self.assertEqual(retry_delay(1), retry_queue.BASE_DELAY)
+        self.assertEqual(retry_delay(2), retry_queue.BASE_DELAY * 2)
+        self.assertEqual(retry_delay(3), retry_queue.BASE_DELAY * 4)
+        self.assertEqual(retry_delay(50), retry_queue.MAX_DELAY)
+
+    def test_schedule_retry_counts_attempts(self):
+        now = datetime(2025, 5, 1, tzinfo=timezone.utc)
+        schedule_retry(self.db, RECORD, 'timeout', now=now)
+        schedule_retry(self.db, RECORD, 'timeout', now=now)
+        entry = self.db.dump(retry_queue.RETRY_COLLECTION)['100']
+        self.assertEqual(entry['attempts'], 2)
+        self.assertEqual(entry['next_attempt_at'], now + timedelta(seconds=retry_delay(2)))
+
+    def test_permanent_failure_is_quarantined(self):
+        for _ in range(MAX_ATTEMPTS - 1):
+            self.assertFalse(schedule_retry(self.db, RECORD, 'timeout'))
+        self.assertTrue(schedule_retry(self.db, RECORD, 'timeout'))
+        self.assertNotIn('100', self.db.dump(retry_queue.RETRY_COLLECTION))
+        self.assertIn('100', self.db.dump(retry_queue.QUARANTINE_COLLECTION))
+        notice = self.db.dump('notices')['100']
+        self.assertTrue(notice['content_failed'])
+        self.assertFalse(notice['content_pending'])
+
+    def test_drain_recovers_due_entries_only(self):
+        enqueue_missing_content(self.db, RECORD)
+        later = dict(RECORD, doc_id='200')
+        schedule_retry(self.db, later, 'timeout')  # 10분 뒤에 시도 가능
+
+        fetched = []
+        def fetch(url):
+            fetched.append(url)
+            return OK_DETAIL
+
+        stats = drain_retry_queue(self.db, 'cse', fetch, lambda entry, detail: {'content': detail['content']})
+        self.assertEqual(stats, {'retried': 1, 'recovered': 1, 'quarantined': 0})
+        self.assertEqual(fetched, [RECORD['url']])
+        notice = self.db.dump('notices')['100']
+        self.assertEqual(notice['content'], '<p>본문</p>')
+        self.assertNotIn('content_pending', notice)
+        self.assertEqual(list(self.db.dump(retry_queue.RETRY_COLLECTION)), ['200'])
+
+    def test_drain_reschedules_failures(self):
+        enqueue_missing_content(self.db, RECORD)
+        stats = drain_retry_queue(self.db, 'cse', lambda url: FAILED_DETAIL, lambda entry, detail: {})
+        self.assertEqual(stats['recovered'], 0)
+        entry = self.db.dump(retry_queue.RETRY_COLLECTION)['100']
+        self.assertEqual(entry['attempts'], 1)
+        self.assertEqual(entry['last_error'], 'timeout')
+
+
+if __name__ == '__main__':
+    unittest.main()
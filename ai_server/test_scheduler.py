@@ -0,0 +1,67 @@
+import unittest
+import datetime
+
+from scheduler import AdaptivePollInterval, TimedTask, KST
+
+
+def kst(*args):
+    return KST.localize(datetime.datetime(*args))
+
+
+class TestAdaptivePollInterval(unittest.TestCase):
+    def test_base_interval_by_time_of_day(self):
+        poll = AdaptivePollInterval()
+        weekday_noon = kst(2025, 5, 14, 12, 0)      # 수요일
+        weekday_night = kst(2025, 5, 14, 3, 0)
+        weekend_noon = kst(2025, 5, 17, 12, 0)      # 토요일
+        semester_noon = kst(2025, 3, 4, 12, 0)      # 개강 직후 화요일
+
+        self.assertLess(poll.next_interval(weekday_noon), poll.next_interval(weekend_noon))
+        self.assertLess(poll.next_interval(weekend_noon), poll.next_interval(weekday_night))
+        self.assertLess(poll.next_interval(semester_noon), poll.next_interval(weekday_noon))
+
+    def test_observed_rate_adjusts_interval(self):
+        now = kst(2025, 5, 14, 12, 0)
+        busy = AdaptivePollInterval()
+        busy.observe(new_items=10, elapsed_seconds=3600)
+        idle = AdaptivePollInterval()
+        idle.observe(new_items=0, elapsed_seconds=3600)
+
+        base = AdaptivePollInterval().next_interval(now)
+        self.assertLess(busy.next_interval(now), base)
+        self.assertGreater(idle.next_interval(now), base)
+
+    def test_interval_is_clamped(self):
+        poll = AdaptivePollInterval(min_interval=300, max_interval=3600)
+        poll.observe(new_items=1000, elapsed_seconds=60)
+        self.assertEqual(poll.next_interval(kst(2025, 3, 4, 12, 0)), 300)
+
+
+class TestTimedTask(unittest.TestCase):
+    def test_runs_once_per_day(self):
+        calls = []
+        task = TimedTask("test", lambda: calls.append(1), hour=0, minute=5, catch_up=True)
+        now = kst(2025, 5, 14, 0, 10)
+        task.prime(now)
+        self.assertTrue(task.is_due(now))
+        task.run(now)
+        self.assertFalse(task.is_due(now + datetime.timedelta(hours=5)))
+        self.assertTrue(task.is_due(kst(2025, 5, 15, 0, 5)))
+        self.assertEqual(len(calls), 1)
+
+    def test_no_catch_up_skips_past_run_on_start(self):
+        task = TimedTask("reset", lambda: None, hour=0)
+        now = kst(2025, 5, 14, 10, 0)
+        task.prime(now)
+        self.assertFalse(task.is_due(now))
+        self.assertEqual(task.seconds_until_due(now), 14 * 3600)
+
+    def test_monthly_task(self):
+        task = TimedTask("monthly", lambda: None, hour=3, day=1)
+        task.prime(kst(2025, 12, 10, 0, 0))
+        self.assertFalse(task.is_due(kst(2025, 12, 31, 23, 0)))
+        self.assertTrue(task.is_due(kst(2026, 1, 1, 3, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
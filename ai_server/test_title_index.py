@@ -0,0 +1,71 @@
+import unittest
+
+from title_index import TitleIndex, build_index, normalize_title
+
+
+class TestNormalizeTitle(unittest.TestCase):
+    def test_strips_brackets_years_semesters_and_dates(self):
+        expected = normalize_title("국가장학금 신청 안내")
+        self.assertEqual(normalize_title("[학생처] 2026학년도 1학기 국가장학금 신청 안내"), expected)
+        self.assertEqual(normalize_title("2025학년도 2학기 국가장학금 2차 신청 안내 (~3/15)"), expected)
+        self.assertEqual(normalize_title("국가장학금  신청 안내 2025.03.02."), expected)
+
+    def test_keeps_distinguishing_words(self):
+        self.assertNotEqual(normalize_title("수강신청 안내"), normalize_title("수강정정 안내"))
+
+
+class TestTitleIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = build_index({
+            "2025학년도 1학기 국가장학금 신청 안내": "장학",
+            "삼성전자 신입사원 채용 공고": "취업",
+            "SW중심대학 해커톤 참가자 모집 안내": "공모전",
+        })
+
+    def test_recurring_notice_reuses_label(self):
+        label, score, matched = self.index.lookup("[학생처] 2026학년도 2학기 국가장학금 신청 안내")
+        self.assertEqual(label, "장학")
+        self.assertEqual(score, 1.0)
+        self.assertEqual(matched, "2025학년도 1학기 국가장학금 신청 안내")
+
+    def test_close_match_above_threshold(self):
+        label, score, _ = self.index.lookup("SW중심대학 해커톤 참가자 모집 안내 공지")
+        self.assertEqual(label, "공모전")
+        self.assertGreaterEqual(score, 0.8)
+        self.assertLess(score, 1.0)
+
+    def test_unrelated_title_misses(self):
+        self.assertIsNone(self.index.label_for("도서관 휴관 안내"))
+        self.assertIsNone(self.index.label_for("LG전자 인턴 채용"))
+
+    def test_exclude_skips_same_title(self):
+        label, _, _ = self.index.lookup("삼성전자 신입사원 채용 공고", exclude="삼성전자 신입사원 채용 공고")
+        self.assertIsNone(label)
+
+    def test_stats_count_hits_and_misses(self):
+        self.index.label_for("2024학년도 국가장학금 신청 안내")
+        self.index.label_for("SW중심대학 해커톤 참가자 모집 안내 공지")
+        self.index.label_for("도서관 휴관 안내")
+        stats = self.index.stats()
+        self.assertEqual((stats['exact_hits'], stats['fuzzy_hits'], stats['misses']), (1, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.667)
+
+    def test_title_that_normalizes_to_empty_never_matches(self):
+        index = build_index({"[공지]": "학사", "2025학년도 1학기 국가장학금 신청 안내": "장학"})
+        self.assertEqual(normalize_title("[학생처] (~3/15)"), "")
+        self.assertEqual(index.lookup("[학생처] (~3/15)"), (None, 0.0, None))
+        self.assertEqual(index.lookup("[공지]"), (None, 0.0, None))
+
+    def test_exact_original_title_wins_over_normalized_match(self):
+        index = build_index({"[학사] 수강신청 안내": "학사", "[장학] 수강신청 안내": "장학"})
+        self.assertEqual(index.lookup("[장학] 수강신청 안내"), ("장학", 1.0, "[장학] 수강신청 안내"))
+        self.assertEqual(index.lookup("[학사] 수강신청 안내")[0], "학사")
+        # 원래 제목이 없으면 정규화가 같은 첫 항목
+        self.assertEqual(index.label_for("[공지] 수강신청 안내"), "학사")
+
+    def test_empty_index(self):
+        self.assertEqual(TitleIndex().lookup("아무 제목"), (None, 0.0, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import exceptions, messaging
+
+from fake_firestore import FakeFirestore
+from token_pruner import (STRIKE_COLLECTION, STRIKE_LIMIT, classify, prune_failed_tokens, record_strike,
+                          record_strikes)
+
+NOW = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+class TestClassify(unittest.TestCase):
+    def test_error_codes(self):
+        self.assertEqual(classify(messaging.UnregisteredError('gone')), 'dead')
+        self.assertEqual(classify(exceptions.InvalidArgumentError('bad token')), 'dead')
+        self.assertEqual(classify(messaging.SenderIdMismatchError('other project')), 'dead')
+        self.assertEqual(classify(exceptions.DeadlineExceededError('slow device')), 'transient')
+        self.assertEqual(classify(exceptions.UnavailableError('busy')), 'other')   # FCM 서비스 장애
+        self.assertEqual(classify(exceptions.InternalError('fcm')), 'other')
+        self.assertEqual(classify(ConnectionError('reset')), 'other')
+        self.assertEqual(classify(messaging.ThirdPartyAuthError('apns')), 'other')
+
+
+class TestPruneFailedTokens(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        users = self.db.collection('users')
+        for uid, token in [('a', 'ta'), ('b', 'tb'), ('c', 'tc'), ('d', 'td')]:
+            users.document(uid).set({'isPushEnabled': True, 'fcm_token': token})
+
+    def user(self, uid):
+        return self.db.dump('users')[uid]
+
+    def test_dead_tokens_removed_in_one_batch(self):
+        failures = [('ta', messaging.UnregisteredError('gone')),
+                    ('tb', exceptions.InvalidArgumentError('bad')),
+                    ('tc', messaging.ThirdPartyAuthError('apns'))]
+        commits = self.db.commits
+        report = prune_failed_tokens(self.db, failures, sent=4)
+
+        self.assertEqual(report['pruned'], 2)
+        self.assertEqual(report['other'], 1)
+        self.assertEqual(self.db.commits - commits, 1)
+        self.assertNotIn('fcm_token', self.user('a'))
+        self.assertEqual(self.user('a')['fcm_token_prune_reason'], exceptions.NOT_FOUND)
+        self.assertEqual(self.user('c')['fcm_token'], 'tc')
+
+    def test_all_invalid_argument_is_treated_as_payload_problem(self):
+        failures = [(t, exceptions.InvalidArgumentError('bad payload')) for t in ('ta', 'tb', 'tc', 'td')]
+        report = prune_failed_tokens(self.db, failures, sent=4)
+        self.assertEqual(report['pruned'], 0)
+        self.assertEqual(report['other'], 4)
+        self.assertEqual(self.user('a')['fcm_token'], 'ta')
+        self.assertEqual(self.db.dump(STRIKE_COLLECTION), {})
+
+    def test_single_token_invalid_argument_is_struck_not_pruned(self):
+        failure = [('ta', exceptions.InvalidArgumentError('bad token or payload'))]
+        for i in range(STRIKE_LIMIT - 1):
+            report = prune_failed_tokens(self.db, failure, sent=1, now=NOW + timedelta(hours=i))
+            self.assertEqual((report['dead'], report['transient'], report['pruned']), (0, 1, 0))
+            self.assertEqual(self.user('a')['fcm_token'], 'ta')
+        report = prune_failed_tokens(self.db, failure, sent=1, now=NOW + timedelta(days=1))
+        self.assertEqual(report['pruned'], 1)
+        self.assertEqual(self.user('a')['fcm_token_prune_reason'], 'STRIKES')
+
+    def test_transient_failures_prune_after_strike_limit(self):
+        failure = [('td', exceptions.DeadlineExceededError('slow'))]
+        for i in range(STRIKE_LIMIT - 1):
+            report = prune_failed_tokens(self.db, failure, sent=4, now=NOW + timedelta(hours=i))
+            self.assertEqual(report['pruned'], 0)
+        report = prune_failed_tokens(self.db, failure, sent=4, now=NOW + timedelta(days=1))
+        self.assertEqual(report['struck_out'], 1)
+        self.assertEqual(report['pruned'], 1)
+        self.assertNotIn('fcm_token', self.user('d'))
+        self.assertEqual(self.db.dump(STRIKE_COLLECTION), {})
+
+    def test_service_wide_errors_never_strike(self):
+        for i in range(STRIKE_LIMIT + 1):
+            report = prune_failed_tokens(self.db, [('ta', ConnectionError('reset')),
+                                                   ('tb', exceptions.UnavailableError('busy')),
+                                                   ('tc', exceptions.InternalError('fcm'))],
+                                         sent=4, now=NOW + timedelta(hours=i))
+            self.assertEqual(report['pruned'], 0)
+        self.assertEqual(self.db.dump(STRIKE_COLLECTION), {})
+        self.assertEqual(self.user('a')['fcm_token'], 'ta')
+
+    def test_strikes_written_in_one_batch(self):
+        tokens = [f"t{i}" for i in range(45)]
+        commits = self.db.commits
+        self.assertEqual(record_strikes(self.db, tokens, NOW), set())
+        self.assertEqual(self.db.commits - commits, 1)
+        self.assertEqual(len(self.db.dump(STRIKE_COLLECTION)), 45)
+        record_strikes(self.db, tokens, NOW + timedelta(hours=1))
+        self.assertEqual(record_strikes(self.db, tokens, NOW + timedelta(hours=2)), set(tokens))
+        self.assertEqual(self.db.dump(STRIKE_COLLECTION), {})
+
+    def test_strikes_expire_after_window(self):
+        record_strike(self.db, 'td', NOW)
+        record_strike(self.db, 'td', NOW + timedelta(hours=1))
+        self.assertFalse(record_strike(self.db, 'td', NOW + timedelta(days=8)))
+        entry = next(iter(self.db.dump(STRIKE_COLLECTION).values()))
+        self.assertEqual(entry['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+import argparse
+import csv
+import os
+import re
+import threading
+import unicodedata
+import zlib
+
+# ==========================================
+# 족보 제목 유사 검색 (정규화 + MinHash/LSH)
+# ==========================================
+# 매년 반복되는 공지는 연도/학기/말머리만 달라서 ("[학생처] 2026학년도 1학기 ...")
+# 족보(dataset.csv)와 정확히 일치하지 않고 Gemini로 넘어감.
+# 제목을 정규화한 뒤 문자 2-gram MinHash로 후보를 찾고,
+# 실제 Jaccard 유사도가 threshold 이상이면 족보의 라벨을 그대로 사용함.
+#
+#   python title_index.py                  # dataset.csv 기준 적중률 (leave-one-out)
+#   python title_index.py --titles a.txt   # 한 줄에 제목 하나인 파일로 적중률 측정
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataset.csv')
+
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 2
+NUM_PERM = 32
+BANDS = 8            # 8 bands x 4 rows -> Jaccard 약 0.6 이상이면 후보가 될 확률이 높음
+
+_MERSENNE = (1 << 61) - 1
+
+# 정규화 때 지울 패턴 (순서 중요: 괄호 말머리 -> 날짜 -> 연도/학기)
+_STRIP_PATTERNS = [
+    re.compile(r'\[[^\]]*\]|【[^】]*】|<[^>]*>|\([^)]*\)'),               # [학생처], (~3/15) 등
+    re.compile(r'\d{2,4}\s*[./-]\s*\d{1,2}(\s*[./-]\s*\d{1,2})?\.?'),      # 2026.03.02, 3/15
+    re.compile(r'\d{1,2}\s*월\s*(\d{1,2}\s*일)?'),                          # 3월 2일
+    re.compile(r'(19|20)\d{2}\s*(학년도|년도|년)?'),                         # 2026학년도
+    re.compile(r"'\d{2}"),                                                  # '26
+    re.compile(r'\d\s*학기|(여름|겨울|하계|동계)\s*(계절)?\s*학기'),           # 1학기, 동계 계절학기
+    re.compile(r'제?\s*\d+\s*(차|회|기)'),                                  # 2차, 제3회
+]
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_title(title):
+    """유사 검색용 정규화: 말머리/날짜/연도/학기/공백/문장부호 제거"""
+    text = unicodedata.normalize('NFKC', title).lower()
+    for pattern in _STRIP_PATTERNS:
+        text = pattern.sub(' ', text)
+    return _NON_WORD.sub('', text)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TitleIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        # 해시 함수 (a*x + b) mod p — 실행마다 같은 결과가 나오도록 고정 시드
+        self._perms = [((i * 0x9E3779B1 + 1) % _MERSENNE, (i * 0x85EBCA77 + 7) % _MERSENNE)
+                       for i in range(num_perm)]
+        self._entries = []       # (원래 제목, 라벨, 2-gram 집합)
+        self._exact = {}         # 정규화 제목 -> entry id 목록
+        self._buckets = {}       # (band, 값들) -> entry id 목록
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _signature(self, grams):
+        hashed = [zlib.crc32(g.encode('utf-8')) for g in grams]
+        return [min((a * h + b) % _MERSENNE for h in hashed) for a, b in self._perms]
+
+    def _band_keys(self, signature):
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+
+    def add(self, title, label):
+        norm = normalize_title(title)
+        grams = shingles(norm)
+        entry_id = len(self._entries)
+        self._entries.append((title, label, grams))
+        if norm:
+            self._exact.setdefault(norm, []).append(entry_id)
+        if grams:
+            for key in self._band_keys(self._signature(grams)):
+                self._buckets.setdefault(key, []).append(entry_id)
+
+    def lookup(self, title, exclude=None):
+        """
+        (라벨, 유사도, 매칭된 족보 제목) 또는 (None, 0.0, None)
+        exclude: 이 제목과 똑같은 족보 항목은 제외 (leave-one-out 평가용)
+        """
+        norm = normalize_title(title)
+        if not norm:
+            # 말머리/기호/불용어만 있는 제목: 같은 빈 문자열로 정규화된 다른 제목과 매칭되지 않도록
+            self._record('misses')
+            return None, 0.0, None
+        matches = [self._entries[entry_id] for entry_id in self._exact.get(norm, [])
+                   if self._entries[entry_id][0] != exclude]
+        if matches:
+            # 정규화 결과가 같은 족보가 여럿이면(말머리/날짜만 다름) 원래 제목이 똑같은 항목을 우선
+            original, label, _ = next((m for m in matches if m[0] == title), matches[0])
+            self._record('exact_hits')
+            return label, 1.0, original
+
+        grams = shingles(norm)
+        best = (None, 0.0, None)
+        if grams:
+            candidates = set()
+            for key in self._band_keys(self._signature(grams)):
+                candidates.update(self._buckets.get(key, ()))
+            for entry_id in candidates:
+                original, label, entry_grams = self._entries[entry_id]
+                if original == exclude:
+                    continue
+                score = jaccard(grams, entry_grams)
+                if score > best[1]:
+                    best = (label, score, original)
+
+        if best[1] >= self.threshold:
+            self._record('fuzzy_hits')
+            return best
+        self._record('misses')
+        return None, 0.0, None
+
+    def label_for(self, title):
+        return self.lookup(title)[0]
+
+    def _record(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        total = self.exact_hits + self.fuzzy_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'exact_hits': self.exact_hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.exact_hits + self.fuzzy_hits) / total, 3) if total else 0.0,
+        }
+
+
+def build_index(labels, threshold=DEFAULT_THRESHOLD):
+    """{제목: 라벨} 또는 [(제목, 라벨)] -> TitleIndex"""
+    index = TitleIndex(threshold=threshold)
+    for title, label in (labels.items() if isinstance(labels, dict) else labels):
+        index.add(title, label)
+    return index
+
+
+def load_labels(path=DATASET_PATH):
+    labels = {}
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if len(row) >= 2:
+                labels[row[0].strip()] = row[1].strip()
+    return labels
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="족보 유사 검색 적중률 측정")
+    parser.add_argument('--data', default=DATASET_PATH)
+    parser.add_argument('--titles', help="측정할 제목 목록 파일 (없으면 dataset.csv leave-one-out)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    labels = load_labels(args.data)
+    index = build_index(labels, threshold=args.threshold)
+    print(f"📂 족보 {len(index)}개 색인 (threshold={args.threshold})")
+
+    if args.titles:
+        with open(args.titles, 'r', encoding='utf-8') as f:
+            titles = [line.strip() for line in f if line.strip()]
+        exact_before = sum(1 for t in titles if t in labels)
+        for title in titles:
+            index.lookup(title)
+        print(f"📊 제목 {len(titles)}개: 기존 정확 일치 {exact_before}개 -> {index.stats()}")
+    else:
+        # 자기 자신을 빼고 찾았을 때 다른 족보 항목으로 맞히는 비율과 라벨 일치율
+        agree = 0
+        for title, label in labels.items():
+            found, score, matched = index.lookup(title, exclude=title)
+            if found is not None:
+                agree += found == label
+                if found != label:
+                    print(f"   ⚠️ 라벨 불일치 ({score:.2f}): {title} -> {matched} [{found} != {label}]")
+        stats = index.stats()
+        hits = stats['exact_hits'] + stats['fuzzy_hits']
+        print(f"📊 leave-one-out: {stats}")
+        if hits:
+            print(f"   ✅ 적중 항목 라벨 일치율: {agree / hits:.3f}")
@@ -0,0 +1,149 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import exceptions, firestore
+
+# ==========================================
+# 실패한 FCM 토큰 정리
+# ==========================================
+# 발송 실패를 오류 코드로 분류해서 더 이상 쓸 수 없는 토큰을 users에서 지움.
+# - NOT_FOUND(앱 삭제/토큰 만료), INVALID_ARGUMENT(잘못된 토큰), PERMISSION_DENIED(다른 프로젝트 토큰)
+#   -> 즉시 삭제. 단 모든 토큰이 INVALID_ARGUMENT면 메시지 자체 문제이므로 지우지 않음
+#   (토큰 하나에만 보낸 경우는 토큰/메시지 문제를 구분할 수 없으므로 삭제 대신 누적)
+# - 재시도 후에도 남은 토큰별 일시적 오류(STRIKE_CODES) -> push_token_strikes/{토큰 해시}에 누적,
+#   STRIKE_WINDOW 안에 STRIKE_LIMIT번이면 삭제 (기록 읽기/쓰기는 실행마다 한 번에 모아서 처리)
+# - UNAVAILABLE/INTERNAL(FCM 서비스 장애), Firebase 오류가 아닌 예외(네트워크), APNs 인증 등
+#   서버 설정 문제는 토큰 탓이 아니므로 무시
+# failures에는 토큰별 응답 오류만 넘겨야 함 (요청 자체 실패는 fcm_sender가 request_failures로 분리)
+# 사용자 문서의 fcm_token만 지우면 수신 인덱스/토픽 구독은 각자의 users 리스너가 따라감.
+
+STRIKE_COLLECTION = 'push_token_strikes'
+STRIKE_LIMIT = 3
+STRIKE_WINDOW = timedelta(days=7)
+IN_QUERY_LIMIT = 30        # Firestore 'in' 조건 최대 값 개수
+BATCH_LIMIT = 400
+
+DEAD_CODES = {exceptions.NOT_FOUND, exceptions.INVALID_ARGUMENT, exceptions.PERMISSION_DENIED}
+STRIKE_CODES = {exceptions.DEADLINE_EXCEEDED, exceptions.RESOURCE_EXHAUSTED, exceptions.UNKNOWN}
+
+
+def classify(error):
+    """'dead' (바로 삭제) / 'transient' (누적) / 'other' (무시)"""
+    if not isinstance(error, exceptions.FirebaseError):
+        return 'other'
+    if error.code in DEAD_CODES:
+        return 'dead'
+    if error.code in STRIKE_CODES:
+        return 'transient'
+    return 'other'
+
+
+def _strike_ref(db, token):
+    return db.collection(STRIKE_COLLECTION).document(hashlib.sha1(token.encode('utf-8')).hexdigest())
+
+
+def record_strikes(db, tokens, now=None):
+    """
+    토큰들의 일시적 실패를 1회씩 기록. 읽기는 'in' 조회(IN_QUERY_LIMIT개씩), 쓰기는 배치 하나로 처리
+    반환: 한도에 도달해 기록을 지운 토큰 집합
+    """
+    now = now or datetime.now(timezone.utc)
+    tokens = sorted(set(tokens))
+    entries = {}
+    for start in range(0, len(tokens), IN_QUERY_LIMIT):
+        chunk = tokens[start:start + IN_QUERY_LIMIT]
+        for doc in db.collection(STRIKE_COLLECTION).where('token', 'in', chunk).stream():
+            entries[doc.get('token')] = doc.to_dict()
+
+    struck_out = set()
+    batch, pending = db.batch(), 0
+    for token in tokens:
+        entry = entries.get(token)
+        if not entry or now - entry['first_failed_at'] > STRIKE_WINDOW:
+            entry = {'token': token, 'count': 0, 'first_failed_at': now}
+        entry['count'] += 1
+        entry['last_failed_at'] = now
+
+        ref = _strike_ref(db, token)
+        if entry['count'] >= STRIKE_LIMIT:
+            batch.delete(ref)
+            struck_out.add(token)
+        else:
+            batch.set(ref, entry)
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    return struck_out
+
+
+def record_strike(db, token, now=None):
+    """일시적 실패 1회 기록. 한도에 도달하면 기록을 지우고 True"""
+    return token in record_strikes(db, [token], now)
+
+
+def remove_tokens(db, tokens, reason):
+    """fcm_token이 tokens 중 하나인 사용자 문서에서 토큰 삭제 (배치). 수정한 사용자 수 반환"""
+    tokens = sorted(set(tokens))
+    batch, pending, removed = db.batch(), 0, 0
+    for start in range(0, len(tokens), IN_QUERY_LIMIT):
+        chunk = tokens[start:start + IN_QUERY_LIMIT]
+        for user in db.collection('users').where('fcm_token', 'in', chunk).stream():
+            batch.update(user.reference, {
+                'fcm_token': firestore.DELETE_FIELD,
+                'fcm_token_pruned_at': firestore.SERVER_TIMESTAMP,
+                'fcm_token_prune_reason': reason[user.get('fcm_token')],
+            })
+            pending += 1
+            removed += 1
+            if pending == BATCH_LIMIT:
+                batch.commit()
+                batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    return removed
+
+
+def prune_failed_tokens(db, failures, sent, now=None):
+    """
+    failures: [(token, exception)] (fcm_sender의 토큰별 최종 실패 목록), sent: 발송한 토큰 수
+    반환: {'dead', 'transient', 'other', 'struck_out', 'pruned'}
+    """
+    report = {'dead': 0, 'transient': 0, 'other': 0, 'struck_out': 0, 'pruned': 0}
+    if not failures:
+        return report
+
+    reason = {}
+    invalid = [token for token, error in failures
+               if isinstance(error, exceptions.FirebaseError) and error.code == exceptions.INVALID_ARGUMENT]
+    # 전부 INVALID_ARGUMENT면 토큰이 아니라 메시지 문제. 한 개만 보냈으면 어느 쪽인지 알 수 없음
+    all_invalid = bool(invalid) and len(invalid) == sent
+    payload_problem = all_invalid and sent > 1
+    ambiguous = all_invalid and sent == 1
+
+    transient = []
+    for token, error in failures:
+        kind = classify(error)
+        if kind == 'dead' and error.code == exceptions.INVALID_ARGUMENT:
+            if payload_problem:
+                kind = 'other'
+            elif ambiguous:
+                kind = 'transient'   # 바로 지우지 않고 누적 (진짜 잘못된 토큰이면 STRIKE_LIMIT번에 삭제)
+        report[kind] += 1
+        if kind == 'dead':
+            reason[token] = error.code
+        elif kind == 'transient':
+            transient.append(token)
+
+    if transient:
+        for token in record_strikes(db, transient, now):
+            report['struck_out'] += 1
+            reason[token] = 'STRIKES'
+
+    if payload_problem:
+        print("⚠️ 모든 토큰이 INVALID_ARGUMENT -> 메시지 문제로 보고 토큰은 유지")
+    if reason:
+        report['pruned'] = remove_tokens(db, list(reason), reason)
+    return report
@@ -24,6 +24,14 @@ class _CafeteriaWidgetState extends State<CafeteriaWidget>
     return DateFormat('yyyy-MM-dd').format(_selectedDate); // NEW
   }
 
+  // 선택된 날짜가 속한 주의 월요일 (cafeteria_weeks 문서 ID)
+  String get _weekId {
+    final monday = _selectedDate.subtract(
+      Duration(days: _selectedDate.weekday - DateTime.monday),
+    );
+    return DateFormat('yyyy-MM-dd').format(monday);
+  }
+
   @override
   void initState() {
     super.initState();
@@ -167,53 +175,160 @@ class _CafeteriaWidgetState extends State<CafeteriaWidget>
           // 내용 (메뉴 텍스트)
           SizedBox(
             height: 220, // 높이 증가 (오늘의 일정 위젯과 유사하게)
+            // 주 문서 한 번 읽기로 일주일치를 받고, 주 문서가 없으면(이전 수집분) 날짜 문서로 대체
             child: StreamBuilder<DocumentSnapshot>(
               stream: FirebaseFirestore.instance
-                  .collection('cafeteria_menus')
-                  .doc(_docId)
+                  .collection('cafeteria_weeks')
+                  .doc(_weekId)
                   .snapshots(),
               builder: (context, snapshot) {
                 if (snapshot.connectionState == ConnectionState.waiting) {
                   return const Center(child: CustomLoadingIndicator());
                 }
 
-                Map<String, dynamic> menus = {};
                 if (snapshot.hasData && snapshot.data!.exists) {
                   final data = snapshot.data!.data() as Map<String, dynamic>;
-                  menus = data['menus'] as Map<String, dynamic>? ?? {};
+                  final days = data['days'] as Map<String, dynamic>? ?? {};
+                  final day = days[_docId] as Map<String, dynamic>?;
+                  return _buildMenuTabs(
+                    day?['menus'] as Map<String, dynamic>? ?? {},
+                    slots: day?['slots'] as Map<String, dynamic>? ?? {},
+                    allergens: day?['allergens'] as Map<String, dynamic>? ?? {},
+                  );
                 }
+                return _buildDayDocument();
+              },
+            ),
+          ),
+        ],
+      ),
+    );
+  }
 
-                return TabBarView(
-                  controller: _tabController,
-                  children: _cafeterias.map((cafeName) {
-                    final menuText = menus[cafeName] ?? "식단 정보가 없습니다.";
+  Widget _buildDayDocument() {
+    return StreamBuilder<DocumentSnapshot>(
+      stream: FirebaseFirestore.instance
+          .collection('cafeteria_menus')
+          .doc(_docId)
+          .snapshots(),
+      builder: (context, snapshot) {
+        if (snapshot.connectionState == ConnectionState.waiting) {
+          return const Center(child: CustomLoadingIndicator());
+        }
 
-                    if (menuText == "운영 없음" || menuText == "정보 없음 (Error)") {
-                      return Center(
-                        child: Text(
-                          menuText,
-                          style: const TextStyle(color: Color(0xFFB0B8C1)),
-                        ),
-                      );
-                    }
-
-                    return SingleChildScrollView(
-                      padding: const EdgeInsets.all(20),
-                      child: Text(
-                        menuText,
-                        style: GoogleFonts.notoSansKr(
-                          fontSize: 16,
-                          color: const Color(0xFF333D4B),
-                          height: 1.6,
-                          fontWeight: FontWeight.w500,
-                        ),
-                      ),
-                    );
-                  }).toList(),
-                );
-              },
+        Map<String, dynamic> menus = {};
+        Map<String, dynamic> slots = {};
+        Map<String, dynamic> allergens = {};
+        if (snapshot.hasData && snapshot.data!.exists) {
+          final data = snapshot.data!.data() as Map<String, dynamic>;
+          menus = data['menus'] as Map<String, dynamic>? ?? {};
+          slots = data['slots'] as Map<String, dynamic>? ?? {};
+          allergens = data['allergens'] as Map<String, dynamic>? ?? {};
+        }
+        return _buildMenuTabs(menus, slots: slots, allergens: allergens);
+      },
+    );
+  }
+
+  // slots(끼니별 메뉴 목록)가 있으면 그대로 그리고(알레르기 정보는 아래에), 없으면(이전 수집분) 기존 문자열 표시
+  Widget _buildMenuTabs(
+    Map<String, dynamic> menus, {
+    Map<String, dynamic> slots = const {},
+    Map<String, dynamic> allergens = const {},
+  }) {
+    return TabBarView(
+      controller: _tabController,
+      children: _cafeterias.map((cafeName) {
+        final cafeSlots = slots[cafeName] as List<dynamic>?;
+        if (cafeSlots != null && cafeSlots.isNotEmpty) {
+          final cafeAllergens =
+              (allergens[cafeName] as List<dynamic>? ?? []).cast<String>();
+          return _buildSlots(cafeSlots, cafeAllergens);
+        }
+
+        final menuText = menus[cafeName] ?? "식단 정보가 없습니다.";
+
+        if (menuText == "운영 없음" || menuText == "정보 없음 (Error)") {
+          return Center(
+            child: Text(
+              menuText,
+              style: const TextStyle(color: Color(0xFFB0B8C1)),
+            ),
+          );
+        }
+
+        return SingleChildScrollView(
+          padding: const EdgeInsets.all(20),
+          child: Text(
+            menuText,
+            style: GoogleFonts.notoSansKr(
+              fontSize: 16,
+              color: const Color(0xFF333D4B),
+              height: 1.6,
+              fontWeight: FontWeight.w500,
             ),
           ),
+        );
+      }).toList(),
+    );
+  }
+
+  Widget _buildSlots(List<dynamic> cafeSlots, List<String> cafeAllergens) {
+    return SingleChildScrollView(
+      padding: const EdgeInsets.all(20),
+      child: Column(
+        crossAxisAlignment: CrossAxisAlignment.start,
+        children: [
+          ...cafeSlots.map((slot) {
+            final meal = slot['meal'] as String? ?? '';
+            final dishes = (slot['dishes'] as List<dynamic>? ?? []).cast<String>();
+            return Padding(
+              padding: const EdgeInsets.only(bottom: 12),
+              child: Column(
+                crossAxisAlignment: CrossAxisAlignment.start,
+                children: [
+                  Text(
+                    meal,
+                    style: const TextStyle(
+                      fontSize: 13,
+                      fontWeight: FontWeight.bold,
+                      color: Color(0xFF3182F6),
+                    ),
+                  ),
+                  const SizedBox(height: 4),
+                  Text(
+                    dishes.join('\n'),
+                    style: GoogleFonts.notoSansKr(
+                      fontSize: 16,
+                      color: const Color(0xFF333D4B),
+                      height: 1.6,
+                      fontWeight: FontWeight.w500,
+                    ),
+                  ),
+                ],
+              ),
+            );
+          }),
+          if (cafeAllergens.isNotEmpty) ...[
+            const SizedBox(height: 4),
+            const Text(
+              "알레르기 정보",
+              style: TextStyle(
+                fontSize: 12,
+                fontWeight: FontWeight.bold,
+                color: Color(0xFF8B95A1),
+              ),
+            ),
+            const SizedBox(height: 4),
+            Text(
+              cafeAllergens.join(', '),
+              style: GoogleFonts.notoSansKr(
+                fontSize: 12,
+                color: const Color(0xFF8B95A1),
+                height: 1.5,
+              ),
+            ),
+          ],
         ],
       ),
     );
@@ -5,22 +5,12 @@ PROJECT_DIR="/Users/kdh/Desktop/MY_CSE"
 PYTHON_BIN="python3"
 
 echo "=========================================="
-echo "Starting Scheduled Crawling: $(date)"
+echo "Starting Scheduler Daemon: $(date)"
 echo "=========================================="
 
-cd "$PROJECT_DIR" || exit
+cd "$PROJECT_DIR/ai_server" || exit
 
-# 1. 공지사항 크롤러 실행
-echo "Running Notice Crawler..."
-$PYTHON_BIN ai_server/crawler.py
-
-# 2. 식단 크롤러 실행
-echo "Running Cafeteria Scraper..."
-$PYTHON_BIN ai_server/cafeteria_scraper.py
-
-# 3. 일일 초기화 (hot notice 등) - 필요 시 별도 파일이면 추가 실행
-# $PYTHON_BIN ai_server/daily_reset.py
-
-echo "=========================================="
-echo "All Tasks Completed: $(date)"
-echo "=========================================="
+# 공지 크롤링(적응형 주기), 학식 수집, 자정 조회수 초기화, DB 정리를
+# 하나의 장기 실행 프로세스에서 처리 (cron 등록 불필요)
+# 한 번만 실행하려면: ./run_scrapers.sh --once
+exec $PYTHON_BIN scheduler.py "$@"